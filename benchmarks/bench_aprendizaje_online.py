@@ -0,0 +1,192 @@
+# Benchmark del aprendizaje en línea del spam (codelab3/.../aprendizaje_online.py + comun/registro.py)
+# Con un flujo sintético en el que la redacción de las estafas cambia a mitad (fase A -> fase B):
+# - Actualización: AprendizOnline.aprender por lote de feedback frente a reentrenar desde
+#   cero el pipeline TF-IDF + LogisticRegression de main.py con todo el feedback acumulado
+# - Deriva: accuracy sobre mensajes de la fase B antes y después del feedback de la fase B
+# - Cambio en caliente: varios hilos clasifican sin parar (como clasificar_mensajes)
+#   mientras otro hilo aprende y publica versiones; se cuentan peticiones, errores,
+#   versiones vistas y latencias p50/p99, frente a un tramo sin publicaciones y frente a
+#   recargar el .joblib desde disco en cada llamada
+# - Entre procesos: coste de publicar en disco y de sincronizar() cuando no hay cambios
+#
+# Uso: python benchmarks/bench_aprendizaje_online.py [--lotes 40] [--lote 500] [--segundos 5] [--hilos 4]
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from scrapers import REPO_ROOT
+
+SPAM_DIR = REPO_ROOT / 'codelab3' / 'DETECTOR DE ESTAFA SPAM'
+sys.path[:0] = [str(REPO_ROOT), str(SPAM_DIR)]
+
+LEGIT = ["necesito soporte para iniciar sesión", "cuánto cuesta el plan anual", "el pedido llegó tarde",
+         "quiero una demo del producto", "deseo actualizar mi método de pago", "cuál es el tiempo de entrega",
+         "mi paquete sigue en aduana cuándo llega", "no me llega el código por sms para entrar"]
+SPAM_A = ["gana dinero fácil haz clic aquí", "has sido seleccionado para un premio", "crypto inversión garantizada",
+          "recarga gratis confirma tu contraseña", "promoción exclusiva ingresa tu tarjeta"]
+SPAM_B = ["tu paquete está retenido en aduana paga la tasa", "envía el código que recibiste por sms",
+          "reembolso de impuestos confirma tu cuenta bancaria", "tu suscripción venció renueva con tu tarjeta en el enlace"]
+RELLENO = ["hoy", "urgente", "por favor", "gracias", "ahora", "cliente", "mañana", "equipo", "ya", "amigo"]
+
+
+def mensajes(n, plantillas_spam, rng, proporcion_spam=0.3):
+    textos, etiquetas = [], []
+    for _ in range(n):
+        spam = rng.random() < proporcion_spam
+        base = rng.choice(plantillas_spam if spam else LEGIT)
+        textos.append(f"{rng.choice(RELLENO)} {base} {rng.choice(RELLENO)} {rng.randrange(1000)}")
+        etiquetas.append(int(spam))
+    return textos, etiquetas
+
+
+def percentiles_ms(tiempos):
+    tiempos = sorted(tiempos)
+    if not tiempos:
+        return {'p50_ms': 0.0, 'p99_ms': 0.0}
+    return {'p50_ms': round(tiempos[len(tiempos) // 2] * 1000, 3), 'p99_ms': round(tiempos[int(len(tiempos) * 0.99)] * 1000, 3)}
+
+
+def servir(registro, textos, segundos, hilos, publicar=None):
+    """Hilos que clasifican un mensaje por llamada mientras (opcionalmente) otro publica versiones"""
+    parar = threading.Event()
+    tiempos, errores, versiones = [], [], set()
+    lock = threading.Lock()
+
+    def cliente(semilla):
+        rng = random.Random(semilla)
+        propios, vistas, ultima = [], set(), 0
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            try:
+                version, modelo = registro.actual()  # una versión completa por petición
+                modelo.predict([rng.choice(textos)])
+            except Exception as error:
+                with lock:
+                    errores.append(repr(error))
+                continue
+            propios.append(time.perf_counter() - inicio)
+            if version < ultima:  # las versiones nunca retroceden para un mismo cliente
+                with lock:
+                    errores.append(f"versión {version} después de {ultima}")
+            ultima = version
+            vistas.add(version)
+        with lock:
+            tiempos.extend(propios)
+            versiones.update(vistas)
+
+    trabajadores = [threading.Thread(target=cliente, args=(i,)) for i in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    publicadas = publicar(parar) if publicar else time.sleep(segundos)
+    parar.set()
+    for t in trabajadores:
+        t.join()
+    return {'peticiones': len(tiempos), 'errores': len(errores), 'versiones_vistas': len(versiones),
+            'versiones_publicadas': publicadas or 0, **percentiles_ms(tiempos)}
+
+
+def main():
+    import joblib
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    from aprendizaje_online import AprendizOnline, crear_modelo_online
+    from comun.normalizacion import NormalizadorTexto
+    from comun.registro import RegistroModelos
+
+    parser = argparse.ArgumentParser(description='Benchmark del aprendizaje en línea del spam')
+    parser.add_argument('--lotes', type=int, default=40, help='lotes de feedback (la mitad con la redacción nueva)')
+    parser.add_argument('--lote', type=int, default=500)
+    parser.add_argument('--segundos', type=float, default=5.0, help='duración de cada tramo de servicio')
+    parser.add_argument('--hilos', type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    mitad = args.lotes // 2
+    flujo = [mensajes(args.lote, SPAM_A, rng) for _ in range(mitad)]
+    flujo += [mensajes(args.lote, SPAM_A + SPAM_B, rng) for _ in range(args.lotes - mitad)]
+    prueba_b = mensajes(2000, SPAM_B, rng, proporcion_spam=0.5)
+
+    def accuracy(modelo, datos):
+        return round(float(np.mean(modelo.predict(datos[0]) == np.asarray(datos[1]))), 4)
+
+    def pipeline_main():
+        return make_pipeline(NormalizadorTexto(), TfidfVectorizer(max_features=30000, ngram_range=(1, 2), min_df=2),
+                             LogisticRegression(max_iter=200, class_weight='balanced', solver='liblinear'))
+
+    # Actualización incremental frente a reentrenar desde cero con todo lo acumulado
+    registro = RegistroModelos()
+    aprendiz = AprendizOnline(registro, crear_modelo_online())
+    incremental, completo = [], []
+    acumulados_x, acumulados_y = [], []
+    for numero, (textos, etiquetas) in enumerate(flujo, 1):
+        inicio = time.perf_counter()
+        aprendiz.aprender(textos, etiquetas)
+        incremental.append(time.perf_counter() - inicio)
+        acumulados_x += textos
+        acumulados_y += etiquetas
+        if numero % 10 == 0 or numero == len(flujo):
+            inicio = time.perf_counter()
+            pipeline_main().fit(acumulados_x, acumulados_y)
+            completo.append(time.perf_counter() - inicio)
+        if numero == mitad:
+            antes_b = accuracy(registro.actual()[1], prueba_b)
+    actualizacion = {'aprender_y_publicar': percentiles_ms(incremental),
+                     'reentrenar_todo_ultimo_ms': round(completo[-1] * 1000, 1),
+                     'filas_al_final': len(acumulados_x)}
+    deriva = {'accuracy_fase_b_antes_del_feedback': antes_b,
+              'accuracy_fase_b_despues': accuracy(registro.actual()[1], prueba_b),
+              'umbral_final': round(registro.actual()[1].umbral, 4)}
+
+    # Servicio en caliente: sin publicaciones, publicando cada lote, y recargando de disco
+    textos_servicio = prueba_b[0]
+    servicio = {'sin_publicar': servir(registro, textos_servicio, args.segundos, args.hilos)}
+
+    def publicar_continuamente(parar):
+        fin, publicadas = time.perf_counter() + args.segundos, 0
+        while time.perf_counter() < fin:
+            textos, etiquetas = flujo[publicadas % len(flujo)]
+            aprendiz.aprender(textos, etiquetas)
+            publicadas += 1
+        return publicadas
+
+    servicio['publicando'] = servir(registro, textos_servicio, args.segundos, args.hilos, publicar_continuamente)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / 'pipeline_spam_online.joblib'
+        en_disco = RegistroModelos(ruta=ruta)
+        tiempos = []
+        for _ in range(5):
+            inicio = time.perf_counter()
+            en_disco.publicar(registro.actual()[1])
+            tiempos.append(time.perf_counter() - inicio)
+        lector = RegistroModelos(ruta=ruta)
+        inicio = time.perf_counter()
+        for _ in range(10_000):
+            lector.sincronizar()
+        sin_cambios_us = (time.perf_counter() - inicio) / 10_000 * 1e6
+
+        recargas = []
+        for texto in textos_servicio[:200]:
+            inicio = time.perf_counter()
+            joblib.load(ruta)['modelo'].predict([texto])
+            recargas.append(time.perf_counter() - inicio)
+        servicio['recargar_de_disco_por_llamada'] = percentiles_ms(recargas)
+        entre_procesos = {'publicar_en_disco': percentiles_ms(tiempos), 'tamano_bytes': ruta.stat().st_size,
+                          'sincronizar_sin_cambios_us': round(sin_cambios_us, 2),
+                          'lector_en_version': lector.version}
+
+    print(json.dumps({'lotes': args.lotes, 'lote': args.lote, 'hilos': args.hilos,
+                      'actualizacion': actualizacion, 'deriva': deriva, 'servicio': servicio,
+                      'entre_procesos': entre_procesos}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
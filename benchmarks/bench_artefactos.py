@@ -0,0 +1,151 @@
+# Benchmark de carga de los pipelines: .joblib frente al artefacto plano (comun/artefactos.py)
+# - Entrena un pipeline como los de codelab2/codelab3 (NormalizadorTexto + TF-IDF 30k términos
+#   + LinearSVC) sobre un corpus sintético con vocabulario amplio y lo guarda en ambos formatos
+# - Mide el tiempo de carga en el propio proceso y lanza N procesos trabajadores (spawn)
+#   por formato: todos cargan el modelo a la vez y predicen un lote; se mide el tiempo de
+#   carga, el RSS añadido y el PSS añadido con todos cargados (PSS reparte las páginas
+#   compartidas entre los procesos que las usan)
+# - Mide también el tiempo de carga de los .joblib reales de los codelabs y de su artefacto plano
+# - Comprueba que ambos formatos predicen lo mismo
+#
+# Uso: python benchmarks/bench_artefactos.py [--procesos 4] [--mensajes 60000]
+import argparse
+import importlib
+import json
+import multiprocessing
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scrapers import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT))
+
+MODELOS_REALES = [
+    REPO_ROOT / 'codelab2' / 'TRIAGE DE MENSAJES PARA ATENCION AL CLIENTE' / 'pipeline_triage.joblib',
+    REPO_ROOT / 'codelab3' / 'DETECTOR DE ESTAFA SPAM' / 'pipeline_spam.joblib',
+]
+
+# Bibliotecas que cada trabajador importa antes de medir (las que usaría la carga)
+PRECARGADOS = ('joblib', 'sklearn.feature_extraction.text', 'sklearn.pipeline', 'sklearn.svm')
+
+
+def memoria_mb():
+    """(RSS, PSS) del proceso actual en MB, desde /proc"""
+    valores = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for linea in f:
+            partes = linea.split()
+            if partes[0] in ('Rss:', 'Pss:'):
+                valores[partes[0]] = int(partes[1]) / 1024
+    return valores['Rss:'], valores['Pss:']
+
+
+def trabajador(ruta, textos, barrera, resultados):
+    # Las bibliotecas (también las que importaría la carga) se importan antes de medir:
+    # solo cuenta el modelo
+    for modulo in PRECARGADOS:
+        importlib.import_module(modulo)
+
+    from comun.artefactos import cargar_modelo
+
+    barrera.wait()  # todos los procesos con las bibliotecas importadas
+    rss0, pss0 = memoria_mb()
+    inicio = time.perf_counter()
+    pipe = cargar_modelo(ruta)
+    carga = time.perf_counter() - inicio
+    pipe.predict(textos)
+    rss1, _ = memoria_mb()
+    barrera.wait()  # todos los procesos con el modelo cargado
+    _, pss1 = memoria_mb()
+    barrera.wait()
+    resultados.put({'carga_concurrente_ms': carga * 1000, 'rss_mb': rss1 - rss0, 'pss_mb': pss1 - pss0})
+
+
+def medir_procesos(ruta, textos, procesos):
+    contexto = multiprocessing.get_context('spawn')
+    barrera = contexto.Barrier(procesos)
+    resultados = contexto.Queue()
+    hijos = [contexto.Process(target=trabajador, args=(str(ruta), textos, barrera, resultados))
+             for _ in range(procesos)]
+    for hijo in hijos:
+        hijo.start()
+    medidas = [resultados.get() for _ in hijos]
+    for hijo in hijos:
+        hijo.join()
+    return {clave: round(statistics.median(m[clave] for m in medidas), 2) for clave in medidas[0]}
+
+
+def corpus(n, rng):
+    """Mensajes de 3 clases con un vocabulario de decenas de miles de palabras (Zipf)"""
+    palabras = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyzáéíóúñ') for _ in range(rng.randint(3, 10)))
+                for _ in range(40_000)]
+    pesos = [1 / (i + 1) for i in range(len(palabras))]
+    clases = ['ventas', 'soporte', 'queja']
+    textos, etiquetas = [], []
+    for _ in range(n):
+        clase = rng.randrange(3)
+        propias = rng.choices(palabras[clase::3], weights=pesos[clase::3], k=rng.randint(2, 6))
+        comunes = rng.choices(palabras, weights=pesos, k=rng.randint(4, 16))
+        textos.append(' '.join(propias + comunes).capitalize() + rng.choice(['', '!', '?', ' por favor']))
+        etiquetas.append(clases[clase])
+    return textos, etiquetas
+
+
+def tiempo_carga_ms(funcion, ruta, repeticiones=20):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(ruta)
+        tiempos.append(time.perf_counter() - inicio)
+    return round(statistics.median(tiempos) * 1000, 3)
+
+
+def main():
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+
+    from comun.artefactos import cargar_artefacto, cargar_modelo, guardar_artefacto
+    from comun.normalizacion import NormalizadorTexto
+
+    parser = argparse.ArgumentParser(description='Benchmark de carga: joblib frente a artefacto plano')
+    parser.add_argument('--procesos', type=int, default=4)
+    parser.add_argument('--mensajes', type=int, default=60_000)
+    args = parser.parse_args()
+
+    textos, etiquetas = corpus(args.mensajes, random.Random(0))
+    pipe = make_pipeline(NormalizadorTexto(), TfidfVectorizer(max_features=30000, ngram_range=(1, 2), min_df=2),
+                         LinearSVC(class_weight='balanced', random_state=42))
+    pipe.fit(textos, etiquetas)
+    lote = textos[:2000]
+
+    resultado = {'terminos': len(pipe[1].vocabulary_), 'procesos': args.procesos}
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = {'joblib': Path(tmp) / 'pipeline.joblib', 'plano': Path(tmp) / 'pipeline.plano'}
+        joblib.dump(pipe, rutas['joblib'])
+        guardar_artefacto(pipe, rutas['plano'])
+        plano = cargar_artefacto(rutas['plano'])
+        resultado['predicciones_identicas'] = bool((plano.predict(textos) == pipe.predict(textos)).all())
+        for formato, ruta in rutas.items():
+            resultado[formato] = {'archivo_kb': round(ruta.stat().st_size / 1024, 1),
+                                  'carga_un_proceso_ms': tiempo_carga_ms(cargar_modelo, ruta, 5),
+                                  **medir_procesos(ruta, lote, args.procesos)}
+
+        reales = {}
+        for ruta in MODELOS_REALES:
+            convertido = Path(tmp) / ruta.with_suffix('.plano').name
+            guardar_artefacto(joblib.load(ruta), convertido)
+            reales[ruta.name] = {'joblib_ms': tiempo_carga_ms(joblib.load, ruta),
+                                 'plano_ms': tiempo_carga_ms(cargar_artefacto, convertido)}
+        resultado['modelos_codelabs'] = reales
+
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# Benchmark de la calibración de umbral (comun/calibracion.py)
+# Simula un flujo de feedback etiquetado (lotes de probabilidades de spam + etiqueta) y,
+# tras cada lote, recalcula el umbral para una precisión objetivo de dos formas:
+# - 'curva_completa': guarda todo el histórico y rehace precision_recall_curve sobre él
+# - 'calibrador': CalibradorUmbral.actualizar (suma el lote a los histogramas)
+# Reporta tiempo por actualización (media/p99), estado que hay que conservar y, al final,
+# precisión/recall reales de ambos umbrales sobre todo el histórico. También compara el
+# ajuste inicial (una sola vez) sobre la muestra completa.
+#
+# Uso: python benchmarks/bench_calibracion.py [--lotes 300] [--lote 1000] [--precision 0.95]
+import argparse
+import json
+import sys
+import time
+
+from scrapers import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def main():
+    import numpy as np
+    from sklearn.metrics import precision_recall_curve
+
+    from comun.calibracion import CalibradorUmbral
+
+    parser = argparse.ArgumentParser(description='Benchmark de la calibración de umbral')
+    parser.add_argument('--lotes', type=int, default=300)
+    parser.add_argument('--lote', type=int, default=1000)
+    parser.add_argument('--precision', type=float, default=0.95)
+    args = parser.parse_args()
+
+    # Probabilidades sintéticas: 30% spam, clases solapadas (beta) para que el umbral importe
+    rng = np.random.default_rng(0)
+    n = args.lotes * args.lote
+    y = rng.random(n) < 0.3
+    probs = np.where(y, rng.beta(5, 2, n), rng.beta(2, 5, n))
+
+    def umbral_exacto(p, etiquetas):
+        precision, _, umbrales = precision_recall_curve(etiquetas, p)
+        cumplen = np.flatnonzero(precision[:-1] >= args.precision)
+        return float(umbrales[cumplen[0]]) if len(cumplen) else 1.0
+
+    def calidad(umbral):
+        marcados = probs >= umbral
+        return {'umbral': round(umbral, 4),
+                'precision': round(float((marcados & y).sum() / max(marcados.sum(), 1)), 4),
+                'recall': round(float((marcados & y).sum() / y.sum()), 4)}
+
+    def por_actualizacion(tiempos):
+        tiempos = np.sort(tiempos)
+        return {'media_ms': round(float(tiempos.mean()) * 1000, 3),
+                'p99_ms': round(float(tiempos[int(len(tiempos) * 0.99)]) * 1000, 3),
+                'total_s': round(float(tiempos.sum()), 2)}
+
+    resultados = {}
+    tiempos = []
+    for fin in range(args.lote, n + 1, args.lote):
+        inicio = time.perf_counter()
+        umbral = umbral_exacto(probs[:fin], y[:fin])
+        tiempos.append(time.perf_counter() - inicio)
+    resultados['curva_completa'] = {**por_actualizacion(tiempos), 'estado_bytes': int(probs.nbytes + y.nbytes),
+                                    **calidad(umbral)}
+
+    calibrador = CalibradorUmbral(objetivo='precision', precision_objetivo=args.precision)
+    tiempos = []
+    for inicio_lote in range(0, n, args.lote):
+        inicio = time.perf_counter()
+        calibrador.actualizar(probs[inicio_lote:inicio_lote + args.lote], y[inicio_lote:inicio_lote + args.lote])
+        tiempos.append(time.perf_counter() - inicio)
+    resultados['calibrador'] = {**por_actualizacion(tiempos),
+                                'estado_bytes': int(calibrador.positivos.nbytes + calibrador.negativos.nbytes),
+                                **calidad(calibrador.umbral_)}
+
+    inicio = time.perf_counter()
+    umbral_exacto(probs, y)
+    curva = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    CalibradorUmbral(objetivo='precision', precision_objetivo=args.precision).ajustar(probs, y)
+    resultados['ajuste_inicial_ms'] = {'curva_completa': round(curva * 1000, 1),
+                                       'calibrador': round((time.perf_counter() - inicio) * 1000, 1)}
+
+    print(json.dumps({'observaciones': n, 'lotes': args.lotes, 'precision_objetivo': args.precision,
+                      'resultados': resultados}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# Benchmark del enrutamiento en lote de CSV (codelab2)
+# Compara, cada uno en un subproceso limpio:
+# - 'anterior': la sección 9 de main.py (todo el CSV en memoria, un predict, un to_csv)
+# - 'lote_1' / 'lote_N': enrutamiento_lote.py por bloques con 1 y con N procesos
+# y reporta tiempo, mensajes/s y pico de RSS, y que los tres CSV de salida sean idénticos.
+# (El pico de RSS de 'lote_N' es el del proceso que más usa; el ahorro está en que no crece
+# con el archivo.)
+#
+# Uso: python benchmarks/bench_enrutamiento_lote.py [--filas 1000000] [--bloque 20000] [--procesos N]
+import argparse
+import filecmp
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_entrenamiento_streaming import TRIAGE_DIR, ejecutar, generar_csv
+from scrapers import REPO_ROOT
+
+# Sección 9 de main.py, con los mismos tipos que enrutamiento_lote.py (columnas tal cual)
+ANTERIOR = """
+import sys
+sys.path[:0] = sys.argv[3:5]
+import joblib, pandas as pd
+from enrutamiento import AREAS
+loaded = joblib.load("pipeline_triage.joblib")
+df_real = pd.read_csv(sys.argv[1], dtype=str, keep_default_na=False)
+df_real["etiqueta"] = loaded.predict(df_real["texto"])
+df_real["ruta"] = df_real["etiqueta"].map(AREAS)
+df_real.to_csv(sys.argv[2], index=False)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del enrutamiento en lote')
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    parser.add_argument('--bloque', type=int, default=20_000)
+    parser.add_argument('--procesos', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = Path(tmp) / 'mensajes.csv'
+        generar_csv(entrada, args.filas, random.Random(0))
+
+        salidas = {}
+        casos = {'anterior': [sys.executable, '-c', ANTERIOR]}
+        for procesos in sorted({1, args.procesos}):
+            casos[f'lote_{procesos}'] = [sys.executable, 'enrutamiento_lote.py', '--bloque', str(args.bloque),
+                                         '--procesos', str(procesos)]
+        for nombre, comando in casos.items():
+            salidas[nombre] = Path(tmp) / f'{nombre}.csv'
+            if nombre == 'anterior':
+                comando = comando + [str(entrada), str(salidas[nombre]), str(REPO_ROOT), str(TRIAGE_DIR)]
+            else:
+                comando = comando + [str(entrada), '--salida', str(salidas[nombre])]
+            segundos, rss, _ = ejecutar(comando)
+            resultados[nombre] = {'segundos': round(segundos, 2), 'mensajes_por_segundo': round(args.filas / segundos),
+                                  'pico_rss_mb': rss}
+
+        identico = all(filecmp.cmp(salidas['anterior'], ruta, shallow=False) for ruta in salidas.values())
+
+    print(json.dumps({'filas': args.filas, 'bloque': args.bloque, 'nucleos': os.cpu_count(),
+                      'resultados': resultados, 'identico': identico}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
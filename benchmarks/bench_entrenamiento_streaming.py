@@ -0,0 +1,121 @@
+# Benchmark del entrenamiento por bloques del triage (codelab2)
+# Genera CSV sintéticos de mensajes etiquetados de varios tamaños y, para cada uno,
+# entrena en un subproceso limpio:
+# - 'streaming': entrenamiento_streaming.py (hashing + SGD por bloques)
+# - 'en_memoria': el enfoque de main.py (todo el CSV en un DataFrame + TF-IDF + LinearSVC)
+# y reporta tiempo, pico de RSS de cada subproceso y accuracy sobre las filas reservadas.
+# Con memoria acotada por bloque, el pico de 'streaming' no debe crecer con el corpus.
+#
+# Uso: python benchmarks/bench_entrenamiento_streaming.py [--filas 100000 400000] [--bloque 50000]
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scrapers import REPO_ROOT
+
+TRIAGE_DIR = REPO_ROOT / 'codelab2' / 'TRIAGE DE MENSAJES PARA ATENCION AL CLIENTE'
+
+FRASES = {
+    'ventas': ["Quiero saber el precio del plan premium", "¿Tienen descuentos por volumen para empresas?",
+               "¿Cómo puedo pagar? ¿Tarjeta o transferencia?", "Estoy interesado en comprar 10 unidades",
+               "¿Cuánto cuesta el plan anual y cómo se factura?"],
+    'soporte': ["No puedo iniciar sesión, sale error 403", "La app se cierra al abrir el carrito",
+                "La impresora no conecta por wifi, ya reinicié", "Se perdió mi pedido en la app, ayuda",
+                "No me llega el código de verificación"],
+    'queja': ["El pedido llegó incompleto y nadie responde", "Muy mala atención, llegó tarde y mal empacado",
+              "Estoy inconforme, el producto vino dañado", "Demasiada demora, pésimo servicio",
+              "Me trataron mal por WhatsApp, muy groseros"],
+}
+EXTRAS = ["", "!", "!!", " por favor", " urgente", " de verdad", " gracias"]
+
+# Referencia: el enfoque de main.py sobre el CSV completo, con la misma partición
+EN_MEMORIA = """
+import sys
+sys.path[:0] = sys.argv[2:4]
+import numpy as np, pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import make_pipeline
+from sklearn.svm import LinearSVC
+from comun.normalizacion import NormalizadorTexto
+from entrenamiento_streaming import es_prueba
+df = pd.read_csv(sys.argv[1], dtype=str).dropna()
+prueba = es_prueba(df['texto'], 0.2)
+pipe = make_pipeline(NormalizadorTexto(), TfidfVectorizer(max_features=30000, ngram_range=(1, 2), min_df=2),
+                     LinearSVC(class_weight='balanced', random_state=42))
+pipe.fit(df['texto'][~prueba], df['etiqueta'][~prueba])
+print(f"Accuracy test: {np.mean(pipe.predict(df['texto'][prueba]) == df['etiqueta'][prueba]):.3f}")
+"""
+
+
+def generar_csv(ruta, filas, rng):
+    """Mensajes etiquetados con variaciones, números de pedido y nombres (vocabulario creciente)"""
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'texto', 'etiqueta'])
+        for i in range(filas):
+            etiqueta = rng.choice(list(FRASES))
+            texto = rng.choice(FRASES[etiqueta]) + rng.choice(EXTRAS)
+            if rng.random() < 0.5:
+                texto += f" pedido {rng.randrange(10**7)}"
+            if rng.random() < 0.3:
+                texto = f"Hola soy cliente{rng.randrange(10**6)}, " + texto
+            writer.writerow([i, texto, etiqueta])
+
+
+def ejecutar(argumentos):
+    """Ejecuta un subproceso y devuelve (segundos, pico de RSS en MB, salida)"""
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(argumentos, stdout=subprocess.PIPE, text=True, cwd=TRIAGE_DIR)
+    salida = proceso.stdout.read()
+    _, estado, uso = os.wait4(proceso.pid, 0)
+    proceso.returncode = os.waitstatus_to_exitcode(estado)
+    if proceso.returncode:
+        raise RuntimeError(f"{argumentos[1]} terminó con código {proceso.returncode}")
+    return time.perf_counter() - inicio, round(uso.ru_maxrss / 1024, 1), salida
+
+
+def accuracy(salida):
+    linea = next(linea for linea in salida.splitlines() if linea.startswith('Accuracy test'))
+    return float(linea.split(':')[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del entrenamiento por bloques del triage')
+    parser.add_argument('--filas', type=int, nargs='+', default=[100_000, 400_000])
+    parser.add_argument('--bloque', type=int, default=50_000)
+    parser.add_argument('--sin-en-memoria', action='store_true', help='no ejecutar la referencia en memoria')
+    args = parser.parse_args()
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for filas in args.filas:
+            ruta = Path(tmp) / f'mensajes_{filas}.csv'
+            generar_csv(ruta, filas, random.Random(filas))
+
+            segundos, rss, salida = ejecutar([
+                sys.executable, 'entrenamiento_streaming.py', str(ruta), '--bloque', str(args.bloque),
+                '--salida', str(Path(tmp) / 'pipeline.joblib'),
+            ])
+            resultado = {'csv_mb': round(ruta.stat().st_size / 2**20, 1),
+                         'streaming': {'segundos': round(segundos, 1), 'pico_rss_mb': rss,
+                                       'accuracy': accuracy(salida)}}
+            if not args.sin_en_memoria:
+                segundos, rss, salida = ejecutar([
+                    sys.executable, '-c', EN_MEMORIA, str(ruta), str(REPO_ROOT), str(TRIAGE_DIR),
+                ])
+                resultado['en_memoria'] = {'segundos': round(segundos, 1), 'pico_rss_mb': rss,
+                                           'accuracy': accuracy(salida)}
+            resultados[filas] = resultado
+
+    print(json.dumps({'bloque': args.bloque, 'filas': resultados}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
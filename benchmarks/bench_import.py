@@ -0,0 +1,93 @@
+# Benchmark del arranque en frío de los scrapers (codelab4 y codelab5)
+# Cada medición es un intérprete nuevo que solo importa el main.py del scraper
+# (como haría un worker de corta vida): tiempo de import, memoria máxima y qué
+# dependencias pesadas quedaron cargadas.
+# Con --before REV se mide también el árbol de esa revisión (extraído con git archive).
+#
+# Uso: python benchmarks/bench_import.py [--runs 7] [--before HEAD~1]
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from scrapers import BOOKS_DIR, HN_DIR, REPO_ROOT
+
+HEAVY_MODULES = ('pandas', 'numpy', 'bs4', 'lxml', 'requests')
+
+# Se ejecuta en el intérprete hijo: importa main.py como lo haría un worker
+WORKER = """
+import importlib.util, json, resource, sys, time
+directory = sys.argv[1]
+start = time.perf_counter()
+if directory:
+    sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location('scraper', directory + '/main.py')
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_modules': [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(directory, runs):
+    """Mediana de `runs` imports en frío del main.py de `directory` ('' = intérprete vacío)"""
+    samples = []
+    # La primera ejecución (que además compila los .pyc) no cuenta
+    for _ in range(runs + 1):
+        output = subprocess.run(
+            [sys.executable, '-c', WORKER, str(directory)],
+            capture_output=True, text=True, check=True, cwd=tempfile.gettempdir(),
+        ).stdout
+        samples.append(json.loads(output))
+    samples = samples[1:]
+    return {
+        'import_ms': round(statistics.median(s['import_ms'] for s in samples), 1),
+        'max_rss_mb': round(statistics.median(s['max_rss_mb'] for s in samples), 1),
+        'heavy_modules': samples[-1]['heavy_modules'],
+    }
+
+
+def checkout(revision, target):
+    """Extrae codelab4, codelab5 y comun de una revisión en `target`"""
+    paths = [str(p.relative_to(REPO_ROOT)) for p in (HN_DIR, BOOKS_DIR)] + ['comun']
+    archive = subprocess.run(
+        ['git', 'archive', revision, *paths], cwd=REPO_ROOT, capture_output=True, check=True,
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def measure_tree(root, runs):
+    return {
+        'hn': measure(root / HN_DIR.relative_to(REPO_ROOT), runs),
+        'books': measure(root / BOOKS_DIR.relative_to(REPO_ROOT), runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del import en frío de los scrapers')
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--before', help='revisión de git con la que comparar (p. ej. HEAD~1)')
+    args = parser.parse_args()
+
+    results = {'interpreter': measure('', args.runs), 'current': measure_tree(REPO_ROOT, args.runs)}
+    if args.before:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkout(args.before, tmp)
+            results['before'] = measure_tree(Path(tmp), args.runs)
+        for name, current in results['current'].items():
+            current['speedup'] = round(results['before'][name]['import_ms'] / current['import_ms'], 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# Benchmark del filtrado por palabras clave de Hacker News (codelab4)
+# Compara el filtro anterior (any(keyword in title) por cada título, subcadenas)
+# con el KeywordMatcher (índice de tokens, palabra completa) al crecer la lista de
+# palabras vigiladas.
+#
+# Uso: python benchmarks/bench_keywords.py [--titles 20000] [--keywords 10 100 1000 5000]
+import argparse
+import json
+import random
+import string
+import time
+
+from fixtures import WORDS, hn_story
+from scrapers import load_hn_scraper
+
+
+def legacy_filter(news_data, keywords):
+    """Filtro anterior, copiado tal cual para comparar"""
+    filtered = []
+    keywords_lower = [kw.lower() for kw in keywords]
+    for item in news_data:
+        title_lower = item['title'].lower()
+        if any(keyword in title_lower for keyword in keywords_lower):
+            filtered.append(item)
+    return filtered
+
+
+def watch_list(size, rng):
+    """Palabras vigiladas: unas pocas que aparecen en los títulos y el resto términos al azar"""
+    keywords = [rng.choice(WORDS) for _ in range(3)] + [f"{rng.choice(WORDS)} {rng.choice(WORDS)}"]
+    while len(keywords) < size:
+        keywords.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))))
+    rng.shuffle(keywords)
+    return keywords[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del filtrado por palabras clave')
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--keywords', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    load_hn_scraper()  # deja el directorio de codelab4 en sys.path
+    from keyword_matcher import KeywordMatcher
+
+    news = [{'title': hn_story(45000000 - i)[0]} for i in range(args.titles)]
+    rng = random.Random(0)
+
+    results = {}
+    for size in args.keywords:
+        keywords = watch_list(size, rng)
+
+        start = time.perf_counter()
+        legacy = legacy_filter(news, keywords)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matched = list(matcher.scan(news))
+        scan_elapsed = time.perf_counter() - start
+
+        results[size] = {
+            'legacy_titles_per_second': round(len(news) / legacy_elapsed),
+            'matcher_titles_per_second': round(len(news) / scan_elapsed),
+            'matcher_build_ms': round(build_elapsed * 1000, 1),
+            'speedup': round(legacy_elapsed / scan_elapsed, 2),
+            # El filtro anterior acepta subcadenas ('ai' dentro de "said"); el nuevo no
+            'legacy_matches': len(legacy),
+            'matcher_matches': len(matched),
+        }
+
+    print(json.dumps({'titles': len(news), 'keywords': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
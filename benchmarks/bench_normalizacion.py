@@ -0,0 +1,89 @@
+# Benchmark de la normalización de texto de los clasificadores (codelab2 y codelab3)
+# Compara la limpieza anterior (dos re.sub por mensaje, aplicada con Series.apply)
+# con comun.normalizacion (tabla de bytes + split/join) sobre un millón de mensajes,
+# y valida que el resultado sea idéntico: sobre los mensajes del benchmark y sobre
+# cada carácter Unicode (solo, entre letras y repetido entre espacios).
+#
+# Uso: python benchmarks/bench_normalizacion.py [--mensajes 1000000]
+import argparse
+import json
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+from scrapers import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT))
+from comun.normalizacion import limpiar, limpiar_lote  # noqa: E402
+
+FRASES = [
+    "Quiero saber el precio del plan premium", "¿Tienen descuentos por volumen para empresas?",
+    "No puedo iniciar sesión, sale error 403", "La impresora no conecta por wifi, ya reinicié",
+    "Muy mala atención, llegó tarde y mal empacado", "Me trataron mal por WhatsApp, muy groseros",
+    "Gana dinero fácil en 24 horas, haz clic aquí", "Crypto inversión garantizada 10% diario",
+    "Último aviso: paga ahora para evitar bloqueo de cuenta", "Recarga gratis, solo confirma tu contraseña",
+]
+EXTRAS = ["", "!", "!!", " por favor", " URGENTE", " de verdad", " gracias 🙏", " ¿ok?", "   ", " 😡😡"]
+
+
+def limpiar_anterior(s: str) -> str:
+    """Limpieza anterior, copiada tal cual para comparar"""
+    s = s.lower()
+    s = re.sub(r"[^a-záéíóúñü0-9\s]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def mensajes(n, rng):
+    return pd.Series([rng.choice(FRASES) + rng.choice(EXTRAS) for _ in range(n)], name="texto")
+
+
+def validar_unicode():
+    """Devuelve los casos (si los hay) en que limpiar difiere de la limpieza anterior"""
+    distintos = []
+    for codigo in range(sys.maxunicode + 1):
+        if 0xD800 <= codigo <= 0xDFFF:  # sustitutos sueltos: no son texto válido
+            continue
+        c = chr(codigo)
+        for s in (c, f"a{c}b", f" {c}{c} x"):
+            if limpiar(s) != limpiar_anterior(s):
+                distintos.append(s)
+    return distintos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la normalización de texto")
+    parser.add_argument("--mensajes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    serie = mensajes(args.mensajes, random.Random(0))
+
+    start = time.perf_counter()
+    anterior = serie.apply(limpiar_anterior)
+    anterior_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    por_mensaje = [limpiar(s) for s in serie]
+    por_mensaje_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lote = limpiar_lote(serie)
+    lote_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "mensajes": len(serie),
+        "anterior_apply_s": round(anterior_s, 3),
+        "limpiar_por_mensaje_s": round(por_mensaje_s, 3),
+        "limpiar_lote_s": round(lote_s, 3),
+        "mensajes_por_segundo_lote": round(len(serie) / lote_s),
+        "speedup_lote": round(anterior_s / lote_s, 2),
+        "identico": lote.equals(anterior) and por_mensaje == anterior.tolist(),
+        "unicode_distintos": validar_unicode(),
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Benchmark de parseo por página del scraper de libros (codelab5)
+# Compara el backend original (html.parser, árbol completo) con los rápidos
+# y comprueba que todos devuelven exactamente los mismos diccionarios.
+#
+# Uso: python benchmarks/bench_parse_books.py [--pages 50] [--repeat 3]
+import argparse
+import json
+import time
+
+from fixtures import render_books_page
+from scrapers import load_books_scraper
+
+
+def without_timestamp(books):
+    return [{k: v for k, v in book.items() if k != 'scraped_at'} for book in books]
+
+
+def time_backend(scraper, pages, parser, repeat):
+    """Mejor tiempo (de `repeat` vueltas) para parsear todas las páginas"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        books = [scraper.parse_page_books(html, n, parser) for n, html in enumerate(pages, start=1)]
+        best = min(best, time.perf_counter() - start)
+    return best, [book for page_books in books for book in page_books]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de parseo del scraper de libros')
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    scraper = load_books_scraper()
+    pages = [render_books_page(n, args.pages) for n in range(1, args.pages + 1)]
+
+    results = {}
+    reference = None
+    for backend in scraper.PARSER_BACKENDS:
+        elapsed, books = time_backend(scraper, pages, backend, args.repeat)
+        if reference is None:
+            reference = without_timestamp(books)
+        results[backend] = {
+            'ms_per_page': round(elapsed / len(pages) * 1000, 3),
+            'pages_per_second': round(len(pages) / elapsed, 1),
+            'identical_output': without_timestamp(books) == reference,
+        }
+
+    baseline = results['html.parser']['ms_per_page']
+    for backend, result in results.items():
+        result['speedup'] = round(baseline / result['ms_per_page'], 2)
+
+    print(json.dumps({'pages': len(pages), 'page_bytes': len(pages[0]), 'backends': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
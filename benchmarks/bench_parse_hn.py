@@ -0,0 +1,142 @@
+# Benchmark del extractor de portadas de Hacker News (codelab4)
+# Compara el extractor anterior (árbol completo, find_all/find_next_sibling por fila,
+# puntos y comentarios como texto re-parseados con re.findall) con el actual de una
+# sola pasada con registros tipados (camino lxml y camino BeautifulSoup), y valida
+# todos contra los datos del fixture.
+#
+# Uso: python benchmarks/bench_parse_hn.py [--pages 30] [--repeat 3]
+import argparse
+import json
+import re
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from fixtures import hn_story, render_hn_page
+from scrapers import load_hn_scraper
+
+
+def legacy_parse_hn_news(html):
+    """Extractor anterior (estrategia de filas), copiado tal cual para comparar"""
+    soup = BeautifulSoup(html, 'html.parser')
+    news_items = []
+    for row in soup.find_all('tr', class_='athing'):
+        for title_link in row.find_all('a'):
+            href = title_link.get('href', '')
+            text = title_link.text.strip()
+            if text and len(text) > 5:
+                if href.startswith('/'):
+                    href = 'https://news.ycombinator.com' + href
+                elif not href.startswith('http'):
+                    href = 'https://news.ycombinator.com/' + href
+                score = 'N/A'
+                comments = 'N/A'
+                try:
+                    next_row = row.find_next_sibling('tr')
+                    if next_row:
+                        score_span = next_row.find('span', class_='score')
+                        if score_span:
+                            score = score_span.text
+                        comments_link = next_row.find('a', href=lambda x: x and 'item?id=' in x)
+                        if comments_link:
+                            comments = comments_link.text
+                except:
+                    pass
+                news_items.append({
+                    'title': text,
+                    'link': href,
+                    'score': score,
+                    'comments': comments,
+                    'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                })
+                break
+    return news_items
+
+
+def legacy_numbers(items, field):
+    """Re-parseo con re.findall que hacían analyze_news_data y filter_news_by_score"""
+    numbers = []
+    for item in items:
+        found = re.findall(r'\d+', item[field]) if item[field] != 'N/A' else []
+        numbers.append(int(found[0]) if found else None)
+    return numbers
+
+
+def legacy_extract(html):
+    items = legacy_parse_hn_news(html)
+    return items, legacy_numbers(items, 'score'), legacy_numbers(items, 'comments')
+
+
+def typed_extract(extract, html):
+    items = extract(html, '2025-01-01 00:00:00', 'https://news.ycombinator.com/')
+    return items, [item['score'] for item in items], [item['comments'] for item in items]
+
+
+def best_time(extract, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [extract(html) for html in pages]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def accuracy(results, expected):
+    """Fracción de noticias cuyos puntos y comentarios coinciden con el fixture"""
+    scores = comments = total = 0
+    for (_, page_scores, page_comments), page_expected in zip(results, expected):
+        for score, count, (true_score, true_comments) in zip(page_scores, page_comments, page_expected):
+            scores += score == true_score
+            comments += count == true_comments
+            total += 1
+    return round(scores / total, 3), round(comments / total, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del extractor de Hacker News')
+    parser.add_argument('--pages', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    load_hn_scraper()  # deja el directorio de codelab4 en sys.path
+    import hn_listing
+
+    extractors = {'legacy': legacy_extract}
+    if hn_listing.lxml_html is not None:
+        extractors['single_pass_lxml'] = lambda html: typed_extract(hn_listing._extract_lxml, html)
+    extractors['single_pass_soup'] = lambda html: typed_extract(hn_listing._extract_soup, html)
+
+    pages = [render_hn_page(n, args.pages) for n in range(1, args.pages + 1)]
+    # Puntos y comentarios reales de cada fila (mismo orden que render_hn_page)
+    expected = [
+        [hn_story(45000000 - (n - 1) * 30 - i)[1:3] for i in range(30)]
+        for n in range(1, args.pages + 1)
+    ]
+
+    report = {}
+    typed_records = []
+    for name, extract in extractors.items():
+        elapsed, results = best_time(extract, pages, args.repeat)
+        score_ok, comments_ok = accuracy(results, expected)
+        report[name] = {
+            'ms_per_page': round(elapsed / len(pages) * 1000, 3),
+            'pages_per_second': round(len(pages) / elapsed, 1),
+            'score_accuracy': score_ok,
+            'comments_accuracy': comments_ok,
+        }
+        if name != 'legacy':
+            typed_records.append([items for items, _, _ in results])
+
+    baseline = report['legacy']['ms_per_page']
+    for result in report.values():
+        result['speedup'] = round(baseline / result['ms_per_page'], 2)
+
+    # Los dos caminos del extractor nuevo deben dar exactamente los mismos registros
+    report['identical_typed_output'] = all(records == typed_records[0] for records in typed_records)
+
+    print(json.dumps({'pages': len(pages), 'page_bytes': len(pages[0]), 'extractors': report}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
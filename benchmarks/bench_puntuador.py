@@ -0,0 +1,113 @@
+# Benchmark del puntuador solo-NumPy (comun/puntuador.py) frente a los pipelines de sklearn
+# Para cada modelo (el triage de codelab2, el spam de codelab3 y uno sintético de 30k términos):
+# - Arranque en frío en un subproceso: importar + cargar + primera predicción
+#   ('joblib' = joblib.load del pipeline, 'plano' = comun.artefactos.cargar_artefacto,
+#   'puntuador' = comun.puntuador.PuntuadorLineal)
+# - Latencia de un mensaje (p50/p99) y throughput por lotes en el propio proceso
+# - Validación: etiquetas idénticas al .joblib y puntuaciones bit a bit iguales al 'plano'
+#
+# Uso: python benchmarks/bench_puntuador.py [--mensajes 20000]
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_artefactos import MODELOS_REALES, corpus
+from bench_normalizacion import EXTRAS, FRASES
+from scrapers import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT))
+
+ARRANQUE = {
+    'joblib': "import joblib; pipe = joblib.load(RUTA)",
+    'plano': "from comun.artefactos import cargar_artefacto; pipe = cargar_artefacto(RUTA)",
+    'puntuador': "from comun.puntuador import PuntuadorLineal; pipe = PuntuadorLineal(RUTA)",
+}
+PLANTILLA = """
+import sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, {raiz!r})
+RUTA = {ruta!r}
+{carga}
+pipe.predict(["No puedo entrar a mi cuenta, sale error 500"])
+print(time.perf_counter() - inicio)
+"""
+
+
+def arranque_ms(formato, ruta, repeticiones=5):
+    """Mediana de importar + cargar + predecir un mensaje en un proceso nuevo (tras uno de calentamiento)"""
+    codigo = PLANTILLA.format(raiz=str(REPO_ROOT), ruta=str(ruta), carga=ARRANQUE[formato])
+    tiempos = [float(subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True,
+                                    check=True).stdout) for _ in range(repeticiones + 1)]
+    return round(statistics.median(tiempos[1:]) * 1000, 1)
+
+
+def latencias_us(modelo, textos):
+    tiempos = []
+    for texto in textos:
+        inicio = time.perf_counter()
+        modelo.predict([texto])
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return {'p50_us': round(tiempos[len(tiempos) // 2] * 1e6, 1), 'p99_us': round(tiempos[int(len(tiempos) * 0.99)] * 1e6, 1)}
+
+
+def mensajes_por_segundo(modelo, textos, lote=1000):
+    inicio = time.perf_counter()
+    for i in range(0, len(textos), lote):
+        modelo.predict(textos[i:i + lote])
+    return round(len(textos) / (time.perf_counter() - inicio))
+
+
+def main():
+    import joblib
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+
+    from comun.artefactos import cargar_artefacto, exportar_puntuador
+    from comun.normalizacion import NormalizadorTexto
+
+    parser = argparse.ArgumentParser(description='Benchmark del puntuador solo-NumPy')
+    parser.add_argument('--mensajes', type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    reales = [rng.choice(FRASES) + rng.choice(EXTRAS) for _ in range(args.mensajes)]
+    sinteticos, etiquetas = corpus(60_000, random.Random(0))
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        modelos = {ruta.stem: (ruta, joblib.load(ruta), reales) for ruta in MODELOS_REALES}
+        pipe = make_pipeline(NormalizadorTexto(), TfidfVectorizer(max_features=30000, ngram_range=(1, 2), min_df=2),
+                             LinearSVC(class_weight='balanced', random_state=42)).fit(sinteticos, etiquetas)
+        joblib.dump(pipe, Path(tmp) / 'sintetico_30k.joblib')
+        modelos['sintetico_30k'] = (Path(tmp) / 'sintetico_30k.joblib', pipe, sinteticos[:args.mensajes])
+
+        for nombre, (ruta, pipe, textos) in modelos.items():
+            ruta_plano = Path(tmp) / f'{nombre}.plano'
+            puntuador = exportar_puntuador(pipe, ruta_plano, textos)  # ValueError si alguna etiqueta difiere
+            plano = cargar_artefacto(ruta_plano)
+            rutas = {'joblib': ruta, 'plano': ruta_plano, 'puntuador': ruta_plano}
+            en_proceso = {'joblib': pipe, 'plano': plano, 'puntuador': puntuador}
+            resultados[nombre] = {
+                'etiquetas_identicas_joblib': True,
+                'puntuaciones_bit_a_bit_plano': bool(np.array_equal(plano.decision_function(textos),
+                                                                    puntuador.decision_function(textos))),
+                **{formato: {'arranque_ms': arranque_ms(formato, rutas[formato]),
+                             **latencias_us(modelo, textos[:2000]),
+                             'mensajes_por_segundo_lote_1000': mensajes_por_segundo(modelo, textos)}
+                   for formato, modelo in en_proceso.items()},
+            }
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# Benchmark de la selección de hiperparámetros (comun/seleccion.py)
+# Con la misma rejilla que el triage de codelab2 (24 candidatos, 5 pliegues) sobre un corpus
+# sintético de vocabulario amplio, compara:
+# - 'grid_serial': GridSearchCV exhaustivo, un proceso, sin caché (vectoriza en cada ajuste)
+# - 'grid_cache': GridSearchCV exhaustivo con Pipeline(memory=...)
+# - 'halving': seleccionar_modelo (successive halving + caché + n_jobs=-1)
+# y reporta tiempo total, ajustes realizados, mejor configuración, su F1 de validación
+# cruzada y su F1 en un conjunto de prueba apartado.
+#
+# Uso: python benchmarks/bench_seleccion.py [--filas 10000] [--n-jobs -1]
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_artefactos import corpus
+from scrapers import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def main():
+    from joblib import Memory
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics import f1_score
+    from sklearn.model_selection import GridSearchCV, train_test_split
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+
+    from comun.normalizacion import NormalizadorTexto
+    from comun.seleccion import REJILLA_TFIDF, seleccionar_modelo
+
+    parser = argparse.ArgumentParser(description='Benchmark de la selección de hiperparámetros')
+    parser.add_argument('--filas', type=int, default=10_000)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+
+    textos, etiquetas = corpus(args.filas, random.Random(0))
+    X_train, X_test, y_train, y_test = train_test_split(textos, etiquetas, test_size=0.2, random_state=42,
+                                                        stratify=etiquetas)
+    pipe = make_pipeline(NormalizadorTexto(), TfidfVectorizer(max_features=30000, ngram_range=(1, 2), min_df=2),
+                         LinearSVC(class_weight='balanced', random_state=42))
+    rejilla = {**REJILLA_TFIDF, 'linearsvc__C': [0.1, 1, 10]}
+
+    def resumen(busqueda, segundos, ajustes):
+        return {'segundos': round(segundos, 1), 'ajustes': ajustes,
+                'mejor': {k.split('__')[-1]: v for k, v in busqueda.best_params_.items()},
+                'f1_cv': round(busqueda.best_score_, 4),
+                'f1_prueba': round(f1_score(y_test, busqueda.best_estimator_.predict(X_test), average='macro'), 4)}
+
+    resultados = {}
+    for nombre, cache in (('grid_serial', False), ('grid_cache', True)):
+        with tempfile.TemporaryDirectory() as directorio:
+            busqueda = GridSearchCV(pipe.set_params(memory=Memory(directorio, verbose=0) if cache else None),
+                                    rejilla, scoring='f1_macro', cv=5, n_jobs=1)
+            inicio = time.perf_counter()
+            busqueda.fit(X_train, y_train)
+            resultados[nombre] = resumen(busqueda, time.perf_counter() - inicio, len(busqueda.cv_results_['params']) * 5)
+    pipe.set_params(memory=None)
+
+    busqueda = seleccionar_modelo(pipe, rejilla, X_train, y_train, scoring='f1_macro', n_jobs=args.n_jobs)
+    resultados['halving'] = resumen(busqueda, busqueda.segundos_, sum(busqueda.n_candidates_) * busqueda.n_splits_)
+    resultados['halving']['rondas'] = [{'candidatos': c, 'muestras': m}
+                                       for c, m in zip(busqueda.n_candidates_, busqueda.n_resources_)]
+
+    print(json.dumps({'filas': args.filas, 'nucleos': os.cpu_count(), 'candidatos': busqueda.n_candidates_[0],
+                      'resultados': resultados}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
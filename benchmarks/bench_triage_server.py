@@ -0,0 +1,139 @@
+# Benchmark del servidor de triage con micro-lotes (codelab2)
+# Arranca servidor_triage en este proceso (puerto efímero o socket Unix) y lanza
+# clientes concurrentes con conexiones keep-alive, un mensaje por petición, desde
+# otros procesos (para que no compitan por el GIL con el servidor).
+# Compara predict de uno en uno (--max-lote 1) con micro-lotes, y reporta
+# latencia p50/p99 vista por el cliente, throughput y tamaño medio de lote.
+#
+# Uso: python benchmarks/bench_triage_server.py [--clientes 32] [--peticiones 300] [--max-lote 1 64]
+import argparse
+import http.client
+import json
+import multiprocessing
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from scrapers import REPO_ROOT
+
+TRIAGE_DIR = REPO_ROOT / 'codelab2' / 'TRIAGE DE MENSAJES PARA ATENCION AL CLIENTE'
+
+FRASES = [
+    "Quiero saber el precio del plan premium", "¿Tienen descuentos por volumen para empresas?",
+    "No puedo iniciar sesión, sale error 403", "La app se cierra al abrir el carrito",
+    "El pedido llegó incompleto y nadie responde", "Demasiada demora, pésimo servicio",
+    "Se dañó el botón de encendido, necesito ayuda", "¿Hacen descuento si compro 15 licencias?",
+]
+EXTRAS = ["", "!", " por favor", " urgente", " de verdad", " gracias", " hoy mismo"]
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def cliente(direccion, peticiones, semilla):
+    """Un cliente keep-alive: devuelve la latencia de cada petición (segundos)"""
+    rng = random.Random(semilla)
+    conexion = UnixHTTPConnection(direccion) if isinstance(direccion, str) else http.client.HTTPConnection(*direccion)
+    latencias = []
+    for _ in range(peticiones):
+        cuerpo = json.dumps({'mensaje': rng.choice(FRASES) + rng.choice(EXTRAS)})
+        inicio = time.perf_counter()
+        conexion.request('POST', '/enrutar', cuerpo, {'Content-Type': 'application/json'})
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        latencias.append(time.perf_counter() - inicio)
+        assert respuesta.status == 200
+    conexion.close()
+    return latencias
+
+
+def proceso_clientes(direccion, clientes, peticiones, semilla):
+    """Varios clientes en hilos de un proceso aparte (no compiten por el GIL del servidor)"""
+    with ThreadPoolExecutor(clientes) as pool:
+        partes = pool.map(lambda i: cliente(direccion, peticiones, semilla + i), range(clientes))
+        return [latencia for parte in partes for latencia in parte]
+
+
+def escenario(servidor_triage, pipe, max_lote, args, procesos, socket_path=None):
+    lotes = servidor_triage.MicroLotes(pipe, max_lote=max_lote, espera_max=args.espera_ms / 1000)
+    servidor = servidor_triage.crear_servidor(lotes, port=0, socket_path=socket_path)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    direccion = socket_path or ('127.0.0.1', servidor.server_address[1])
+
+    por_proceso = args.clientes // args.procesos
+    inicio = time.perf_counter()
+    futuros = [procesos.submit(proceso_clientes, direccion, por_proceso, args.peticiones, i * por_proceso)
+               for i in range(args.procesos)]
+    latencias = [latencia for futuro in futuros for latencia in futuro.result()]
+    transcurrido = time.perf_counter() - inicio
+
+    servidor.shutdown()
+    servidor.server_close()
+    lotes.cerrar()
+    p50, p99 = np.percentile(latencias, [50, 99]) * 1000
+    return {
+        'mensajes_por_segundo': round(len(latencias) / transcurrido, 1),
+        'cliente_p50_ms': round(float(p50), 2),
+        'cliente_p99_ms': round(float(p99), 2),
+        'servidor': lotes.estadisticas(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del servidor de triage con micro-lotes')
+    parser.add_argument('--clientes', type=int, default=32)
+    parser.add_argument('--procesos', type=int, default=4, help='procesos entre los que se reparten los clientes')
+    parser.add_argument('--peticiones', type=int, default=300, help='peticiones por cliente')
+    parser.add_argument('--max-lote', type=int, nargs='+', default=[1, 64])
+    parser.add_argument('--espera-ms', type=float, default=5.0)
+    parser.add_argument('--unix', action='store_true', help='usar un socket Unix en lugar de TCP')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(TRIAGE_DIR))
+    import joblib
+    import servidor_triage
+
+    pipe = joblib.load(TRIAGE_DIR / 'pipeline_triage.joblib')
+
+    # Coste de predict por mensaje según el tamaño de la llamada (sin red)
+    textos = [f + e for f in FRASES for e in EXTRAS] * 4
+    predict_us = {}
+    for tamano in (1, 8, 64):
+        inicio = time.perf_counter()
+        for i in range(0, len(textos), tamano):
+            pipe.predict(textos[i:i + tamano])
+        predict_us[tamano] = round((time.perf_counter() - inicio) / len(textos) * 1e6, 1)
+
+    resultados = {}
+    # Los procesos cliente se crean antes de arrancar ningún servidor (spawn, sin heredar hilos)
+    with tempfile.TemporaryDirectory() as tmp, \
+            ProcessPoolExecutor(args.procesos, mp_context=multiprocessing.get_context('spawn')) as procesos:
+        for max_lote in args.max_lote:
+            socket_path = str(Path(tmp) / 'triage.sock') if args.unix else None
+            resultados[max_lote] = escenario(servidor_triage, pipe, max_lote, args, procesos, socket_path)
+
+    print(json.dumps({
+        'clientes': args.procesos * (args.clientes // args.procesos),
+        'peticiones': args.procesos * (args.clientes // args.procesos) * args.peticiones,
+        'transporte': 'unix' if args.unix else 'tcp',
+        'predict_us_por_mensaje_segun_lote': predict_us,
+        'max_lote': resultados,
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
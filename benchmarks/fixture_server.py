@@ -0,0 +1,117 @@
+# Servidor HTTP local que imita books.toscrape.com y la portada de Hacker News
+#
+#   /                                  -> página 1 del catálogo
+#   /catalogue/page-N.html             -> página N del catálogo
+#   /catalogue/<slug>_<n>/index.html   -> detalle del producto n
+#   /hn/news?p=N                       -> portada N de Hacker News
+#   /hn/item?id=N                      -> hilo de comentarios de la historia N
+#
+# Uso independiente: python benchmarks/fixture_server.py --port 8000 --book-pages 1000
+import argparse
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from fixtures import render_books_page, render_hn_item, render_hn_page, render_product_page
+
+CATALOGUE_PAGE = re.compile(r'^/catalogue/page-(\d+)\.html$')
+PRODUCT_PAGE = re.compile(r'^/catalogue/[^/]+_(\d+)/index\.html$')
+
+
+class FixtureSite:
+    """Contenido del sitio sintético (tamaño configurable)"""
+
+    def __init__(self, book_pages=50, books_per_page=20, hn_pages=10):
+        self.book_pages = book_pages
+        self.books_per_page = books_per_page
+        self.hn_pages = hn_pages
+        # Las páginas se generan una vez: el servidor no debe ser el cuello de botella
+        self.render = lru_cache(maxsize=None)(self._render)
+
+    def _render(self, path):
+        url = urlparse(path)
+        if url.path in ('/', '/index.html'):
+            return render_books_page(1, self.book_pages, self.books_per_page)
+
+        if match := CATALOGUE_PAGE.match(url.path):
+            page = int(match.group(1))
+            if 1 <= page <= self.book_pages:
+                return render_books_page(page, self.book_pages, self.books_per_page)
+
+        elif match := PRODUCT_PAGE.match(url.path):
+            return render_product_page(int(match.group(1)))
+
+        elif url.path in ('/hn', '/hn/', '/hn/news'):
+            page = int(parse_qs(url.query).get('p', ['1'])[0])
+            if 1 <= page <= self.hn_pages:
+                return render_hn_page(page, self.hn_pages)
+
+        elif url.path == '/hn/item':
+            return render_hn_item(int(parse_qs(url.query)['id'][0]))
+
+        return None
+
+
+def make_handler(site):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, como los servidores reales
+
+        def do_GET(self):
+            html = site.render(self.path)
+            if html is None:
+                self._send(404, b'Not found')
+                return
+
+            body = html.encode('utf-8')
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self._send(304, b'', etag)
+            else:
+                self._send(200, body, etag)
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            # Sin charset, igual que books.toscrape.com
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            if etag:
+                self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+
+def start_fixture_server(site, host='127.0.0.1', port=0):
+    """Arranca el servidor en un hilo y devuelve (servidor, url_base)"""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sitio sintético para medir los scrapers')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--book-pages', type=int, default=50)
+    parser.add_argument('--books-per-page', type=int, default=20)
+    parser.add_argument('--hn-pages', type=int, default=10)
+    args = parser.parse_args()
+
+    site = FixtureSite(args.book_pages, args.books_per_page, args.hn_pages)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(site))
+    print(f"Sirviendo en http://127.0.0.1:{args.port} (Ctrl+C para parar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+# Páginas sintéticas con la misma estructura que books.toscrape.com
+# para medir los scrapers sin depender del sitio real.
+import random
+
+RATINGS = ['One', 'Two', 'Three', 'Four', 'Five']
+CATEGORIES = [
+    'Travel', 'Mystery', 'Historical Fiction', 'Sequential Art', 'Classics', 'Philosophy',
+    'Romance', 'Womens Fiction', 'Fiction', 'Childrens', 'Religion', 'Nonfiction', 'Music',
+    'Default', 'Science Fiction', 'Sports and Games', 'Add a comment', 'Fantasy', 'New Adult',
+    'Young Adult', 'Science', 'Poetry', 'Paranormal', 'Art', 'Psychology', 'Autobiography',
+    'Parenting', 'Adult Fiction', 'Humor', 'Horror', 'History', 'Food and Drink',
+    'Christian Fiction', 'Business', 'Biography', 'Thriller', 'Contemporary', 'Spirituality',
+    'Academic', 'Self Help', 'Historical', 'Christian', 'Suspense', 'Short Stories', 'Novels',
+    'Health', 'Politics', 'Cultural', 'Erotica', 'Crime',
+]
+WORDS = [
+    'light', 'attic', 'velvet', 'soumission', 'sharp', 'objects', 'sapiens', 'requiem', 'red',
+    'dirty', 'little', 'secrets', 'coming', 'woman', 'boys', 'boat', 'marriage', 'python',
+    'mesaerion', 'best', 'science', 'fiction', 'stories', 'olio', 'rip', 'it', 'up', 'and',
+    'start', 'again', 'our', 'band', 'could', 'be', 'your', 'life', 'black', 'maria',
+]
+
+
+def book_title(index):
+    """Título determinista para el producto número `index`"""
+    rng = random.Random(index)
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).title() + f" #{index}"
+
+
+def product_slug(index):
+    """Ruta del producto bajo /catalogue/ (como en el sitio real)"""
+    return book_title(index).lower().replace(' ', '-').replace('#', '') + f"_{index}"
+
+
+def render_product(index, link_prefix):
+    rng = random.Random(index)
+    title = book_title(index)
+    slug = link_prefix + product_slug(index)
+    return f'''
+            <li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">
+    <article class="product_pod">
+            <div class="image_container">
+                    <a href="{slug}/index.html"><img src="media/cache/2c/da/{index}.jpg" alt="{title}" class="thumbnail"></a>
+            </div>
+                <p class="star-rating {RATINGS[rng.randrange(5)]}">
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                </p>
+            <h3><a href="{slug}/index.html" title="{title}">{title[:30]}...</a></h3>
+            <div class="product_price">
+        <p class="price_color">£{rng.uniform(10, 60):.2f}</p>
+<p class="instock availability">
+    <i class="icon-ok"></i>
+        In stock
+</p>
+    <form>
+        <button type="submit" class="btn btn-primary btn-block" data-loading-text="Adding...">Add to basket</button>
+    </form>
+            </div>
+    </article>
+</li>'''
+
+
+def render_books_page(page, total_pages, per_page=20):
+    """HTML de la página `page` del catálogo (1..total_pages)"""
+    first = (page - 1) * per_page
+    # La página 1 se sirve en "/" y las demás bajo /catalogue/: los enlaces son relativos
+    link_prefix = 'catalogue/' if page == 1 else ''
+    products = ''.join(render_product(first + i, link_prefix) for i in range(per_page))
+    categories = ''.join(
+        f'''
+                        <li>
+                            <a href="catalogue/category/books/{name.lower().replace(' ', '-')}_{i + 2}/index.html">
+                                {name}
+                            </a>
+                        </li>''' for i, name in enumerate(CATEGORIES))
+    previous = f'<li class="previous"><a href="page-{page - 1}.html">previous</a></li>' if page > 1 else ''
+    following = f'<li class="next"><a href="page-{page + 1}.html">next</a></li>' if page < total_pages else ''
+
+    return f'''<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+    <head>
+        <title>All products | Books to Scrape - Sandbox</title>
+        <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+        <meta name="created" content="24th Jun 2016 09:29" />
+        <meta name="description" content="" />
+        <meta name="viewport" content="width=device-width" />
+        <meta name="robots" content="NOARCHIVE,NOCACHE" />
+        <link rel="shortcut icon" href="static/oscar/favicon.ico" />
+        <link rel="stylesheet" type="text/css" href="static/oscar/css/styles.css" />
+        <link rel="stylesheet" href="static/oscar/js/bootstrap-datetimepicker/bootstrap-datetimepicker.css" />
+    </head>
+    <body id="default" class="default">
+        <header class="header container-fluid">
+            <div class="page_inner">
+                <div class="row">
+                    <div class="col-sm-8 h1"><a href="index.html">Books to Scrape</a><small> We love being scraped!</small></div>
+                </div>
+            </div>
+        </header>
+        <div class="container-fluid page">
+            <div class="page_inner">
+                <ul class="breadcrumb">
+                    <li><a href="index.html">Home</a></li>
+                    <li class="active">All products</li>
+                </ul>
+                <div class="row">
+                    <aside class="sidebar col-sm-4 col-md-3">
+                        <div id="promotions_left"></div>
+                        <div class="side_categories">
+                            <ul class="nav nav-list">
+                                <li>
+                                    <a href="catalogue/category/books_1/index.html">Books</a>
+                                    <ul>{categories}
+                                    </ul>
+                                </li>
+                            </ul>
+                        </div>
+                    </aside>
+                    <div class="col-sm-8 col-md-9">
+                        <div class="page-header action"><h1>All products</h1></div>
+                        <div id="messages"></div>
+                        <div id="promotions"></div>
+                        <form method="get" class="form-horizontal">
+                            <div style="display:none"></div>
+                            <strong>{total_pages * per_page}</strong> results - showing <strong>{first + 1}</strong> to <strong>{first + per_page}</strong>.
+                        </form>
+                        <section>
+                            <div class="alert alert-warning" role="alert"><strong>Warning!</strong> This is a demo website for web scraping purposes. Prices and ratings here were randomly assigned and have no real meaning.</div>
+                            <div>
+                                <ol class="row">{products}
+                                </ol>
+                                <div>
+                                    <ul class="pager">
+                                        {previous}
+                                        <li class="current">Page {page} of {total_pages}</li>
+                                        {following}
+                                    </ul>
+                                </div>
+                            </div>
+                        </section>
+                    </div>
+                </div>
+            </div>
+        </div>
+        <footer class="footer container-fluid"></footer>
+        <script src="static/oscar/js/jquery/jquery-1.9.1.min.js" type="text/javascript"></script>
+        <script src="static/oscar/js/oscar/ui.js" type="text/javascript" charset="utf-8"></script>
+        <script type="text/javascript">
+            $(function() {{ oscar.init(); oscar.search.init(); }});
+        </script>
+    </body>
+</html>
+'''
+
+
+def render_product_page(index):
+    """HTML de la página de detalle del producto número `index`"""
+    rng = random.Random(index)
+    title = book_title(index)
+    category = CATEGORIES[rng.randrange(len(CATEGORIES))]
+    price = f"£{rng.uniform(10, 60):.2f}"
+    description = ' '.join(rng.choice(WORDS) for _ in range(120)).capitalize() + '...more'
+
+    return f'''<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+    <head>
+        <title>{title} | Books to Scrape - Sandbox</title>
+        <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+    </head>
+    <body id="default" class="default">
+        <div class="container-fluid page">
+            <div class="page_inner">
+                <ul class="breadcrumb">
+                    <li><a href="../../index.html">Home</a></li>
+                    <li><a href="../category/books_1/index.html">Books</a></li>
+                    <li><a href="../category/books/{category.lower().replace(' ', '-')}_2/index.html">{category}</a></li>
+                    <li class="active">{title}</li>
+                </ul>
+                <div id="content_inner">
+                    <article class="product_page">
+                        <div class="row">
+                            <div class="col-sm-6 product_main">
+                                <h1>{title}</h1>
+                                <p class="price_color">{price}</p>
+                                <p class="instock availability"><i class="icon-ok"></i> In stock ({index % 23} available)</p>
+                            </div>
+                        </div>
+                        <div id="product_description" class="sub-header"><h2>Product Description</h2></div>
+                        <p>{description}</p>
+                        <div class="sub-header"><h2>Product Information</h2></div>
+                        <table class="table table-striped">
+                            <tr><th>UPC</th><td>{index:016x}</td></tr>
+                            <tr><th>Product Type</th><td>Books</td></tr>
+                            <tr><th>Price (excl. tax)</th><td>{price}</td></tr>
+                            <tr><th>Price (incl. tax)</th><td>{price}</td></tr>
+                            <tr><th>Tax</th><td>£0.00</td></tr>
+                            <tr><th>Availability</th><td>In stock ({index % 23} available)</td></tr>
+                            <tr><th>Number of reviews</th><td>0</td></tr>
+                        </table>
+                    </article>
+                </div>
+            </div>
+        </div>
+    </body>
+</html>
+'''
+
+
+HN_DOMAINS = ['github.com', 'arxiv.org', 'nytimes.com', 'blog.example.org', 'lwn.net', 'substack.com']
+
+
+def hn_story(item_id):
+    """Datos deterministas de la historia `item_id` (los comparten portada e hilo)"""
+    rng = random.Random(item_id)
+    title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).capitalize()
+    points = rng.randint(1, 900)
+    comments = rng.randint(0, 400)
+    age = rng.randint(1, 23)
+    # Algunas historias (Ask HN) enlazan al propio sitio en lugar de a un dominio externo
+    domain = None if rng.random() < 0.1 else rng.choice(HN_DOMAINS)
+    return title, points, comments, age, domain
+
+
+def render_hn_row(item_id, rank):
+    title, points, comments, age, domain = hn_story(item_id)
+
+    if domain is None:
+        link, sitebit = f"item?id={item_id}", ''
+    else:
+        link = f"https://{domain}/{title.lower().replace(' ', '-')}"
+        sitebit = f'<span class="sitebit comhead"> (<a href="from?site={domain}"><span class="sitestr">{domain}</span></a>)</span>'
+
+    return f'''
+            <tr class="athing submission" id="{item_id}">
+      <td align="right" valign="top" class="title"><span class="rank">{rank}.</span></td>      <td valign="top" class="votelinks"><center><a id='up_{item_id}' href='vote?id={item_id}&amp;how=up&amp;goto=news'><div class='votearrow' title='upvote'></div></a></center></td><td class="title"><span class="titleline"><a href="{link}">{title}</a>{sitebit}</span></td></tr><tr><td colspan="2"></td><td class="subtext"><span class="subline">
+          <span class="score" id="score_{item_id}">{points} points</span> by <a href="user?id=user{item_id % 97}" class="hnuser">user{item_id % 97}</a> <span class="age" title="2025-09-27T10:{age:02d}:00"><a href="item?id={item_id}">{age} hours ago</a></span> <span id="unv_{item_id}"></span> | <a href="hide?id={item_id}&amp;goto=news">hide</a> | <a href="item?id={item_id}">{comments}&nbsp;comments</a>        </span>
+              </td></tr>
+      <tr class="spacer" style="height:5px"></tr>'''
+
+
+def render_hn_page(page, total_pages, per_page=30):
+    """HTML de la portada de Hacker News `news?p=page`"""
+    first = (page - 1) * per_page
+    rows = ''.join(render_hn_row(45000000 - first - i, first + i + 1) for i in range(per_page))
+    more = (f'<tr class="morespace" style="height:10px"></tr><tr><td colspan="2"></td>'
+            f'<td class="title"><a href="?p={page + 1}" class="morelink" rel="next">More</a></td></tr>'
+            if page < total_pages else '')
+
+    return f'''<html lang="en" op="news"><head><meta name="referrer" content="origin"><meta name="viewport" content="width=device-width, initial-scale=1.0"><link rel="stylesheet" type="text/css" href="news.css">
+        <link rel="icon" href="y18.svg"><title>Hacker News</title></head><body><center><table id="hnmain" border="0" cellpadding="0" cellspacing="0" width="85%" bgcolor="#f6f6ef">
+        <tr><td bgcolor="#ff6600"><table border="0" cellpadding="0" cellspacing="0" width="100%" style="padding:2px"><tr><td style="width:18px;padding-right:4px"><a href="https://news.ycombinator.com"><img src="y18.svg" width="18" height="18" style="border:1px white solid; display:block"></a></td>
+                  <td style="line-height:12pt; height:10px;"><span class="pagetop"><b class="hnname"><a href="news">Hacker News</a></b>
+                            <a href="newest">new</a> | <a href="front">past</a> | <a href="newcomments">comments</a> | <a href="ask">ask</a> | <a href="show">show</a> | <a href="jobs">jobs</a> | <a href="submit" rel="nofollow">submit</a>            </span></td><td style="text-align:right;padding-right:4px;"><span class="pagetop">
+                              <a href="login?goto=news">login</a>
+                          </span></td>
+              </tr></table></td></tr>
+<tr id="bigbox"><td><table border="0" cellpadding="0" cellspacing="0" class="itemlist">{rows}
+      {more}
+  </table>
+</td></tr>
+<tr><td><img src="s.gif" height="10" width="0"><table width="100%" cellspacing="0" cellpadding="1"><tr><td bgcolor="#ff6600"></td></tr></table><br>
+<center><span class="yclinks"><a href="newsguidelines.html">Guidelines</a> | <a href="newsfaq.html">FAQ</a> | <a href="lists">Lists</a> | <a href="https://github.com/HackerNews/API">API</a> | <a href="security.html">Security</a> | <a href="https://www.ycombinator.com/legal/">Legal</a> | <a href="https://www.ycombinator.com/apply/">Apply to YC</a> | <a href="mailto:hn@ycombinator.com">Contact</a></span><br><br>
+<form method="get" action="//hn.algolia.com/">Search: <input type="text" name="q" size="17" autocorrect="off" spellcheck="false" autocapitalize="off" autocomplete="off"></form></center></td></tr>
+</table></center></body></html>
+'''
+
+
+def render_hn_comment(comment_id, indent):
+    rng = random.Random(comment_id)
+    text = '<p>'.join(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 25))).capitalize() + '.'
+        for _ in range(rng.randint(1, 3))
+    )
+    return f'''
+            <tr class="athing comtr" id="{comment_id}"><td><table border="0"><tr><td class="ind" indent="{indent}"><img src="s.gif" height="1" width="{indent * 40}"></td><td valign="top" class="votelinks"><center><a id="up_{comment_id}" href="vote?id={comment_id}&amp;how=up&amp;goto=item"><div class="votearrow" title="upvote"></div></a></center></td><td class="default"><div style="margin-top:2px; margin-bottom:-10px;"><span class="comhead"><a href="user?id=user{comment_id % 89}" class="hnuser">user{comment_id % 89}</a> <span class="age" title="2025-09-27T11:00:00"><a href="item?id={comment_id}">1 hour ago</a></span> <span id="unv_{comment_id}"></span><span class="navs"> | <a href="#" class="clicky">next</a></span></span></div><br><div class="comment"><div class="commtext c00">{text}</div><div class="reply"><p><font size="1"><u><a href="reply?id={comment_id}&amp;goto=item">reply</a></u></font></p></div></div></td></tr></table></td></tr>'''
+
+
+def render_hn_item(item_id):
+    """HTML del hilo `item?id=item_id`: tantos comentarios como indica la portada"""
+    title, points, comments, age, domain = hn_story(item_id)
+    rng = random.Random(-item_id)
+
+    # El primer comentario es siempre de primer nivel; el resto, respuestas o nuevos hilos
+    indents, indent = [], 0
+    for i in range(comments):
+        indent = 0 if i == 0 else max(0, min(indent + rng.choice((-1, 0, 1)), 5))
+        indents.append(indent)
+    tree = ''.join(render_hn_comment(item_id * 1000 + i, ind) for i, ind in enumerate(indents))
+
+    return f'''<html lang="en" op="item"><head><title>{title} | Hacker News</title></head><body><center><table id="hnmain" border="0" cellpadding="0" cellspacing="0" width="85%" bgcolor="#f6f6ef">
+<tr id="bigbox"><td><table class="fatitem" border="0">
+        <tr class="athing submission" id="{item_id}"><td class="title"><span class="titleline"><a href="item?id={item_id}">{title}</a></span></td></tr>
+        <tr><td class="subtext"><span class="subline"><span class="score" id="score_{item_id}">{points} points</span> | <a href="item?id={item_id}">{comments}&nbsp;comments</a></span></td></tr>
+</table><br><table border="0" class="comment-tree">{tree}
+</table></td></tr></table></center></body></html>
+'''
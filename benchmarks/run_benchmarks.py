@@ -0,0 +1,218 @@
+# Suite de benchmarks de throughput para los dos scrapers (codelab4 y codelab5)
+#
+# Arranca el sitio sintético (fixture_server.py) y ejecuta cada escenario en un
+# subproceso limpio, para que el pico de RSS sea el del escenario y no el acumulado.
+# El resultado es JSON: páginas/s, ms de parseo por página, pico de RSS y tiempo total.
+#
+# Uso:
+#   python benchmarks/run_benchmarks.py --book-pages 1000 --books-per-page 50 \
+#       --hn-pages 100 --output resultados.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from fixture_server import FixtureSite, start_fixture_server
+from fixtures import render_books_page, render_hn_item
+
+SCENARIOS = {
+    'books-sync-html.parser': {'scraper': 'books', 'mode': 'sync', 'parser': 'html.parser'},
+    'books-async-html.parser': {'scraper': 'books', 'mode': 'async', 'parser': 'html.parser'},
+    'books-async-lxml': {'scraper': 'books', 'mode': 'async', 'parser': 'lxml'},
+    # Listado + página de detalle de cada libro, en streaming hacia el BookSink
+    'books-async-details': {'scraper': 'books', 'mode': 'async', 'parser': 'lxml', 'details': True},
+    'hn-sync': {'scraper': 'hn'},
+    'hn-crawl-threads': {'scraper': 'hn-crawl'},
+}
+
+PARSE_SAMPLE_PAGES = 20
+
+
+def peak_rss_mb():
+    # En Linux ru_maxrss viene en KB
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run_books(scenario, args, cache_dir):
+    from scrapers import load_books_scraper
+
+    scraper = load_books_scraper()
+    scraper.base_url = args.base_url
+    scraper.http_cache = scraper.HTTPCache(cache_dir)
+    scraper.session = scraper.create_session(scraper.headers, cache=scraper.http_cache)
+    # Sin tope práctico de ritmo: se mide el scraper, no la cortesía con el servidor
+    scraper.pacer = scraper.AdaptivePacer(initial_rate=10000, max_rate=10000)
+
+    details = scenario.get('details', False)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if details:
+            # Los libros van al sink página a página (keep_books=False): cuenta el sink
+            sink_base = os.path.join(cache_dir, 'books_details')
+            with scraper.BookSink(sink_base, details=True) as sink:
+                scraper.scrape_all_books(
+                    max_pages=args.book_pages, mode=scenario['mode'], parser=scenario['parser'],
+                    concurrency=args.concurrency, requests_per_second=None, sink=sink, keep_books=False,
+                    details=True,
+                )
+            records = sink.summary.count
+            pages = args.book_pages + records  # páginas de listado + una de detalle por libro
+        else:
+            books = scraper.scrape_all_books(
+                max_pages=args.book_pages, mode=scenario['mode'], parser=scenario['parser'],
+                concurrency=args.concurrency, requests_per_second=None,
+            )
+            records = len(books)
+            pages = len({book['page'] for book in books})
+    elapsed = time.perf_counter() - start
+
+    # Parseo aislado (sin red) sobre una muestra de páginas
+    sample = [render_books_page(n, args.book_pages, args.books_per_page)
+              for n in range(1, min(PARSE_SAMPLE_PAGES, args.book_pages) + 1)]
+    parse_start = time.perf_counter()
+    for n, html in enumerate(sample, start=1):
+        scraper.parse_page_books(html, n, scenario['parser'])
+    parse_ms = (time.perf_counter() - parse_start) / len(sample) * 1000
+
+    return pages, records, elapsed, parse_ms
+
+
+class _ReplaySession:
+    """Sesión que devuelve respuestas ya descargadas (para medir solo el parseo)"""
+
+    def __init__(self, responses):
+        self._responses = responses
+
+    def get(self, url, **kwargs):
+        return self._responses[url]
+
+
+def run_hn(scenario, args, cache_dir):
+    from scrapers import load_hn_scraper
+
+    scraper = load_hn_scraper()
+    scraper.http_cache = scraper.HTTPCache(cache_dir)
+    scraper.session = scraper.CachedSession(scraper.http_cache)
+    urls = [f"{args.base_url}/hn/news?p={page}" for page in range(1, args.hn_pages + 1)]
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        items = [item for url in urls for item in scraper.scrape_hn_news(url)]
+    elapsed = time.perf_counter() - start
+
+    # Parseo aislado: mismas páginas servidas desde memoria
+    sample = urls[:PARSE_SAMPLE_PAGES]
+    network_session = scraper.session
+    scraper.session = _ReplaySession({url: network_session.get(url) for url in sample})
+    parse_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for url in sample:
+            scraper.scrape_hn_news(url)
+    parse_ms = (time.perf_counter() - parse_start) / len(sample) * 1000
+
+    return len(urls), len(items), elapsed, parse_ms
+
+
+def run_hn_crawl(scenario, args, cache_dir):
+    from scrapers import load_hn_scraper
+
+    scraper = load_hn_scraper()
+    scraper.http_cache = scraper.HTTPCache(cache_dir)
+    scraper.pacer = scraper.AdaptivePacer(initial_rate=10000, max_rate=10000)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        items = scraper.crawl_hn_news(pages=args.hn_pages, fetch_threads=True, base_url=f"{args.base_url}/hn/",
+                                      concurrency=args.concurrency)
+    elapsed = time.perf_counter() - start
+
+    # Parseo aislado de los hilos (la parte pesada del recorrido)
+    sample = [render_hn_item(int(item['item_id'])) for item in items[:PARSE_SAMPLE_PAGES]]
+    parse_start = time.perf_counter()
+    for html in sample:
+        scraper.parse_item_thread(html)
+    parse_ms = (time.perf_counter() - parse_start) / len(sample) * 1000
+
+    # Portadas + un hilo por noticia
+    return args.hn_pages + len(items), len(items), elapsed, parse_ms
+
+
+RUNNERS = {'books': run_books, 'hn': run_hn, 'hn-crawl': run_hn_crawl}
+
+
+def run_worker(name, args):
+    """Ejecuta un escenario en este proceso e imprime su resultado como JSON"""
+    scenario = SCENARIOS[name]
+    runner = RUNNERS[scenario['scraper']]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pages, records, elapsed, parse_ms = runner(scenario, args, cache_dir)
+
+    print(json.dumps({
+        'pages': pages,
+        'records': records,
+        'elapsed_s': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 1) if elapsed else None,
+        'parse_ms_per_page': round(parse_ms, 3),
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks de throughput de los scrapers')
+    parser.add_argument('--book-pages', type=int, default=100)
+    parser.add_argument('--books-per-page', type=int, default=20)
+    parser.add_argument('--hn-pages', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--output', help='Fichero JSON de salida (por defecto, stdout)')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args)
+        return
+
+    site = FixtureSite(args.book_pages, args.books_per_page, args.hn_pages)
+    server, base_url = start_fixture_server(site)
+
+    results = {}
+    try:
+        for name in args.scenarios:
+            print(f"⏱️ {name}...", file=sys.stderr)
+            command = [
+                sys.executable, os.path.abspath(__file__), '--worker', name, '--base-url', base_url,
+                '--book-pages', str(args.book_pages), '--books-per-page', str(args.books_per_page),
+                '--hn-pages', str(args.hn_pages), '--concurrency', str(args.concurrency),
+            ]
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+    finally:
+        server.shutdown()
+
+    report = json.dumps({
+        'config': {
+            'book_pages': args.book_pages,
+            'books_per_page': args.books_per_page,
+            'hn_pages': args.hn_pages,
+            'concurrency': args.concurrency,
+        },
+        'results': results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+# Carga los main.py de los codelabs como módulos con nombre propio
+# (todos se llaman main.py, así que no se pueden importar a la vez por nombre)
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BOOKS_DIR = REPO_ROOT / 'codelab5' / 'WEB SCRAPPING DE UN SITIO DE ECOMMERCE'
+HN_DIR = REPO_ROOT / 'codelab4' / 'WEB SCRAPPING BASICO'
+
+
+def _load(name, directory):
+    # El directorio del script va en sys.path para sus imports hermanos (fast_parse, ...)
+    sys.path.insert(0, str(directory))
+    spec = importlib.util.spec_from_file_location(name, directory / 'main.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_books_scraper():
+    """Importa el scraper de libros (codelab5) sin ejecutar su demo"""
+    return _load('books_scraper', BOOKS_DIR)
+
+
+def load_hn_scraper():
+    """Importa el scraper de Hacker News (codelab4) sin ejecutar su demo"""
+    return _load('hn_scraper', HN_DIR)
@@ -0,0 +1,12 @@
+# Enrutamiento de mensajes, compartido por el entrenamiento (main.py) y el servidor
+# de inferencia (servidor_triage.py). La limpieza del texto va dentro del pipeline
+# (comun.normalizacion.NormalizadorTexto), así que aquí se pasan los textos tal cual.
+
+# mapa de clase a área/equipo real (puedes cambiar nombres)
+AREAS = {"ventas": "Equipo Ventas", "soporte": "Mesa Soporte", "queja": "Atención al Cliente"}
+
+def enrutar(pipe, textos):
+    # Predice la clase de todos los textos en una sola llamada al pipeline
+    # y devuelve tuplas (texto_original, etiqueta_predicha, area_destino)
+    etiquetas = pipe.predict(textos)
+    return [(t, e, AREAS[e]) for t, e in zip(textos, etiquetas)]
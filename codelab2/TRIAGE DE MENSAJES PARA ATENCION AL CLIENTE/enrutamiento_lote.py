@@ -0,0 +1,102 @@
+# Enrutamiento en lote de un CSV de mensajes (re-enrutar el histórico de noche)
+# - Lee el CSV de entrada por bloques (pandas chunksize): la memoria no crece con el archivo
+# - Reparte los bloques entre un pool de procesos que comparten el pipeline ya cargado
+#   (con fork lo heredan del proceso principal; con spawn cada proceso lo carga una vez;
+#   con el artefacto plano los arrays del modelo son memoria mapeada compartida)
+# - Cada proceso llama a predict una vez por bloque (el pipeline limpia el texto)
+# - Los bloques se escriben en orden a medida que terminan, añadiendo etiqueta y ruta;
+#   como mucho hay 2 bloques por proceso en vuelo, así la memoria queda acotada
+#
+# Uso: python enrutamiento_lote.py mensajes.csv [--salida mensajes_enrutados.csv]
+#          [--modelo pipeline_triage.plano] [--bloque 20000] [--procesos N]
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+# El pipeline guardado incluye comun.normalizacion (raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from comun.artefactos import cargar_modelo
+from enrutamiento import AREAS
+
+MODELO = Path(__file__).resolve().parent / "pipeline_triage.plano"
+
+# Pipeline del proceso actual (se hereda con fork o se carga en _iniciar_proceso)
+_PIPE = None
+
+
+def _iniciar_proceso(ruta_modelo):
+    global _PIPE
+    if _PIPE is None:
+        _PIPE = cargar_modelo(ruta_modelo)
+
+
+def _predecir(textos):
+    return _PIPE.predict(textos)
+
+
+def enrutar_csv(entrada, salida, ruta_modelo=MODELO, bloque=20_000, procesos=None, columna="texto"):
+    """Añade etiqueta y ruta a cada fila de `entrada` y las escribe en `salida` (mismo orden)"""
+    global _PIPE
+    procesos = procesos or os.cpu_count() or 1
+    _PIPE = cargar_modelo(ruta_modelo)
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context("fork" if "fork" in metodos else None)
+
+    pendientes = deque()  # (bloque DataFrame, futuro con sus etiquetas), en orden de lectura
+    filas = 0
+    primero = True
+    inicio = time.perf_counter()
+
+    def escribir_siguiente():
+        nonlocal filas, primero
+        df, futuro = pendientes.popleft()
+        df["etiqueta"] = futuro.result()
+        df["ruta"] = df["etiqueta"].map(AREAS)
+        df.to_csv(salida, mode="w" if primero else "a", header=primero, index=False)
+        primero = False
+        filas += len(df)
+        print(f"📦 {filas} mensajes enrutados · {filas / (time.perf_counter() - inicio):,.0f} mensajes/s")
+
+    with ProcessPoolExecutor(procesos, mp_context=contexto, initializer=_iniciar_proceso,
+                             initargs=(str(ruta_modelo),)) as pool:
+        # Todo como texto y sin NaN: las columnas de entrada se copian tal cual a la salida
+        for df in pd.read_csv(entrada, chunksize=bloque, dtype=str, keep_default_na=False):
+            if df.empty:
+                continue
+            textos = df[columna].tolist()
+            pendientes.append((df, pool.submit(_predecir, textos)))
+            if len(pendientes) >= 2 * procesos:
+                escribir_siguiente()
+        while pendientes:
+            escribir_siguiente()
+
+    if primero:  # entrada sin filas: solo la cabecera
+        pd.read_csv(entrada, nrows=0).assign(etiqueta=None, ruta=None).to_csv(salida, index=False)
+    return filas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enrutamiento en lote de un CSV de mensajes")
+    parser.add_argument("entrada", help="CSV con una columna de texto (p. ej. id, texto)")
+    parser.add_argument("--salida", default="mensajes_enrutados.csv")
+    parser.add_argument("--modelo", default=str(MODELO), help="artefacto plano o .joblib a usar")
+    parser.add_argument("--bloque", type=int, default=20_000, help="filas por bloque")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--columna", default="texto", help="columna con el texto del mensaje")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    filas = enrutar_csv(args.entrada, args.salida, args.modelo, args.bloque, args.procesos, args.columna)
+    print(f"✅ Archivo '{args.salida}' generado: {filas} mensajes en {time.perf_counter() - inicio:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Entrenamiento del triage por bloques, para historiales que no caben en memoria
+# - Lee un CSV tipo mensajes.csv (columnas texto, etiqueta) en bloques con pandas (chunksize)
+# - NormalizadorTexto + HashingVectorizer: no hay vocabulario que aprender, cada bloque
+#   se vectoriza por separado y el tamaño del modelo no depende del corpus
+# - SGDClassifier con pérdida hinge (SVM lineal, como LinearSVC) entrenado con
+#   partial_fit bloque a bloque; los pesos por clase equilibran las clases vistas hasta
+#   el momento (comun/incremental.py)
+# - Una fracción fija de filas (elegida por hash del texto) nunca se usa para entrenar:
+#   una pasada final acumula su matriz de confusión, y de ella sale el mismo reporte
+#   por clase y la misma matriz que imprime main.py
+# La memoria máxima depende del tamaño de bloque, no del número de filas.
+#
+# Uso: python entrenamiento_streaming.py mensajes.csv [--bloque 100000] [--pasadas 1]
+#          [--salida pipeline_triage_streaming.joblib]
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import classification_report
+from sklearn.pipeline import make_pipeline
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from comun.incremental import pesos_balanceados, vectorizador_hashing
+from comun.normalizacion import NormalizadorTexto
+
+CLASES = ["ventas", "soporte", "queja"]
+
+
+def leer_bloques(ruta, bloque=100_000, columna_texto="texto", columna_etiqueta="etiqueta"):
+    """Recorre el CSV en DataFrames de `bloque` filas (sin filas vacías)"""
+    for df in pd.read_csv(ruta, chunksize=bloque, usecols=[columna_texto, columna_etiqueta], dtype=str):
+        df = df.dropna()
+        yield df[columna_texto], df[columna_etiqueta]
+
+
+def es_prueba(textos, fraccion):
+    """Máscara de las filas reservadas para evaluar (estable: depende solo del texto)"""
+    hashes = pd.util.hash_pandas_object(textos, index=False).to_numpy()
+    return hashes % 1000 < int(fraccion * 1000)
+
+
+def entrenar_streaming(ruta, clases=CLASES, bloque=100_000, pasadas=1, fraccion_prueba=0.2, n_features=2**20):
+    """Entrena el pipeline (limpieza + hashing + SGD) leyendo el CSV por bloques"""
+    normalizador = NormalizadorTexto()
+    vectorizador = vectorizador_hashing(n_features)
+    modelo = SGDClassifier(loss="hinge", alpha=1e-5, random_state=42)
+    conteos = np.zeros(len(clases), dtype=np.int64)
+
+    inicio = time.perf_counter()
+    filas = 0
+    for pasada in range(1, pasadas + 1):
+        for numero, (textos, etiquetas) in enumerate(leer_bloques(ruta, bloque), 1):
+            prueba = es_prueba(textos, fraccion_prueba)
+            conocidas = etiquetas.isin(clases).to_numpy()
+            entrenar = ~prueba & conocidas
+            X = vectorizador.transform(normalizador.transform(textos))
+
+            # Progreso: accuracy del modelo actual sobre las filas reservadas del bloque
+            # (solo desde el primer partial_fit: un bloque inicial puede no tener filas de entrenamiento)
+            reservadas = prueba & conocidas
+            progreso = ""
+            if hasattr(modelo, "coef_") and reservadas.any():
+                acierto = np.mean(modelo.predict(X[reservadas]) == etiquetas.to_numpy()[reservadas])
+                progreso = f" · accuracy reservadas {acierto:.3f}"
+
+            if entrenar.any():
+                y = etiquetas.to_numpy()[entrenar]
+                # Los conteos solo crecen en la primera pasada (después ya son los del corpus)
+                pesos = pesos_balanceados(y, conteos, clases, actualizar=pasada == 1)
+                modelo.partial_fit(X[entrenar], y, classes=clases, sample_weight=pesos)
+            filas += len(textos)
+            transcurrido = time.perf_counter() - inicio
+            print(f"Pasada {pasada} · bloque {numero}: {filas} filas · {filas / transcurrido:,.0f} filas/s{progreso}")
+
+    if not hasattr(modelo, "coef_"):
+        raise ValueError(f"{ruta} no tiene filas para entrenar (etiquetas {clases} fuera de la fracción de prueba)")
+    return make_pipeline(normalizador, vectorizador, modelo)
+
+
+def reporte_clasificacion(matriz, clases, digits=3):
+    """classification_report a partir de una matriz de confusión acumulada (filas=real, cols=pred)
+
+    Cada celda entra una vez con su conteo como peso: el reporte es el mismo que con
+    todas las predicciones, sin tener que guardarlas.
+    """
+    etiquetas = np.asarray(clases)
+    reales, predichas = np.indices(matriz.shape).reshape(2, -1)
+    reporte = classification_report(etiquetas[reales], etiquetas[predichas], labels=sorted(clases),
+                                    sample_weight=matriz[reales, predichas], digits=digits, zero_division=0)
+    # Con pesos el soporte sale como decimal (315.0): se muestra entero, como en main.py
+    return re.sub(r"(\d+)\.0$", lambda m: m.group(1).rjust(len(m.group(0))), reporte, flags=re.M)
+
+
+def evaluar_streaming(pipe, ruta, clases=CLASES, bloque=100_000, fraccion_prueba=0.2):
+    """Evalúa las filas reservadas bloque a bloque; devuelve la matriz de confusión"""
+    matriz = np.zeros((len(clases), len(clases)), dtype=np.int64)
+    for textos, etiquetas in leer_bloques(ruta, bloque):
+        reservadas = es_prueba(textos, fraccion_prueba) & etiquetas.isin(clases).to_numpy()
+        if not reservadas.any():
+            continue
+        reales = pd.Categorical(etiquetas[reservadas], categories=clases).codes
+        predichas = pd.Categorical(pipe.predict(textos[reservadas]), categories=clases).codes
+        np.add.at(matriz, (reales, predichas), 1)
+
+    total = matriz.sum()
+    print(f"\nFilas reservadas evaluadas: {total}")
+    if total:
+        print(f"\nAccuracy test: {np.trace(matriz) / total:.3f}\n")
+        print("Reporte por clase:\n", reporte_clasificacion(matriz, clases))
+        print("\nMatriz de confusión (filas=real, cols=pred):\n", pd.DataFrame(matriz,
+              index=[f"real_{c}" for c in clases], columns=[f"pred_{c}" for c in clases]))
+    return matriz
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Entrenamiento del triage por bloques (corpus fuera de memoria)")
+    parser.add_argument("csv", help="CSV con columnas texto y etiqueta")
+    parser.add_argument("--bloque", type=int, default=100_000, help="filas por bloque")
+    parser.add_argument("--pasadas", type=int, default=1, help="pasadas sobre el corpus")
+    parser.add_argument("--prueba", type=float, default=0.2, help="fracción de filas reservada para evaluar")
+    parser.add_argument("--n-features", type=int, default=2**20, help="dimensión del hashing")
+    parser.add_argument("--salida", default="pipeline_triage_streaming.joblib")
+    args = parser.parse_args(argv)
+
+    pipe = entrenar_streaming(args.csv, bloque=args.bloque, pasadas=args.pasadas,
+                              fraccion_prueba=args.prueba, n_features=args.n_features)
+    evaluar_streaming(pipe, args.csv, bloque=args.bloque, fraccion_prueba=args.prueba)
+
+    # Mismo uso que pipeline_triage.joblib (enrutar, servidor_triage.py --modelo ...)
+    joblib.dump(pipe, args.salida)
+    print(f"\nPipeline guardado en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,24 @@
-import re, random, numpy as np, pandas as pd  # re=expresiones regulares, random=aleatoriedad, numpy/pandas=manipulación de datos
+import random, numpy as np, pandas as pd  # random=aleatoriedad, numpy/pandas=manipulación de datos
 from sklearn.model_selection import train_test_split, cross_val_score  # utilidades para dividir datos y validar
 from sklearn.pipeline import make_pipeline  # encadena pasos de preprocesamiento + modelo en un solo objeto
 from sklearn.feature_extraction.text import TfidfVectorizer  # convierte texto en vectores numéricos (TF-IDF)
 from sklearn.svm import LinearSVC  # clasificador SVM lineal (rápido y efectivo para texto)
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score  # métricas para evaluar el modelo
 import joblib  # guardar y cargar modelos entrenados (a disco)
+import sys; from pathlib import Path  # para importar los módulos compartidos de comun/ (raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from comun.normalizacion import NormalizadorTexto  # limpieza de texto como paso del pipeline
+from comun.artefactos import exportar_puntuador  # artefacto plano (carga rápida con memoria mapeada)
+from comun.seleccion import REJILLA_TFIDF, reportar_seleccion, seleccionar_modelo  # búsqueda de hiperparámetros
+from enrutamiento import enrutar  # enrutamiento compartido con servidor_triage.py
 
 random.seed(42); np.random.seed(42)  # fijamos semillas para que los resultados sean reproducibles
 
 # 1) Dataset sintético realista (puedes reemplazar por tu CSV real)
 #    Objetivo: tener ejemplos de 3 categorías típicas de atención: ventas, soporte, queja.
 #    En un proyecto real, leerías un CSV/BD con columnas como id, texto, etiqueta.
+#    Si el historial no cabe en memoria: python entrenamiento_streaming.py historial.csv
+#    (lee el CSV por bloques y entrena hashing + SGD con partial_fit; mismo tipo de .joblib).
 ventas = [
     "Quiero saber el precio del plan premium",
     "¿Tienen descuentos por volumen para empresas?",
@@ -53,31 +61,38 @@ print("Muestras:", len(df), df["etiqueta"].value_counts().to_dict())
 # 2) Limpieza simple
 #    Normalizamos el texto: minúsculas, quitamos signos raros, compactamos espacios.
 #    Nota: mantener tildes y "ñ" puede ser útil para español.
-
-def limpiar(s: str) -> str:
-    s = s.lower()
-    s = re.sub(r"[^a-záéíóúñü0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-df["texto_clean"] = df["texto"].apply(limpiar)
+#    La limpieza es el primer paso del pipeline (NormalizadorTexto, en comun/normalizacion.py):
+#    se aplica igual al entrenar, al predecir y al cargar el .joblib, sin limpiar a mano.
 
 # 3) Split estratificado
 #    Separamos datos en entrenamiento (80%) y prueba (20%).
 #    stratify mantiene la proporción de clases en ambos conjuntos.
 X_train, X_test, y_train, y_test = train_test_split(
-    df["texto_clean"], df["etiqueta"], test_size=0.2, random_state=42, stratify=df["etiqueta"]
+    df["texto"], df["etiqueta"], test_size=0.2, random_state=42, stratify=df["etiqueta"]
 )
 
 # 4) Pipeline TF-IDF + SVM (class_weight='balanced' por si hay leves desbalances)
-#    El Pipeline encadena: TfidfVectorizer (convierte texto a números) -> LinearSVC (clasificador).
+#    El Pipeline encadena: NormalizadorTexto (limpieza) -> TfidfVectorizer (convierte texto a números)
+#    -> LinearSVC (clasificador).
 #    ngram_range=(1,2) usa palabras sueltas y pares de palabras; min_df=2 ignora términos rarísimos.
 #    class_weight="balanced" ayuda si una clase aparece menos que otras.
 pipe = make_pipeline(
+    NormalizadorTexto(),
     TfidfVectorizer(max_features=30000, ngram_range=(1,2), min_df=2),
     LinearSVC(class_weight="balanced", random_state=42)
 )
 
+# 4b) (Opcional) Selección de hiperparámetros: python main.py --seleccion
+#    Prueba max_features, ngram_range, min_df y C (regularización de la SVM) sobre el conjunto
+#    de entrenamiento con successive halving (las peores configuraciones se descartan con pocos
+#    datos), en paralelo y reutilizando el TF-IDF ya ajustado entre candidatos (comun/seleccion.py).
+#    A partir de aquí el script usa la mejor configuración encontrada.
+if "--seleccion" in sys.argv[1:]:
+    busqueda = seleccionar_modelo(pipe, {**REJILLA_TFIDF, "linearsvc__C": [0.1, 1, 10]},
+                                  X_train, y_train, scoring="f1_macro")
+    reportar_seleccion(busqueda)
+    pipe = busqueda.best_estimator_
+
 # 5) Entrenamiento y evaluación
 #    fit entrena el pipeline; predict obtiene la clase para cada texto de prueba.
 pipe.fit(X_train, y_train)
@@ -94,19 +109,18 @@ print("\nMatriz de confusión (filas=real, cols=pred):\n", pd.DataFrame(cm,
 # 6) Validación cruzada (usa SU PROPIO vectorizador dentro del pipeline)
 #    cross_val_score rehace el pipeline varias veces (k=5) con particiones distintas.
 #    f1_macro promedia el F1 de cada clase, útil si las clases no están perfectamente balanceadas.
-scores = cross_val_score(pipe, df["texto_clean"], df["etiqueta"], cv=5, scoring="f1_macro")
+#    n_jobs=-1 evalúa los pliegues en paralelo (uno por núcleo).
+scores = cross_val_score(pipe, df["texto"], df["etiqueta"], cv=5, scoring="f1_macro", n_jobs=-1)
 print(f"\nCV 5-fold F1_macro: media={scores.mean():.3f} ±{scores.std():.3f}")
 
 # 7) Enrutador de mensajes (utilidad directa)
-#    Recibe una lista de textos, limpia cada uno, predice su clase
+#    Recibe una lista de textos y predice su clase en una sola llamada al pipeline
+#    (la limpieza la hace su paso NormalizadorTexto: no hay que limpiar antes)
 #    y devuelve tuplas (texto_original, etiqueta_predicha, area_destino)
+#    Para servir mensajes sin reentrenar: python servidor_triage.py (micro-lotes por HTTP)
 def enrutar_mensajes(textos):
-    tx = [limpiar(t) for t in textos]
-    etiquetas = pipe.predict(tx)
-    # mapa a área/equipo real (puedes cambiar nombres)
-    area = {"ventas":"Equipo Ventas", "soporte":"Mesa Soporte", "queja":"Atención al Cliente"}
-    rutas = [area[e] for e in etiquetas]
-    return list(zip(textos, etiquetas, rutas))
+    # mapa a área/equipo real en enrutamiento.AREAS (puedes cambiar nombres)
+    return enrutar(pipe, textos)
 
 nuevos = [
     "Se dañó el botón de encendido, necesito ayuda urgentemente",
@@ -122,6 +136,13 @@ for texto, etiqueta, ruta in enrutar_mensajes(nuevos):
 #    Así, al cargarlo luego, podemos predecir directamente sin reentrenar ni reconfigurar.
 joblib.dump(pipe, "pipeline_triage.joblib")
 print("\nPipeline guardado en pipeline_triage.joblib")
+#    También como artefacto plano: vocabulario y pesos en arrays que se cargan con memoria
+#    mapeada (casi instantáneo y compartido entre procesos). Es el que usan por defecto
+#    servidor_triage.py y enrutamiento_lote.py; se carga con comun.artefactos.cargar_artefacto.
+#    Al exportarlo se comprueba que el puntuador solo-NumPy (comun/puntuador.py, para
+#    procesos que no quieren importar sklearn) da exactamente las mismas etiquetas en X_test.
+exportar_puntuador(pipe, "pipeline_triage.plano", X_test)
+print(f"Artefacto plano guardado en pipeline_triage.plano (puntuador NumPy validado en {len(X_test)} mensajes)")
 
 # Uso posterior:
 #    Ejemplo de cómo cargar el pipeline guardado y usarlo para predecir un mensaje nuevo.
@@ -129,10 +150,11 @@ loaded = joblib.load("pipeline_triage.joblib")
 print("Test carga:", loaded.predict(["No puedo entrar a mi cuenta, sale error 500"])[0])
 
 # 9) (Opcional) Clasificación en lote desde CSV real
-#    Si tienes un archivo real con mensajes, puedes clasificar en lote y exportar resultados.
+#    Si tienes un archivo real con mensajes, puedes clasificar en lote y exportar resultados:
+#    python enrutamiento_lote.py mensajes.csv --salida mensajes_enrutados.csv
+#    (lee el CSV por bloques, reparte predict entre todos los núcleos y añade etiqueta y ruta
+#    a cada fila, en el mismo orden). Para archivos pequeños basta con:
 # df_real = pd.read_csv("mensajes.csv")  # columnas: id, texto
-# df_real["texto_clean"] = df_real["texto"].apply(limpiar)
-# df_real["etiqueta"] = loaded.predict(df_real["texto_clean"])
-# df_real["ruta"] = df_real["etiqueta"].map({"ventas":"Equipo Ventas","soporte":"Mesa Soporte","queja":"Atención al Cliente"})
-# df_real.to_csv("mensajes_enrutados.csv", index=False)
-# print("Archivo 'mensajes_enrutados.csv' generado con la ruta de cada mensaje.")
\ No newline at end of file
+# df_real["etiqueta"] = loaded.predict(df_real["texto"])  # el pipeline ya limpia el texto
+# df_real["ruta"] = df_real["etiqueta"].map(AREAS)
+# df_real.to_csv("mensajes_enrutados.csv", index=False)
\ No newline at end of file
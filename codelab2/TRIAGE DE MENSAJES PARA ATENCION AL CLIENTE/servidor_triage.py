@@ -0,0 +1,254 @@
+# Servidor de inferencia para el triage de mensajes
+# - Carga pipeline_triage.plano (o un .joblib) una sola vez (no hay que reentrenar ni recargar por mensaje)
+# - Recibe mensajes por HTTP local o por un socket Unix: POST /enrutar
+#     {"mensaje": "..."} o {"mensajes": ["...", ...]}
+# - Agrupa las peticiones concurrentes en micro-lotes (tamaño máximo / espera máxima)
+#   y llama a predict una vez por lote: el coste fijo de cada llamada al pipeline
+#   (limpieza + vectorizador + modelo) se reparte entre todos los mensajes del lote
+# - GET /estadisticas: latencias p50/p99, throughput y tamaño medio de lote
+#
+# Uso: python servidor_triage.py [--port 8000 | --socket /tmp/triage.sock] [--max-lote 64] [--espera-ms 5]
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+# El pipeline guardado incluye comun.normalizacion (raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from comun.artefactos import cargar_modelo
+from enrutamiento import AREAS
+
+MODELO = Path(__file__).resolve().parent / "pipeline_triage.plano"
+
+
+class MicroLotes:
+    """Cola de mensajes que un único hilo agrupa en lotes y pasa a pipe.predict"""
+
+    def __init__(self, pipe, max_lote=64, espera_max=0.005, ventana=10000):
+        self.pipe = pipe
+        self.max_lote = max_lote
+        self.espera_max = espera_max
+        self._cola = queue.SimpleQueue()
+        # Latencias (segundos) de los últimos `ventana` mensajes, para p50/p99
+        self._latencias = deque(maxlen=ventana)
+        self._lock = threading.Lock()
+        self.mensajes = 0
+        self.lotes = 0
+        self.inicio = time.perf_counter()
+        self._hilo = threading.Thread(target=self._bucle, name="micro-lotes", daemon=True)
+        self._hilo.start()
+
+    def enviar(self, textos):
+        """Encola una petición y devuelve un Future con sus (texto, etiqueta, ruta)"""
+        futuro = Future()
+        self._cola.put((textos, futuro, time.perf_counter()))
+        return futuro
+
+    def enrutar(self, textos, timeout=None):
+        return self.enviar(textos).result(timeout)
+
+    def cerrar(self):
+        self._cola.put(None)
+        self._hilo.join()
+
+    def _bucle(self):
+        while True:
+            primera = self._cola.get()
+            if primera is None:
+                return
+            pendientes = [primera]
+            total = len(primera[0])
+            # La espera cuenta desde la llegada de la primera petición del lote
+            limite = primera[2] + self.espera_max
+            parar = False
+            while total < self.max_lote:
+                restante = limite - time.perf_counter()
+                try:
+                    siguiente = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is None:
+                    parar = True
+                    break
+                pendientes.append(siguiente)
+                total += len(siguiente[0])
+            self._procesar(pendientes)
+            if parar:
+                return
+
+    def _procesar(self, pendientes):
+        try:
+            textos = [texto for lote, _, _ in pendientes for texto in lote]
+            etiquetas = self.pipe.predict(textos) if textos else []
+            fin = time.perf_counter()
+            # Primero se arman todas las respuestas: un fallo (p. ej. una etiqueta sin
+            # área) no deja a medias las del lote
+            posicion, respuestas = 0, []
+            for lote, _, _ in pendientes:
+                propias = etiquetas[posicion:posicion + len(lote)]
+                posicion += len(lote)
+                respuestas.append([(t, str(e), AREAS[e]) for t, e in zip(lote, propias)])
+        except Exception as error:  # el error llega a cada petición del lote en lugar de matar el hilo
+            for _, futuro, _ in pendientes:
+                futuro.set_exception(error)
+            return
+
+        with self._lock:
+            for (lote, futuro, llegada), respuesta in zip(pendientes, respuestas):
+                futuro.set_result(respuesta)
+                self._latencias.extend([fin - llegada] * len(lote))
+            self.mensajes += len(textos)
+            self.lotes += 1
+
+    def estadisticas(self):
+        """Latencia p50/p99 (ms) de los últimos mensajes, throughput y tamaño medio de lote"""
+        with self._lock:
+            latencias = np.array(self._latencias)
+            mensajes, lotes = self.mensajes, self.lotes
+        transcurrido = time.perf_counter() - self.inicio
+        p50, p99 = np.percentile(latencias, [50, 99]) * 1000 if len(latencias) else (0.0, 0.0)
+        return {
+            "mensajes": mensajes,
+            "lotes": lotes,
+            "lote_medio": round(mensajes / lotes, 1) if lotes else 0.0,
+            "p50_ms": round(float(p50), 2),
+            "p99_ms": round(float(p99), 2),
+            "mensajes_por_segundo": round(mensajes / transcurrido, 1) if transcurrido else 0.0,
+        }
+
+
+class ManejadorTriage(BaseHTTPRequestHandler):
+    # HTTP/1.1: los clientes reutilizan la conexión entre peticiones (keep-alive)
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo salen en dos escrituras: sin TCP_NODELAY, Nagle y el ACK
+    # retardado del cliente añaden ~40 ms a cada respuesta
+    disable_nagle_algorithm = True
+
+    def _responder(self, estado, datos):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_POST(self):
+        if self.path != "/enrutar":
+            return self._responder(404, {"error": "ruta desconocida"})
+        try:
+            datos = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            textos = datos["mensajes"] if "mensajes" in datos else [datos["mensaje"]]
+            # Una cadena también es iterable: {"mensajes": "hola"} se enrutaría letra a letra
+            if not isinstance(textos, list) or not all(isinstance(t, str) for t in textos):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return self._responder(400, {"error": 'se espera {"mensaje": "..."} o {"mensajes": [...]}'})
+        if not textos:  # sin mensajes no se encola un lote vacío (no cuenta en las estadísticas)
+            return self._responder(200, {"resultados": []})
+
+        try:
+            resultados = self.server.lotes.enrutar(textos)
+        except Exception as error:  # el lote falló en el modelo: el cliente recibe una respuesta igualmente
+            return self._responder(500, {"error": f"no se pudo clasificar: {error!r}"})
+        self._responder(200, {"resultados": [
+            {"texto": texto, "etiqueta": etiqueta, "ruta": ruta} for texto, etiqueta, ruta in resultados
+        ]})
+
+    def do_GET(self):
+        if self.path != "/estadisticas":
+            return self._responder(404, {"error": "ruta desconocida"})
+        self._responder(200, self.server.lotes.estadisticas())
+
+    def log_message(self, formato, *args):
+        pass  # miles de peticiones por segundo: sin una línea de log por petición
+
+
+class ServidorTriage(ThreadingHTTPServer):
+    """Servidor HTTP (un hilo por conexión) que comparte un MicroLotes"""
+
+    manejador = ManejadorTriage
+    # La cola de listen por defecto (5) rechaza conexiones en ráfagas de clientes
+    request_queue_size = 1024
+
+    def __init__(self, direccion, lotes):
+        self.lotes = lotes
+        super().__init__(direccion, self.manejador)
+
+
+class ManejadorTriageUnix(ManejadorTriage):
+    disable_nagle_algorithm = False  # TCP_NODELAY no existe en sockets Unix
+
+
+class ServidorTriageUnix(ServidorTriage):
+    """El mismo servidor escuchando en un socket Unix (sin pila TCP)"""
+
+    address_family = socket.AF_UNIX
+    manejador = ManejadorTriageUnix
+
+    def server_bind(self):
+        socketserver.TCPServer.server_bind(self)  # HTTPServer.server_bind espera (host, puerto)
+        self.server_name, self.server_port = "localhost", 0
+
+    def get_request(self):
+        conexion, _ = super().get_request()
+        return conexion, ("local", 0)  # los handlers esperan una dirección (host, puerto)
+
+
+def crear_servidor(lotes, host="127.0.0.1", port=8000, socket_path=None):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return ServidorTriageUnix(socket_path, lotes)
+    return ServidorTriage((host, port), lotes)
+
+
+def reportar(lotes, cada):
+    while True:
+        time.sleep(cada)
+        e = lotes.estadisticas()
+        print(f"📊 {e['mensajes']} mensajes · {e['mensajes_por_segundo']} msg/s · "
+              f"p50 {e['p50_ms']} ms · p99 {e['p99_ms']} ms · lote medio {e['lote_medio']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de triage de mensajes con micro-lotes")
+    parser.add_argument("--modelo", default=str(MODELO), help="artefacto plano o .joblib")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--socket", help="ruta de un socket Unix (en lugar de host/puerto)")
+    parser.add_argument("--max-lote", type=int, default=64, help="mensajes máximos por llamada a predict")
+    parser.add_argument("--espera-ms", type=float, default=5.0, help="espera máxima para completar un lote")
+    parser.add_argument("--reporte", type=float, default=10.0, help="segundos entre reportes de latencia")
+    args = parser.parse_args(argv)
+
+    pipe = cargar_modelo(args.modelo)  # se carga una sola vez para todo el proceso
+    lotes = MicroLotes(pipe, max_lote=args.max_lote, espera_max=args.espera_ms / 1000)
+    servidor = crear_servidor(lotes, args.host, args.port, args.socket)
+    print(f"✅ Pipeline cargado desde {args.modelo}")
+    print(f"🚀 Escuchando en {args.socket or f'http://{args.host}:{args.port}'} "
+          f"(lote máx. {args.max_lote}, espera máx. {args.espera_ms} ms)")
+    threading.Thread(target=reportar, args=(lotes, args.reporte), daemon=True).start()
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("⏹️ Servidor detenido")
+    finally:
+        servidor.server_close()
+        lotes.cerrar()
+        print(lotes.estadisticas())
+
+
+if __name__ == "__main__":
+    main()
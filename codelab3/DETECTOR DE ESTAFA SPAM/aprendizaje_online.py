@@ -0,0 +1,127 @@
+# Aprendizaje en línea del detector de spam con feedback etiquetado
+# - Espacio de características fijo: NormalizadorTexto + HashingVectorizer (no hay
+#   vocabulario que reajustar, así que las palabras nuevas de cada estafa caben sin
+#   reconstruir el modelo)
+# - SGDClassifier con pérdida logística (probabilidades, como la LogisticRegression de
+#   main.py) entrenado con partial_fit lote a lote; los pesos por clase equilibran las
+#   clases vistas hasta el momento (comun/incremental.py). Los conteos de clase viajan
+#   con el modelo publicado, así que una sesión que continúa un registro los conserva
+# - Antes de aprender de un lote, el modelo lo puntúa: esas probabilidades no vistas
+#   recalibran el umbral (CalibradorUmbral de comun/calibracion.py)
+# - Cada lote se publica como nueva versión en un RegistroModelos (comun/registro.py):
+#   el servicio que clasifica cambia de modelo en caliente, sin perder peticiones ni
+#   recargar desde disco en cada llamada
+#
+# Uso: python aprendizaje_online.py feedback.csv [--registro pipeline_spam_online.joblib]
+#          [--lote 500] [--n-features 262144]
+#      (CSV con columnas texto y etiqueta, 1 = spam/estafa y 0 = legítimo; si el registro
+#       ya existe, se continúa desde su última versión)
+import argparse
+import copy
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from comun.calibracion import CalibradorUmbral, ClasificadorUmbral
+from comun.incremental import pesos_balanceados, vectorizador_hashing
+from comun.normalizacion import NormalizadorTexto
+from comun.registro import RegistroModelos
+
+CLASES = np.array([0, 1])
+
+
+def crear_modelo_online(n_features=2**18, precision_objetivo=0.95):
+    """Pipeline limpieza + hashing + SGD logístico, con umbral calibrado (aún sin entrenar)"""
+    pipe = make_pipeline(
+        NormalizadorTexto(),
+        vectorizador_hashing(n_features),
+        SGDClassifier(loss="log_loss", alpha=1e-4, random_state=42),
+    )
+    return ClasificadorUmbral(pipe, CalibradorUmbral(objetivo="precision", precision_objetivo=precision_objetivo))
+
+
+class AprendizOnline:
+    """Actualiza una copia de trabajo con cada lote de feedback y publica versiones en el registro"""
+
+    def __init__(self, registro, modelo=None):
+        self.registro = registro
+        # Copia de trabajo: el modelo publicado nunca se modifica mientras se sirve
+        self.modelo = copy.deepcopy(modelo if modelo is not None else registro.actual()[1])
+        if self.modelo is None:
+            self.modelo = crear_modelo_online()
+        # Conteo de cada clase en todo el feedback recibido (para los pesos balanceados);
+        # se guarda en el modelo para que se publique y se recupere junto a él
+        if not hasattr(self.modelo, "conteos_clases_"):
+            self.modelo.conteos_clases_ = np.zeros(len(CLASES), dtype=np.int64)
+
+    @property
+    def conteos(self):
+        return self.modelo.conteos_clases_
+
+    @property
+    def entrenado(self):
+        return hasattr(self.modelo.pipeline[-1], "coef_")
+
+    def aprender(self, textos, etiquetas, publicar=True):
+        """Aprende de un lote etiquetado; devuelve la versión publicada (o None)"""
+        y = np.asarray(etiquetas).astype(int)
+        # Valida las etiquetas (solo 0/1) antes de tocar el modelo; los conteos se
+        # actualizan sobre una copia que solo se guarda si el lote se aprende
+        conteos = self.conteos.copy()
+        pesos = pesos_balanceados(y, conteos, CLASES)
+        X = self.modelo.pipeline[:-1].transform(list(textos))  # limpieza + hashing
+        sgd = self.modelo.pipeline[-1]
+        if self.entrenado:
+            # Probabilidades antes de ver el lote (evaluación previa): calibran el umbral
+            self.modelo.calibrador.actualizar(sgd.predict_proba(X)[:, 1], y == 1)
+
+        sgd.partial_fit(X, y, classes=CLASES, sample_weight=pesos)
+        self.modelo.conteos_clases_ = conteos
+        return self.publicar() if publicar else None
+
+    def publicar(self):
+        """Publica una copia congelada del modelo actual como nueva versión"""
+        return self.registro.publicar(copy.deepcopy(self.modelo))
+
+
+def leer_feedback(ruta, lote=500, columna_texto="texto", columna_etiqueta="etiqueta"):
+    """Recorre el CSV de feedback en lotes de (textos, etiquetas) sin filas vacías"""
+    for df in pd.read_csv(ruta, chunksize=lote, usecols=[columna_texto, columna_etiqueta],
+                          dtype={columna_texto: str}):
+        df = df.dropna()
+        if len(df):
+            yield df[columna_texto].tolist(), df[columna_etiqueta].astype(int).to_numpy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aprendizaje en línea del detector de spam con feedback etiquetado")
+    parser.add_argument("csv", help="CSV de feedback con columnas texto y etiqueta (1 = spam)")
+    parser.add_argument("--registro", default="pipeline_spam_online.joblib",
+                        help="archivo donde se publica cada versión (lo vigila el servicio)")
+    parser.add_argument("--lote", type=int, default=500, help="mensajes por actualización")
+    parser.add_argument("--n-features", type=int, default=2**18, help="dimensión del hashing (si el registro es nuevo)")
+    args = parser.parse_args(argv)
+
+    registro = RegistroModelos(ruta=args.registro)
+    modelo = None if registro.actual()[1] is not None else crear_modelo_online(args.n_features)
+    aprendiz = AprendizOnline(registro, modelo)
+    print(f"✅ Registro {args.registro}: versión inicial {registro.version}")
+
+    inicio = time.perf_counter()
+    filas = 0
+    for textos, etiquetas in leer_feedback(args.csv, args.lote):
+        version = aprendiz.aprender(textos, etiquetas)
+        filas += len(textos)
+        print(f"📦 Versión {version}: {filas} mensajes de feedback · umbral {aprendiz.modelo.umbral:.3f} · "
+              f"{filas / (time.perf_counter() - inicio):,.0f} mensajes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-import re, random, numpy as np, pandas as pd  # re=expresiones regulares; random/numpy/pandas=datos y utilidades
-from sklearn.model_selection import train_test_split, cross_val_score  # dividir datos y validar (cross-validation)
+import random, numpy as np, pandas as pd  # random/numpy/pandas=datos y utilidades
+from sklearn.model_selection import train_test_split, cross_val_score, cross_val_predict  # dividir datos y validar (cross-validation)
 from sklearn.pipeline import make_pipeline  # encadenar pasos (vectorizador + modelo) en un solo objeto
 from sklearn.feature_extraction.text import TfidfVectorizer  # convierte texto a números (TF-IDF)
 from sklearn.linear_model import LogisticRegression  # clasificador lineal que devuelve probabilidades
@@ -8,6 +8,14 @@ from sklearn.metrics import (classification_report, confusion_matrix,
                              average_precision_score)  # métricas para evaluar y calibrar umbrales
 import matplotlib.pyplot as plt  # para graficar curva precisión-recall
 import joblib  # guardar/cargar el pipeline entrenado
+import sys; from pathlib import Path  # para importar los módulos compartidos de comun/ (raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from comun.normalizacion import NormalizadorTexto  # limpieza de texto como paso del pipeline
+from comun.artefactos import exportar_puntuador  # artefacto plano (carga rápida con memoria mapeada)
+from comun.seleccion import REJILLA_TFIDF, reportar_seleccion, seleccionar_modelo  # búsqueda de hiperparámetros
+from comun.calibracion import CalibradorUmbral, ClasificadorUmbral  # umbral calibrado que viaja con el modelo
+from comun.registro import RegistroModelos  # versión publicada del modelo (cambio en caliente)
+from aprendizaje_online import AprendizOnline, crear_modelo_online  # aprendizaje en línea con feedback (hashing + SGD)
 
 random.seed(42); np.random.seed(42)  # fijamos semillas: resultados reproducibles al repetir el script
 
@@ -60,30 +68,37 @@ print("Muestras:", len(df), " | Spam:", int(df['etiqueta'].sum()), " | Legítimo
 # 2) Limpieza simple
 #    Normalizamos el texto: minúsculas, quitamos signos raros, compactamos espacios.
 #    Nota: conservamos acentos y "ñ" porque son útiles en español.
-def limpiar(s: str) -> str:
-    s = s.lower()
-    s = re.sub(r"[^a-záéíóúñü0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-df["texto_clean"] = df["texto"].apply(limpiar)
+#    La limpieza es el primer paso del pipeline (NormalizadorTexto, en comun/normalizacion.py,
+#    la misma que usa el triage de codelab2): el .joblib la incluye y no hay que limpiar a mano.
 
 # 3) Split estratificado
 #    Separamos en entrenamiento (80%) y prueba (20%).
 #    stratify conserva la proporción de spam/legítimos en ambos conjuntos.
 X_train, X_test, y_train, y_test = train_test_split(
-    df["texto_clean"], df["etiqueta"], test_size=0.2, random_state=42, stratify=df["etiqueta"]
+    df["texto"], df["etiqueta"], test_size=0.2, random_state=42, stratify=df["etiqueta"]
 )
 
 # 4) Pipeline TF-IDF + Regresión Logística (con balance por si hay leves desbalances)
+#    NormalizadorTexto: limpia el texto (minúsculas, sin signos raros) dentro del propio pipeline.
 #    TfidfVectorizer: convierte texto a una matriz numérica (unigrams+bigrams; ignora términos raros)
 #    LogisticRegression: modelo lineal que devuelve probabilidades para ajustar umbrales luego.
 #    class_weight="balanced": compensa si hay más ejemplos de una clase que de otra.
 pipe = make_pipeline(
+    NormalizadorTexto(),
     TfidfVectorizer(max_features=30000, ngram_range=(1,2), min_df=2),
     LogisticRegression(max_iter=200, class_weight="balanced", n_jobs=-1, solver="liblinear")
 )
 
+# 4b) (Opcional) Selección de hiperparámetros: python main.py --seleccion
+#    Prueba max_features, ngram_range, min_df y C (inversa de la regularización) sobre el conjunto
+#    de entrenamiento con successive halving, en paralelo y reutilizando el TF-IDF ya ajustado
+#    entre candidatos (comun/seleccion.py). A partir de aquí el script usa la mejor configuración.
+if "--seleccion" in sys.argv[1:]:
+    busqueda = seleccionar_modelo(pipe, {**REJILLA_TFIDF, "logisticregression__C": [0.1, 1, 10]},
+                                  X_train, y_train, scoring="f1_macro")
+    reportar_seleccion(busqueda)
+    pipe = busqueda.best_estimator_
+
 # 5) Entrenar y evaluar (umbral por defecto 0.5)
 #    fit entrena el pipeline completo; predict usa umbral 0.5 por defecto para decidir 0/1.
 pipe.fit(X_train, y_train)
@@ -105,13 +120,17 @@ print(f"\nAverage Precision (área precisión-recall): {ap:.3f}")
 
 #   Elegimos un umbral que priorice, por ejemplo, ALTA PRECISIÓN al marcar spam
 #   (reduce falsos positivos: evitar etiquetar legítimos como spam).
-def evaluar_umbral(t):
-    p = (probs >= t).astype(int)
-    return accuracy_score(y_test, p)
-
-umbral = 0.7  # puedes moverlo: ~0.3 (recall alto) ... ~0.7 (precision alta)
+#   CalibradorUmbral (comun/calibracion.py) elige el umbral más bajo que alcanza la precisión
+#   objetivo en una sola pasada por histogramas de probabilidades; con objetivo="coste" y
+#   coste_fp/coste_fn minimiza en su lugar el coste de los errores.
+#   Se calibra con probabilidades fuera de pliegue del entrenamiento (cross_val_predict), así
+#   X_test sigue sirviendo para evaluar el umbral elegido.
+probs_train = cross_val_predict(pipe, X_train, y_train, cv=5, method="predict_proba")[:, 1]
+calibrador = CalibradorUmbral(objetivo="precision", precision_objetivo=0.95).ajustar(probs_train, y_train)
+umbral = calibrador.umbral_
+print(f"Umbral calibrado (precisión objetivo 0.95): {umbral:.3f}")
 pred_u = (probs >= umbral).astype(int)
-print(f"\nAccuracy con umbral {umbral}: {accuracy_score(y_test, pred_u):.3f}")
+print(f"\nAccuracy con umbral {umbral:.3f}: {accuracy_score(y_test, pred_u):.3f}")
 print("Reporte por clase con umbral ajustado:\n", classification_report(y_test, pred_u, digits=3))
 print("Matriz con umbral ajustado:\n",
       pd.DataFrame(confusion_matrix(y_test, pred_u, labels=[0,1]),
@@ -127,16 +146,21 @@ plt.show()
 
 # 7) Validación cruzada (estable)
 #    cross_val_score re-entrena y evalúa con diferentes particiones (k=5) para estimar estabilidad.
-scores = cross_val_score(pipe, df["texto_clean"], df["etiqueta"], cv=5, scoring="f1_macro")
+scores = cross_val_score(pipe, df["texto"], df["etiqueta"], cv=5, scoring="f1_macro", n_jobs=-1)  # pliegues en paralelo
 print(f"\nCV 5-fold F1_macro: media={scores.mean():.3f} ±{scores.std():.3f}")
 
 # 8) Uso en vida real: clasificar mensajes nuevos con umbral ajustado
-#    Recibe textos, calcula probabilidad de spam y aplica el umbral elegido.
-#    Devuelve una lista con (texto_original, prob_spam_redondeada, etiqueta_amigable).
-def clasificar_mensajes(textos, threshold=0.7):
-    tx = [limpiar(t) for t in textos]
-    prob = pipe.predict_proba(tx)[:, 1]
-    yhat = (prob >= threshold).astype(int)
+#    ClasificadorUmbral junta el pipeline y el calibrador: su predict ya aplica el umbral calibrado.
+#    clasificar_mensajes toma el modelo publicado en el registro (una versión completa por llamada,
+#    sin locks ni recargas), calcula probabilidad de spam y aplica su umbral (o el que pases en
+#    threshold). Devuelve (texto_original, prob_spam_redondeada, etiqueta_amigable).
+modelo = ClasificadorUmbral(pipe, calibrador)
+registro = RegistroModelos(modelo)
+
+def clasificar_mensajes(textos, threshold=None):
+    _, actual = registro.actual()  # si se publica otra versión, la llamada en curso termina con esta
+    prob = actual.predict_proba(textos)[:, 1]  # el pipeline limpia los textos
+    yhat = (prob >= (actual.umbral if threshold is None else threshold)).astype(int)
     etiqueta = ["spam/estafa" if i==1 else "legítimo" for i in yhat]
     return list(zip(textos, prob.round(3), etiqueta))
 
@@ -146,16 +170,71 @@ nuevos = [
     "Gana dinero rápido hoy, sin riesgo, solo ingresa tu tarjeta",
     "Hola, ¿cuál es el precio del plan anual y si aceptan tarjeta?"
 ]
-print("\nMensajes nuevos clasificados (umbral 0.7):")
-for t, p, e in clasificar_mensajes(nuevos, threshold=0.7):
+print(f"\nMensajes nuevos clasificados (umbral {modelo.umbral:.3f}):")
+for t, p, e in clasificar_mensajes(nuevos):
     print(f"- '{t}' -> prob_spam={p} | clase={e}")
 
-# 9) Guardar y cargar un ÚNICO pipeline (producción)
-#    Guardamos el pipeline completo (vectorizador + modelo) para reutilizar sin reentrenar.
-joblib.dump(pipe, "pipeline_spam.joblib")
-print("\nPipeline guardado en pipeline_spam.joblib")
+# 9) Guardar y cargar un ÚNICO modelo (producción)
+#    Guardamos el pipeline completo (limpieza + vectorizador + modelo) junto con el umbral calibrado
+#    para reutilizar sin reentrenar: loaded.predict aplica el umbral, no 0.5.
+joblib.dump(modelo, "pipeline_spam.joblib")
+print(f"\nPipeline guardado en pipeline_spam.joblib (umbral {modelo.umbral:.3f})")
+#    También como artefacto plano (vocabulario y pesos en arrays, carga con memoria mapeada
+#    compartida entre procesos): comun.artefactos.cargar_artefacto("pipeline_spam.plano"),
+#    o sin sklearn: comun.puntuador.PuntuadorLineal("pipeline_spam.plano") (mismas
+#    etiquetas, probabilidades y umbral; se comprueba al exportar sobre X_test).
+exportar_puntuador(modelo, "pipeline_spam.plano", X_test)
+print(f"Artefacto plano guardado en pipeline_spam.plano (puntuador NumPy validado en {len(X_test)} mensajes)")
 
 # Carga y uso posterior:
 #    Ejemplo de cómo cargar y predecir directamente sobre un texto nuevo.
 loaded = joblib.load("pipeline_spam.joblib")
-print("Test carga:", loaded.predict(["Gana dinero fácil completando este formulario"])[0])  # 1=spam, 0=legítimo
\ No newline at end of file
+print("Test carga:", loaded.predict(["Gana dinero fácil completando este formulario"])[0])  # 1=spam, 0=legítimo
+
+#    Recalibración en línea: cuando llegan mensajes revisados (feedback etiquetado), actualizar
+#    los suma a los histogramas del calibrador y recalcula el umbral sin reentrenar ni volver a
+#    calcular la curva precisión-recall. El cambio queda solo en memoria: para conservarlo hay
+#    que volver a guardar el modelo (joblib.dump); aquí es una demostración con dos mensajes y
+#    no se sobrescribe pipeline_spam.joblib (seguiría sin coincidir con pipeline_spam.plano).
+loaded.actualizar(["Confirma tu contraseña en este enlace para no perder tu cuenta",
+                   "Quiero confirmar si mi pedido ya fue enviado"], [1, 0])
+resumen = loaded.calibrador.resumen()
+print(f"Umbral tras el feedback: {resumen['umbral']:.3f} ({resumen['observaciones']} mensajes etiquetados, "
+      f"precisión estimada {resumen['precision']:.3f}, recall {resumen['recall']:.3f})")
+
+# 10) (Opcional) Aprendizaje en línea: python main.py --online
+#    Las estafas cambian de redacción cada semana. En lugar de reentrenar todo, AprendizOnline
+#    (aprendizaje_online.py) actualiza un modelo hashing + SGD con cada lote de feedback etiquetado
+#    y publica cada versión en el registro: clasificar_mensajes la usa desde la siguiente llamada.
+#    Para otro proceso: python aprendizaje_online.py feedback.csv publica en pipeline_spam_online.joblib
+#    y el servicio lo recoge con RegistroModelos(ruta=...).vigilar() (un stat por segundo).
+if "--online" in sys.argv[1:]:
+    aprendiz = AprendizOnline(registro, crear_modelo_online())
+    #    Arranque con el histórico de entrenamiento en lotes de 50 (se publica al terminar)
+    for i in range(0, len(X_train), 50):
+        aprendiz.aprender(X_train.iloc[i:i + 50], y_train.iloc[i:i + 50], publicar=False)
+    version = aprendiz.publicar()
+    print(f"\n🔄 Versión {version} (hashing + SGD): accuracy test {accuracy_score(y_test, aprendiz.modelo.predict(X_test)):.3f}"
+          f" | umbral {aprendiz.modelo.umbral:.3f}")
+
+    #    Llega una redacción de estafa que no estaba en el dataset, revisada por el equipo como feedback
+    estafas_nuevas = [
+        "Tu paquete está retenido en aduana, paga la tasa en este enlace",
+        "Detectamos un acceso sospechoso, envía el código que recibiste por SMS",
+        "Reembolso de impuestos pendiente, confirma tu cuenta bancaria aquí",
+    ]
+    legit_nuevos = [
+        "Me llegó el código por SMS pero no me deja entrar a la cuenta",
+        "¿Mi paquete ya salió de aduana? Quiero saber la fecha de entrega",
+        "Necesito la factura del reembolso que me hicieron",
+    ]
+    deriva = ["Tu envío está retenido en aduana, paga la tasa hoy",
+              "Confirma tu cuenta bancaria para recibir el reembolso de impuestos",
+              "¿Cuándo sale mi paquete de aduana?"]
+    antes = clasificar_mensajes(deriva)
+    for _ in range(5):  # cinco lotes de reportes (variantes de los mismos mensajes)
+        aprendiz.aprender([variar(t) for t in estafas_nuevas + legit_nuevos],
+                          [1] * len(estafas_nuevas) + [0] * len(legit_nuevos))
+    print(f"Mensajes con la redacción nueva (versión {version} -> {registro.version}, umbral {aprendiz.modelo.umbral:.3f}):")
+    for (t, p0, e0), (_, p1, e1) in zip(antes, clasificar_mensajes(deriva)):
+        print(f"- '{t}' -> prob_spam={p0} ({e0}) | tras el feedback {p1} ({e1})")
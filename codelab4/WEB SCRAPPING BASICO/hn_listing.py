@@ -0,0 +1,129 @@
+# Extracción de las portadas de Hacker News en una sola pasada
+# Cada noticia son dos filas seguidas: <tr class="athing"> (título, enlace, dominio)
+# y la fila de <td class="subtext"> (puntos, autor, antigüedad, comentarios).
+# Se recorren ambas en orden de documento y cada subtexto completa la última noticia.
+# Con lxml se usa XPath (mucho más rápido); sin él, BeautifulSoup con html.parser
+# construyendo solo esas filas. Los dos caminos devuelven los mismos registros.
+# bs4 solo se importa si hace falta (sin lxml): los workers arrancan más rápido.
+import re
+from urllib.parse import urljoin
+
+from comun.xpath import etree, has_class, lxml_html
+
+HN_URL = "https://news.ycombinator.com/"
+
+# Durante el parseo el atributo class llega sin separar ('athing submission'),
+# así que la clase se busca como palabra completa con una regex
+ROWS_CLASS = re.compile(r'(^|\s)(athing|subtext)(\s|$)')
+
+
+if lxml_html is not None:
+    # La unión devuelve los nodos en orden de documento
+    _ROWS = etree.XPath(f"//tr[{has_class('athing')}] | //td[{has_class('subtext')}]")
+    _TITLELINE_LINK = etree.XPath(f"(.//span[{has_class('titleline')}])[1]/a[1]")
+    _ROW_LINKS = etree.XPath(".//a")
+    _SITESTR = etree.XPath(f"(.//span[{has_class('sitestr')}])[1]")
+    _SCORE = etree.XPath(f"(.//span[{has_class('score')}])[1]")
+    _ITEM_LINKS = etree.XPath(".//a[starts-with(@href, 'item?id=')]")
+
+
+def parse_count(text):
+    """'123 points' / '45&nbsp;comments' -> 123 / 45 ('discuss' -> 0)"""
+    words = text.replace('\xa0', ' ').split(maxsplit=1)
+    return int(words[0]) if words and words[0].isdigit() else 0
+
+
+def _story(item_id, title_link_text, href, domain, scraped_at, base_url):
+    return {
+        'item_id': int(item_id) if item_id.isdigit() else None,
+        'title': title_link_text.strip(),
+        'link': urljoin(base_url, href),
+        'domain': domain,
+        'score': None,
+        'comments': None,
+        'scraped_at': scraped_at,
+    }
+
+
+def _comments(item_links):
+    """Comentarios del último enlace item?id= del subtexto ('N comments' o 'discuss')
+
+    El primer enlace item?id= es la antigüedad ('3 hours ago'); las ofertas de
+    empleo no tienen enlace de comentarios y devuelven None.
+    """
+    if not item_links:
+        return None
+    text = item_links[-1]
+    return parse_count(text) if 'comment' in text or text == 'discuss' else None
+
+
+def _extract_lxml(html, scraped_at, base_url):
+    news_items = []
+    item = None
+    for element in _ROWS(lxml_html.fromstring(html)):
+        if element.tag == 'tr':
+            title_link = _TITLELINE_LINK(element)
+            if title_link:
+                title_link = title_link[0]
+            else:
+                # Marcado antiguo: el primer enlace con texto de la fila
+                title_link = next((a for a in _ROW_LINKS(element) if len(a.text_content().strip()) > 5), None)
+            if title_link is None:
+                item = None
+                continue
+
+            sitestr = _SITESTR(element)
+            item = _story(element.get('id', ''), title_link.text_content(), title_link.get('href', ''),
+                          sitestr[0].text_content() if sitestr else None, scraped_at, base_url)
+            news_items.append(item)
+
+        elif item is not None:
+            score = _SCORE(element)
+            if score:
+                item['score'] = parse_count(score[0].text_content())
+            item['comments'] = _comments([a.text_content() for a in _ITEM_LINKS(element)])
+            item = None
+    return news_items
+
+
+def _extract_soup(html, scraped_at, base_url):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    news_items = []
+    item = None
+    rows = SoupStrainer(['tr', 'td'], class_=ROWS_CLASS)
+    for element in BeautifulSoup(html, 'html.parser', parse_only=rows).children:
+        if element.name == 'tr':
+            titleline = element.find('span', class_='titleline')
+            if titleline is not None:
+                title_link = titleline.a
+            else:
+                title_link = next((a for a in element.find_all('a') if len(a.text.strip()) > 5), None)
+            if title_link is None:
+                item = None
+                continue
+
+            sitestr = element.find('span', class_='sitestr')
+            item = _story(element.get('id', ''), title_link.text, title_link.get('href', ''),
+                          sitestr.text if sitestr else None, scraped_at, base_url)
+            news_items.append(item)
+
+        elif element.name == 'td' and item is not None:
+            score = element.find('span', class_='score')
+            if score:
+                item['score'] = parse_count(score.text)
+            item['comments'] = _comments([
+                a.text for a in element.find_all('a', href=True) if a['href'].startswith('item?id=')
+            ])
+            item = None
+    return news_items
+
+
+def extract_listing(html, scraped_at, base_url=HN_URL):
+    """Registros tipados de las noticias de una portada (lista vacía si no hay filas)
+
+    item_id, score y comments son enteros (None si la fila no los tiene, como las
+    ofertas de empleo); domain es None en las publicaciones internas (Ask HN).
+    """
+    extract = _extract_lxml if lxml_html is not None else _extract_soup
+    return extract(html, scraped_at, base_url)
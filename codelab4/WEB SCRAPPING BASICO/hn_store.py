@@ -0,0 +1,135 @@
+# Almacén SQLite de series temporales para el monitor de Hacker News
+# - stories: una fila por noticia (item_id), con su último estado conocido
+# - snapshots: puntos y comentarios de cada noticia en cada sondeo
+# - Cada sondeo se escribe en una sola transacción (executemany)
+# - Los índices permiten responder consultas por ventana de tiempo sin recorrer
+#   toda la tabla (p. ej. "noticias que ganaron más de 100 puntos en la última hora")
+import sqlite3
+from datetime import datetime, timedelta
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    item_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    link TEXT,
+    domain TEXT,
+    score INTEGER,
+    comments INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stories_last_seen ON stories(last_seen);
+CREATE INDEX IF NOT EXISTS idx_stories_domain ON stories(domain);
+CREATE TABLE IF NOT EXISTS snapshots (
+    item_id INTEGER NOT NULL REFERENCES stories(item_id),
+    taken_at TEXT NOT NULL,
+    score INTEGER,
+    comments INTEGER,
+    PRIMARY KEY (item_id, taken_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_taken_at ON snapshots(taken_at, item_id, score);
+"""
+
+
+def _now():
+    return datetime.now().strftime(TIME_FORMAT)
+
+
+class NewsStore:
+    """Noticias de HN y su evolución de puntos/comentarios entre sondeos"""
+
+    def __init__(self, path='hn_monitor.sqlite'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL: se puede consultar la base mientras el monitor sigue escribiendo
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record_poll(self, news_items, taken_at=None):
+        """Guarda un sondeo: actualiza las noticias y añade un snapshot de cada una
+
+        Las noticias sin item_id (estrategia alternativa) se ignoran y las repetidas
+        dentro del mismo sondeo se cuentan una vez. Devuelve cuántas eran nuevas.
+        """
+        taken_at = taken_at or _now()
+        stories = {item['item_id']: item for item in news_items if item.get('item_id') is not None}
+        if not stories:
+            return 0
+
+        before = self.conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0]
+        rows = [
+            (item_id, item['title'], item['link'], item['domain'], item['score'], item['comments'], taken_at)
+            for item_id, item in stories.items()
+        ]
+        # Una transacción por sondeo: noticias y snapshots quedan juntos o no queda nada
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO stories (item_id, title, link, domain, score, comments, first_seen, last_seen)
+                   VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?7)
+                   ON CONFLICT(item_id) DO UPDATE SET
+                       title = excluded.title, link = excluded.link, domain = excluded.domain,
+                       score = excluded.score, comments = excluded.comments,
+                       last_seen = excluded.last_seen""",
+                rows,
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (item_id, taken_at, score, comments) VALUES (?, ?, ?, ?)",
+                [(item_id, taken_at, score, comments) for item_id, _, _, _, score, comments, _ in rows],
+            )
+
+        return self.conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0] - before
+
+    def score_gainers(self, min_gain=100, window=timedelta(hours=1), now=None):
+        """Noticias cuya puntuación subió más de min_gain dentro de la ventana
+
+        Compara el primer y el último snapshot de cada noticia dentro de la ventana.
+        El rango por taken_at se lee del índice idx_snapshots_taken_at (forzado: sin
+        estadísticas, SQLite preferiría recorrer la clave primaria para agrupar).
+        """
+        now = now or datetime.now()
+        since = (now - window).strftime(TIME_FORMAT)
+        rows = self.conn.execute(
+            """WITH bounds AS (
+                   SELECT item_id, MIN(taken_at) AS first_at, MAX(taken_at) AS last_at
+                   FROM snapshots INDEXED BY idx_snapshots_taken_at
+                   WHERE taken_at >= ? GROUP BY item_id
+               )
+               SELECT s.item_id, s.title, s.link, oldest.score AS start_score, newest.score AS end_score,
+                      newest.score - oldest.score AS gain
+               FROM bounds b
+               JOIN snapshots oldest ON oldest.item_id = b.item_id AND oldest.taken_at = b.first_at
+               JOIN snapshots newest ON newest.item_id = b.item_id AND newest.taken_at = b.last_at
+               JOIN stories s ON s.item_id = b.item_id
+               WHERE newest.score - oldest.score > ?
+               ORDER BY gain DESC""",
+            (since, min_gain),
+        )
+        return [dict(row) for row in rows]
+
+    def story_history(self, item_id):
+        """Trayectoria de puntos y comentarios de una noticia"""
+        rows = self.conn.execute(
+            "SELECT taken_at, score, comments FROM snapshots WHERE item_id = ? ORDER BY taken_at",
+            (item_id,),
+        )
+        return [dict(row) for row in rows]
+
+    def recent_stories(self, window=timedelta(hours=1), now=None):
+        """Noticias vistas en la ventana, de más a menos puntos"""
+        since = ((now or datetime.now()) - window).strftime(TIME_FORMAT)
+        rows = self.conn.execute(
+            "SELECT * FROM stories WHERE last_seen >= ? ORDER BY score DESC", (since,)
+        )
+        return [dict(row) for row in rows]
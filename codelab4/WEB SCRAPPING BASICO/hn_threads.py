@@ -0,0 +1,67 @@
+# Extracción de los hilos de comentarios de Hacker News (páginas item?id=)
+# Cada comentario es una fila 'athing comtr'; su nivel de anidamiento está en el
+# atributo indent de la celda 'ind' (0 = comentario de primer nivel).
+# Los hilos largos pesan cientos de KB: con lxml se parsean con XPath (mucho más
+# rápido); sin él se usa BeautifulSoup con html.parser (importado solo entonces)
+# y el resultado es el mismo.
+from comun.xpath import etree, has_class, lxml_html
+
+
+if lxml_html is not None:
+    _COMMENT_ROWS = etree.XPath(f"//tr[{has_class('comtr')}]")
+    _INDENT = etree.XPath(f"string((.//td[{has_class('ind')}])[1]/@indent)")
+    _AUTHOR = etree.XPath(f"(.//a[{has_class('hnuser')}])[1]")
+    _TEXT = etree.XPath(f"(.//div[{has_class('commtext')}])[1]")
+
+
+def _join_text(fragments):
+    """Une los fragmentos de texto no vacíos, uno por línea (como get_text('\\n', strip=True))"""
+    return '\n'.join(fragment.strip() for fragment in fragments if fragment.strip())
+
+
+def _parse_thread_lxml(html):
+    comment_rows = _COMMENT_ROWS(lxml_html.fromstring(html))
+
+    top_comments = []
+    for row in comment_rows:
+        if (_INDENT(row) or '0') != '0':
+            continue
+        author = _AUTHOR(row)
+        text = _TEXT(row)
+        top_comments.append({
+            'comment_id': int(row.get('id')),
+            'author': author[0].text_content() if author else None,
+            'text': _join_text(text[0].itertext()) if text else '',
+        })
+    return comment_rows, top_comments
+
+
+def _parse_thread_soup(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    comment_rows = soup.find_all('tr', class_='comtr')
+
+    top_comments = []
+    for row in comment_rows:
+        indent = row.find('td', class_='ind')
+        if indent is not None and indent.get('indent', '0') != '0':
+            continue
+        author = row.find('a', class_='hnuser')
+        text = row.find('div', class_='commtext')
+        top_comments.append({
+            'comment_id': int(row['id']),
+            'author': author.text if author else None,  # los comentarios borrados no tienen autor
+            'text': _join_text(text.strings) if text else '',
+        })
+    return comment_rows, top_comments
+
+
+def parse_item_thread(html):
+    """Cuenta los comentarios de un hilo y extrae los de primer nivel
+
+    Devuelve {'comment_count': int, 'top_comments': [{'comment_id', 'author', 'text'}]}.
+    """
+    parse = _parse_thread_lxml if lxml_html is not None else _parse_thread_soup
+    comment_rows, top_comments = parse(html)
+    return {'comment_count': len(comment_rows), 'top_comments': top_comments}
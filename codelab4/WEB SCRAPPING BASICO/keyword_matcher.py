@@ -0,0 +1,81 @@
+# Búsqueda de muchas palabras clave a la vez sobre un índice de tokens
+# - Las palabras clave se compilan una vez en un trie de secuencias de tokens
+# - Cada título se tokeniza una sola vez (regex en C) y se recorre token a token:
+#   el coste por título no depende de cuántas palabras clave se vigilen
+# - Solo cuentan las coincidencias de palabra completa: 'ai' encuentra "AI"
+#   pero no "said" ni "maintain"; 'machine learning' no encuentra "machine-learning"
+import re
+
+# Palabras (\w+) y signos sueltos: 'C++' -> ['c', '+', '+'], 'node.js' -> ['node', '.', 'js']
+TOKEN = re.compile(r'\w+|[^\w\s]')
+WORD = re.compile(r'\w+')
+
+
+def _normalize(text):
+    return ' '.join(text.lower().split())
+
+
+class KeywordMatcher:
+    """Índice de palabras clave (de una o varias palabras) con coincidencia de palabra completa"""
+
+    def __init__(self, keywords):
+        # Palabras clave sin duplicados (minúsculas, espacios simples); se devuelven
+        # con la forma en que se escribieron la primera vez
+        self.keywords = []
+        seen = set()
+        # Trie: token -> subárbol; la clave None guarda las palabras clave que
+        # terminan en ese nodo como (índice, forma exacta o None)
+        self._trie = {}
+        for keyword in keywords:
+            key = _normalize(keyword)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+
+            tokens = TOKEN.findall(key)
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            # Con signos ('c++') dos tokens seguidos del título pueden venir separados
+            # por espacios ('c + +'): esas palabras clave se verifican contra el texto
+            has_symbols = any(not WORD.fullmatch(token) for token in tokens)
+            node.setdefault(None, []).append((len(self.keywords), key if has_symbols else None))
+            self.keywords.append(keyword)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def find(self, text):
+        """Palabras clave presentes en el texto (en orden de aparición)"""
+        text = text.lower()
+        tokens = TOKEN.findall(text)
+        spans = None
+        hits = {}
+
+        for start in range(len(tokens)):
+            node = self._trie.get(tokens[start])
+            end = start + 1
+            while node is not None:
+                for index, exact in node.get(None, ()):
+                    if index in hits:
+                        continue
+                    if exact is not None:
+                        # Posiciones de los tokens, solo si alguna palabra clave con signos coincide
+                        if spans is None:
+                            spans = [match.span() for match in TOKEN.finditer(text)]
+                        if _normalize(text[spans[start][0]:spans[end - 1][1]]) != exact:
+                            continue
+                    hits[index] = None
+                if end == len(tokens):
+                    break
+                node = node.get(tokens[end])
+                end += 1
+
+        return [self.keywords[index] for index in hits]
+
+    def scan(self, items, field='title'):
+        """Recorre un flujo de registros y produce (registro, palabras clave encontradas)"""
+        for item in items:
+            hits = self.find(item[field])
+            if hits:
+                yield item, hits
@@ -1,13 +1,27 @@
 # Importar librerías
+# bs4 se importa solo en las funciones que lo usan: importar este módulo desde un
+# worker (p. ej. scrape_hn_news) no carga dependencias pesadas ni hace peticiones
+import argparse
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import csv
 import time
-from datetime import datetime
-import re
-
-print("✅ Librerías importadas correctamente")
+from datetime import datetime, timedelta
+import sys
+import asyncio
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+# Los módulos compartidos entre codelabs viven en comun/ (raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from comun.crawl_async import AsyncFetcher, create_session, response_text
+from comun.http_cache import CachedSession, HTTPCache
+from comun.pacing import AdaptivePacer
+from hn_listing import HN_URL, extract_listing
+from hn_store import NewsStore
+from hn_threads import parse_item_thread
+from keyword_matcher import KeywordMatcher
+from news_stats import NewsAggregator
 
 # URL del sitio de noticias
 url = "https://news.ycombinator.com"
@@ -21,185 +35,159 @@ headers = {
 # //*[@id="45372286"]/td[1]
 # [id="\34 5372286"] > td:nth-child(1)
 
-# Hacer la petición
-response = requests.get(url, headers=headers)
-print(f"Status Code: {response.status_code}")
-print(f"Content Length: {len(response.text)}")
-
-# Verificar que la petición fue exitosa
-if response.status_code == 200:
-    print("✅ Petición exitosa")
-else:
-    print("❌ Error en la petición")
-
-# Parsear el HTML
-soup = BeautifulSoup(response.text, 'html.parser')
-
-# Primero, vamos a explorar la estructura del HTML
-print("🔍 Explorando la estructura del HTML...")
-
-# Buscar diferentes tipos de enlaces
-story_links = soup.find_all('a', class_='titlelink')
-story_links_alt = soup.find_all('a', class_='storylink')
-all_links = soup.find_all('a')
-
-print(f"Enlaces con clase 'titlelink': {len(story_links)}")
-print(f"Enlaces con clase 'storylink': {len(story_links_alt)}")
-print(f"Total de enlaces: {len(all_links)}")
-
-# Buscar enlaces que contengan noticias (más flexible)
-news_links = []
-for link in all_links:
-    href = link.get('href', '')
-    text = link.text.strip()
-
-    # Filtrar enlaces que parecen ser noticias
-    if (href and text and
-        not href.startswith('#') and
-        not href.startswith('javascript:') and
-        len(text) > 10 and
-        'item?id=' not in href):
-        news_links.append(link)
-
-print(f"Enlaces potenciales de noticias: {len(news_links)}")
-
-# Mostrar los primeros enlaces encontrados
-if news_links:
-    print(f"\n📰 Primeros 3 enlaces encontrados:")
-    for i, link in enumerate(news_links[:3], 1):
-        print(f"{i}. {link.text[:50]}...")
-        print(f"   URL: {link.get('href')}")
-        print()
-else:
-    print("❌ No se encontraron enlaces de noticias")
-
-    # Vamos a ver qué clases existen
-    print("\n🔍 Clases de enlaces disponibles:")
-    link_classes = set()
-    for link in all_links[:20]:  # Solo los primeros 20
-        class_name = link.get('class')
-        if class_name:
-            link_classes.add(' '.join(class_name))
-
-    for cls in sorted(link_classes):
-        print(f"  - {cls}")
-
-def scrape_hn_news():
+# Caché en disco: si la portada no cambió, el servidor responde 304 y se usa la copia local
+http_cache = HTTPCache('.http_cache', ttl=24 * 3600, max_bytes=50 * 1024 * 1024)
+session = CachedSession(http_cache)
+
+# Ritmo adaptativo para el crawl concurrente (HN responde 429/503 si se le satura)
+pacer = AdaptivePacer(initial_rate=2.0, max_rate=30.0)
+
+def scrape_hn_news(url="https://news.ycombinator.com"):
     """Extrae noticias de Hacker News con estrategia robusta"""
-    url = "https://news.ycombinator.com"
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
 
     try:
-        response = requests.get(url, headers=headers)
+        response = session.get(url, headers=headers, timeout=30)
         response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        news_items = []
-
-        # Estrategia 1: Buscar por filas de noticias
-        rows = soup.find_all('tr', class_='athing')
-        print(f"Encontradas {len(rows)} filas de noticias")
-
-        if not rows:
-            # Estrategia 2: Buscar enlaces de noticias directamente
-            print("🔄 Intentando estrategia alternativa...")
-            all_links = soup.find_all('a')
-
-            for link in all_links:
-                href = link.get('href', '')
-                text = link.text.strip()
-
-                # Filtrar enlaces que parecen ser noticias
-                if (href and text and
-                    len(text) > 10 and
-                    not href.startswith('#') and
-                    not href.startswith('javascript:') and
-                    'item?id=' not in href and
-                    'user?id=' not in href and
-                    'show' not in href):
-
-                    # Hacer enlace absoluto si es relativo
-                    if href.startswith('/'):
-                        href = 'https://news.ycombinator.com' + href
-                    elif not href.startswith('http'):
-                        href = 'https://news.ycombinator.com/' + href
-
-                    news_items.append({
-                        'title': text,
-                        'link': href,
-                        'score': 'N/A',
-                        'comments': 'N/A',
-                        'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
-
-            # Limitar a las primeras 20 noticias
-            news_items = news_items[:20]
-        else:
-            # Estrategia original con filas
-            for row in rows:
-                # Buscar enlaces de título
-                title_links = row.find_all('a')
-                for title_link in title_links:
-                    href = title_link.get('href', '')
-                    text = title_link.text.strip()
-
-                    if text and len(text) > 5:
-                        # Hacer enlace absoluto si es relativo
-                        if href.startswith('/'):
-                            href = 'https://news.ycombinator.com' + href
-                        elif not href.startswith('http'):
-                            href = 'https://news.ycombinator.com/' + href
-
-                        # Buscar score y comentarios
-                        score = 'N/A'
-                        comments = 'N/A'
-
-                        try:
-                            next_row = row.find_next_sibling('tr')
-                            if next_row:
-                                score_span = next_row.find('span', class_='score')
-                                if score_span:
-                                    score = score_span.text
-
-                                comments_link = next_row.find('a', href=lambda x: x and 'item?id=' in x)
-                                if comments_link:
-                                    comments = comments_link.text
-                        except:
-                            pass
-
-                        news_items.append({
-                            'title': text,
-                            'link': href,
-                            'score': score,
-                            'comments': comments,
-                            'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                        break  # Solo tomar el primer enlace de cada fila
-
-        return news_items
+        return parse_hn_news(response.text, base_url=url)
 
     except requests.RequestException as e:
         print(f"Error al hacer la petición: {e}")
         return []
 
-# Ejecutar la función
-print("🔄 Extrayendo noticias...")
-news = scrape_hn_news()
-print(f"✅ Extraídas {len(news)} noticias")
-
-# Mostrar las primeras 5 noticias
-if news:
-    print("\n📰 Primeras 5 noticias:")
-    for i, item in enumerate(news[:5], 1):
-        print(f"{i}. {item['title']}")
-        print(f"   Enlace: {item['link']}")
-        print(f"   Puntos: {item['score']}")
-        print(f"   Comentarios: {item['comments']}")
-        print()
-else:
-    print("❌ No se pudieron extraer noticias")
+def parse_hn_news(html, fallback_limit=20, scraped_at=None, base_url=HN_URL):
+    """Extrae las noticias del HTML de una portada en una sola pasada
+
+    Devuelve registros tipados (ver hn_listing.extract_listing) con la misma marca
+    de tiempo para toda la página, o la que se pase (p. ej. la del crawl).
+    fallback_limit limita los enlaces de la estrategia alternativa (0 la desactiva).
+    Los enlaces relativos (item?id=, from?site=...) se resuelven contra base_url.
+    """
+    scraped_at = scraped_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    # Estrategia 1: recorrer las parejas fila de noticia / subtexto
+    news_items = extract_listing(html, scraped_at, base_url)
+    print(f"Encontradas {len(news_items)} filas de noticias")
+
+    if not news_items and fallback_limit:
+        # Estrategia 2: Buscar enlaces de noticias directamente
+        print("🔄 Intentando estrategia alternativa...")
+        from bs4 import BeautifulSoup
+
+        for link in BeautifulSoup(html, 'html.parser').find_all('a'):
+            href = link.get('href', '')
+            text = link.text.strip()
+
+            # Filtrar enlaces que parecen ser noticias
+            if (href and text and
+                len(text) > 10 and
+                not href.startswith('#') and
+                not href.startswith('javascript:') and
+                'item?id=' not in href and
+                'user?id=' not in href and
+                'show' not in href):
+
+                link_url = urljoin(base_url, href)
+                news_items.append({
+                    'item_id': None,
+                    'title': text,
+                    'link': link_url,
+                    'domain': urlparse(link_url).netloc or None,
+                    'score': None,
+                    'comments': None,
+                    'scraped_at': scraped_at,
+                })
+                if len(news_items) == fallback_limit:
+                    break
+
+    return news_items
+
+def crawl_hn_news(pages=3, fetch_threads=False, base_url="https://news.ycombinator.com/", concurrency=8,
+                  requests_per_second=None):
+    """Recorre las portadas news?p=1..pages y, opcionalmente, el hilo de cada noticia
+
+    Las descargas van en paralelo sobre un pool de conexiones compartido. Con
+    fetch_threads=True cada noticia gana 'comment_count' (int) y 'top_comments'
+    (lista de {'comment_id', 'author', 'text'} de primer nivel).
+    """
+    return asyncio.run(crawl_hn_news_async(pages, fetch_threads, base_url, concurrency, requests_per_second))
+
+async def crawl_hn_news_async(pages=3, fetch_threads=False, base_url="https://news.ycombinator.com/",
+                              concurrency=8, requests_per_second=None):
+    """Versión asíncrona de crawl_hn_news"""
+    page_urls = [urljoin(base_url, f"news?p={page}") for page in range(1, pages + 1)]
+    # Una sola marca de tiempo para todo el recorrido
+    scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"🚀 Recorriendo {pages} portadas (concurrencia={concurrency})...")
+
+    with create_session(headers, pool_size=concurrency, cache=http_cache) as crawl_session:
+        async with AsyncFetcher(crawl_session, concurrency, requests_per_second, pacer=pacer) as fetcher:
+            listings = await fetcher.fetch_all(
+                page_urls, parse=lambda response: parse_hn_news(response_text(response), fallback_limit=0,
+                                                     scraped_at=scraped_at, base_url=base_url)
+            )
+
+            # Las portadas se desplazan mientras se recorren: una noticia puede salir dos veces
+            news_items = []
+            seen = set()
+            for page, items in enumerate(listings, start=1):
+                if not items:
+                    print(f"⏹️ La portada {page} no tiene noticias: fin del recorrido")
+                    break
+                for item in items:
+                    if item['item_id'] not in seen:
+                        seen.add(item['item_id'])
+                        news_items.append(item)
+
+            if fetch_threads and news_items:
+                print(f"💬 Descargando {len(news_items)} hilos de comentarios...")
+                threads = await fetcher.fetch_all(
+                    [urljoin(base_url, f"item?id={item['item_id']}") for item in news_items],
+                    parse=lambda response: parse_item_thread(response_text(response)),
+                )
+                for item, thread in zip(news_items, threads):
+                    item.update(thread or {'comment_count': None, 'top_comments': []})
+
+    print(f"✅ {len(news_items)} noticias recorridas")
+    return news_items
+
+def monitor_hn(interval=300, pages=1, db_path='hn_monitor.sqlite', max_polls=None, min_gain=100,
+               base_url="https://news.ycombinator.com/"):
+    """Sondea las portadas cada `interval` segundos y guarda la evolución en SQLite
+
+    Cada sondeo actualiza una fila por noticia (deduplicada por item_id) y añade
+    un snapshot de puntos y comentarios, todo en una transacción. Tras cada
+    sondeo muestra un resumen incremental (NewsAggregator) y las noticias que
+    ganaron más de `min_gain` puntos en la última hora. max_polls=None sigue
+    hasta Ctrl+C.
+    """
+    polls = 0
+    # Resumen en memoria actualizado noticia a noticia (sin volver a leer la base)
+    aggregator = NewsAggregator(top_k=5)
+    with NewsStore(db_path) as store:
+        try:
+            while max_polls is None or polls < max_polls:
+                started = time.monotonic()
+                news = crawl_hn_news(pages=pages, base_url=base_url)
+                new_stories = store.record_poll(news)
+                polls += 1
+                print(f"🗄️ Sondeo {polls}: {len(news)} noticias ({new_stories} nuevas) guardadas en {db_path}")
+                aggregator.update_many(news)
+                summary = aggregator.snapshot()
+                last_hour = summary['rates'][3600]
+                print(f"  📊 {summary['total']} noticias vistas, {last_hour['new_stories']} nuevas y "
+                      f"+{last_hour['points_gained']} puntos en la última hora")
+
+                for story in store.score_gainers(min_gain, timedelta(hours=1))[:5]:
+                    print(f"  📈 +{story['gain']} puntos en la última hora: {story['title']}")
+
+                if max_polls is None or polls < max_polls:
+                    time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            print("⏹️ Monitor detenido")
+    return polls
 
 def save_to_csv(news_data, filename='hacker_news.csv'):
     """Guarda los datos en un archivo CSV"""
@@ -209,12 +197,14 @@ def save_to_csv(news_data, filename='hacker_news.csv'):
 
     with open(filename, 'w', newline='', encoding='utf-8') as file:
         writer = csv.writer(file)
-        writer.writerow(['Título', 'Enlace', 'Puntos', 'Comentarios', 'Fecha'])
+        writer.writerow(['ID', 'Título', 'Enlace', 'Dominio', 'Puntos', 'Comentarios', 'Fecha'])
 
         for item in news_data:
             writer.writerow([
+                item['item_id'],
                 item['title'],
                 item['link'],
+                item['domain'],
                 item['score'],
                 item['comments'],
                 item['scraped_at']
@@ -222,113 +212,235 @@ def save_to_csv(news_data, filename='hacker_news.csv'):
 
     print(f"✅ Datos guardados en {filename}")
 
-# Guardar los datos
-if news:
-    save_to_csv(news)
-else:
-    print("❌ No hay datos para guardar")
+def analyze_news_data(news_data, aggregator=None):
+    """Analiza los datos extraídos
 
-def analyze_news_data(news_data):
-    """Analiza los datos extraídos"""
-    if not news_data:
+    Los acumulados salen de un NewsAggregator: si se pasa uno (p. ej. el del
+    monitor) se incorporan solo estas noticias, sin recalcular todo desde cero.
+    Devuelve el resumen (dict de NewsAggregator.snapshot).
+    """
+    if not news_data and not aggregator:
         print("❌ No hay datos para analizar")
         return
 
-    print("=== ANÁLISIS DE DATOS ===")
-    print(f"Total de noticias: {len(news_data)}")
+    aggregator = aggregator if aggregator is not None else NewsAggregator()
+    aggregator.update_many(news_data or [])
+    summary = aggregator.snapshot()
 
-    # Crear DataFrame para análisis
-    df = pd.DataFrame(news_data)
+    print("=== ANÁLISIS DE DATOS ===")
+    print(f"Total de noticias: {summary['total']}")
 
     # Análisis de títulos
     print(f"\n📊 Estadísticas de títulos:")
-    print(f"Título más largo: {df['title'].str.len().max()} caracteres")
-    print(f"Título más corto: {df['title'].str.len().min()} caracteres")
-    print(f"Longitud promedio: {df['title'].str.len().mean():.1f} caracteres")
+    print(f"Título más largo: {summary['title_length_max']} caracteres")
+    print(f"Título más corto: {summary['title_length_min']} caracteres")
+    print(f"Longitud promedio: {summary['title_length_mean']:.1f} caracteres")
 
     # Análisis de enlaces
     print(f"\n🔗 Análisis de enlaces:")
-    external_links = df[~df['link'].str.contains('news.ycombinator.com', na=False)]
-    print(f"Enlaces externos: {len(external_links)}")
-    print(f"Enlaces internos: {len(df) - len(external_links)}")
+    print(f"Enlaces externos: {summary['external_links']}")
+    print(f"Enlaces internos: {summary['internal_links']}")
 
     # Análisis de scores (si están disponibles)
-    scores_available = df[df['score'] != 'N/A']
-    if len(scores_available) > 0:
+    if summary['scored'] > 0:
         print(f"\n⭐ Análisis de puntuaciones:")
-        print(f"Noticias con puntuación: {len(scores_available)}")
-
-        # Extraer números de los scores
-        score_numbers = []
-        for score in scores_available['score']:
-            numbers = re.findall(r'\d+', score)
-            if numbers:
-                score_numbers.append(int(numbers[0]))
-
-        if score_numbers:
-            print(f"Puntuación máxima: {max(score_numbers)}")
-            print(f"Puntuación mínima: {min(score_numbers)}")
-            print(f"Puntuación promedio: {sum(score_numbers)/len(score_numbers):.1f}")
+        print(f"Noticias con puntuación: {summary['scored']}")
+        print(f"Puntuación máxima: {summary['score_max']}")
+        print(f"Puntuación mínima: {summary['score_min']}")
+        print(f"Puntuación promedio: {summary['score_mean']:.1f}")
 
-    return df
-
-# Ejecutar análisis
-if news:
-    df_news = analyze_news_data(news)
-else:
-    print("❌ No hay datos para analizar")
+    return summary
 
 def filter_news_by_keyword(news_data, keywords):
-    """Filtra noticias por palabras clave"""
+    """Filtra noticias por palabras clave (palabra completa, sin distinguir mayúsculas)
+
+    keywords puede ser una lista o un KeywordMatcher ya construido (recomendable
+    para listas grandes que se reutilizan). Cada noticia devuelta es una copia
+    con 'keyword_hits': las palabras clave que aparecen en su título.
+    """
     if not news_data:
         return []
 
-    filtered = []
-    keywords_lower = [kw.lower() for kw in keywords]
-
-    for item in news_data:
-        title_lower = item['title'].lower()
-        if any(keyword in title_lower for keyword in keywords_lower):
-            filtered.append(item)
-
-    return filtered
+    matcher = keywords if isinstance(keywords, KeywordMatcher) else KeywordMatcher(keywords)
+    return [dict(item, keyword_hits=hits) for item, hits in matcher.scan(news_data)]
 
 def filter_news_by_score(news_data, min_score=0):
     """Filtra noticias por puntuación mínima"""
     if not news_data:
         return []
 
-    filtered = []
-    for item in news_data:
-        score_text = item['score']
-        if score_text != 'N/A':
-            numbers = re.findall(r'\d+', score_text)
-            if numbers and int(numbers[0]) >= min_score:
-                filtered.append(item)
+    return [item for item in news_data if item['score'] is not None and item['score'] >= min_score]
+
+def run_demo():
+    """Demo completa: explorar, scrapear, guardar, analizar y filtrar"""
+    from bs4 import BeautifulSoup
+
+    print("✅ Librerías importadas correctamente")
+
+    # Hacer la petición (la única descarga de la portada: la exploración y la
+    # extracción trabajan sobre el mismo HTML)
+    response = session.get(url, headers=headers, timeout=30)
+    print(f"Status Code: {response.status_code}")
+    print(f"Content Length: {len(response.text)}")
+
+    # Verificar que la petición fue exitosa
+    if response.status_code == 200:
+        print("✅ Petición exitosa")
+    else:
+        print("❌ Error en la petición")
+
+    # Parsear el HTML
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    # Primero, vamos a explorar la estructura del HTML
+    print("🔍 Explorando la estructura del HTML...")
+
+    # Buscar diferentes tipos de enlaces
+    story_links = soup.find_all('a', class_='titlelink')
+    story_links_alt = soup.find_all('a', class_='storylink')
+    all_links = soup.find_all('a')
+
+    print(f"Enlaces con clase 'titlelink': {len(story_links)}")
+    print(f"Enlaces con clase 'storylink': {len(story_links_alt)}")
+    print(f"Total de enlaces: {len(all_links)}")
+
+    # Buscar enlaces que contengan noticias (más flexible)
+    news_links = []
+    for link in all_links:
+        href = link.get('href', '')
+        text = link.text.strip()
+
+        # Filtrar enlaces que parecen ser noticias
+        if (href and text and
+            not href.startswith('#') and
+            not href.startswith('javascript:') and
+            len(text) > 10 and
+            'item?id=' not in href):
+            news_links.append(link)
+
+    print(f"Enlaces potenciales de noticias: {len(news_links)}")
+
+    # Mostrar los primeros enlaces encontrados
+    if news_links:
+        print(f"\n📰 Primeros 3 enlaces encontrados:")
+        for i, link in enumerate(news_links[:3], 1):
+            print(f"{i}. {link.text[:50]}...")
+            print(f"   URL: {link.get('href')}")
+            print()
+    else:
+        print("❌ No se encontraron enlaces de noticias")
+
+        # Vamos a ver qué clases existen
+        print("\n🔍 Clases de enlaces disponibles:")
+        link_classes = set()
+        for link in all_links[:20]:  # Solo los primeros 20
+            class_name = link.get('class')
+            if class_name:
+                link_classes.add(' '.join(class_name))
+
+        for cls in sorted(link_classes):
+            print(f"  - {cls}")
+
+    # Ejecutar la función
+    print("🔄 Extrayendo noticias...")
+    news = parse_hn_news(response.text) if response.status_code == 200 else []
+    print(f"✅ Extraídas {len(news)} noticias")
+
+    # Mostrar las primeras 5 noticias
+    if news:
+        print("\n📰 Primeras 5 noticias:")
+        for i, item in enumerate(news[:5], 1):
+            print(f"{i}. {item['title']}")
+            print(f"   Enlace: {item['link']}")
+            print(f"   Puntos: {item['score']}")
+            print(f"   Comentarios: {item['comments']}")
+            print()
+    else:
+        print("❌ No se pudieron extraer noticias")
+
+    # Guardar los datos
+    if news:
+        save_to_csv(news)
+
+        # Historial: cada ejecución añade un snapshot (el CSV solo guarda la última)
+        # Para sondear de forma continua: python main.py monitor --interval 300
+        with NewsStore('hn_monitor.sqlite') as store:
+            new_stories = store.record_poll(news)
+        print(f"🗄️ Snapshot guardado en hn_monitor.sqlite ({new_stories} noticias nuevas)")
+    else:
+        print("❌ No hay datos para guardar")
 
-    return filtered
+    # Ejecutar análisis
+    if news:
+        analyze_news_data(news)
+    else:
+        print("❌ No hay datos para analizar")
 
-# Ejemplos de filtrado
-if news:
-    print("🔍 EJEMPLOS DE FILTRADO")
+    # Ejemplos de filtrado
+    if news:
+        print("🔍 EJEMPLOS DE FILTRADO")
+        print("=" * 30)
+
+        # Filtrar por palabras clave
+        python_news = filter_news_by_keyword(news, ['python', 'programming', 'code'])
+        print(f"Noticias sobre programación: {len(python_news)}")
+
+        ai_news = filter_news_by_keyword(news, ['AI', 'artificial intelligence', 'machine learning'])
+        print(f"Noticias sobre IA: {len(ai_news)}")
+
+        # Mostrar noticias filtradas
+        if python_news:
+            print(f"\n🐍 Noticias sobre programación:")
+            for i, item in enumerate(python_news[:3], 1):
+                print(f"{i}. {item['title']} [{', '.join(item['keyword_hits'])}]")
+
+        if ai_news:
+            print(f"\n🤖 Noticias sobre IA:")
+            for i, item in enumerate(ai_news[:3], 1):
+                print(f"{i}. {item['title']} [{', '.join(item['keyword_hits'])}]")
+    else:
+        print("❌ No hay datos para filtrar")
+
+    # Recorrido de varias portadas con sus hilos de comentarios
+    print("\n🕸️ CRAWL DE VARIAS PORTADAS")
     print("=" * 30)
-
-    # Filtrar por palabras clave
-    python_news = filter_news_by_keyword(news, ['python', 'programming', 'code'])
-    print(f"Noticias sobre programación: {len(python_news)}")
-
-    ai_news = filter_news_by_keyword(news, ['AI', 'artificial intelligence', 'machine learning'])
-    print(f"Noticias sobre IA: {len(ai_news)}")
-
-    # Mostrar noticias filtradas
-    if python_news:
-        print(f"\n🐍 Noticias sobre programación:")
-        for i, item in enumerate(python_news[:3], 1):
-            print(f"{i}. {item['title']}")
-
-    if ai_news:
-        print(f"\n🤖 Noticias sobre IA:")
-        for i, item in enumerate(ai_news[:3], 1):
-            print(f"{i}. {item['title']}")
-else:
-    print("❌ No hay datos para filtrar")
\ No newline at end of file
+    stories = crawl_hn_news(pages=3, fetch_threads=True)
+    for item in stories[:3]:
+        print(f"- {item['title']} ({item['comment_count']} comentarios)")
+        for comment in item['top_comments'][:2]:
+            print(f"    💬 {comment['author']}: {comment['text'][:80]}")
+
+def parse_args(argv=None):
+    """Argumentos de la línea de comandos (sin subcomando: la demo completa)"""
+    parser = argparse.ArgumentParser(description='Scraper de Hacker News')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('demo', help='explorar, scrapear, guardar, analizar y filtrar (por defecto)')
+
+    crawl = subparsers.add_parser('crawl', help='recorrer varias portadas y guardarlas en CSV')
+    crawl.add_argument('--pages', type=int, default=3)
+    crawl.add_argument('--threads', action='store_true', help='descargar también los hilos de comentarios')
+    crawl.add_argument('--concurrency', type=int, default=8)
+    crawl.add_argument('--output', default='hacker_news.csv')
+
+    monitor = subparsers.add_parser('monitor', help='sondear las portadas y guardar su evolución en SQLite')
+    monitor.add_argument('--interval', type=int, default=300, help='segundos entre sondeos')
+    monitor.add_argument('--pages', type=int, default=1)
+    monitor.add_argument('--db', default='hn_monitor.sqlite')
+    monitor.add_argument('--polls', type=int, default=None, help='número de sondeos (por defecto, hasta Ctrl+C)')
+    monitor.add_argument('--min-gain', type=int, default=100)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'crawl':
+        news = crawl_hn_news(pages=args.pages, fetch_threads=args.threads, concurrency=args.concurrency)
+        save_to_csv(news, args.output)
+        analyze_news_data(news)
+    elif args.command == 'monitor':
+        monitor_hn(interval=args.interval, pages=args.pages, db_path=args.db, max_polls=args.polls,
+                   min_gain=args.min_gain)
+    else:
+        run_demo()
+
+if __name__ == "__main__":
+    main()
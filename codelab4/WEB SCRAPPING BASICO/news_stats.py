@@ -0,0 +1,192 @@
+# Estadísticas incrementales de noticias para el modo monitor
+# Cada noticia nueva o modificada actualiza los acumulados en O(1) (amortizado):
+# - sumas y conteos para las medias de longitud de título y de puntuación
+# - montículos con borrado perezoso para extremos y top-k por puntuación
+# - contadores por dominio y enlaces internos/externos
+# - ventanas deslizantes (noticias nuevas y puntos ganados por ventana)
+# snapshot() devuelve el mismo resumen que imprime analyze_news_data.
+import heapq
+import time
+from collections import Counter, deque
+
+INTERNAL_HOST = 'news.ycombinator.com'
+
+
+class _LazyHeap:
+    """Montículo de (valor, clave) que descarta las entradas obsoletas al consultarlo
+
+    Las claves mezclan item_id (int) y enlaces (str, noticias sin id): en los empates
+    se ordenan primero por tipo, así nunca se compara un int con un str.
+    """
+
+    def __init__(self, largest=False):
+        self._sign = -1 if largest else 1
+        self._heap = []
+
+    def _entry(self, value, key):
+        return self._sign * value, isinstance(key, str), key
+
+    def push(self, value, key):
+        heapq.heappush(self._heap, self._entry(value, key))
+
+    def top(self, current, k=1):
+        """Los k primeros (valor, clave) vigentes según `current` (clave -> valor actual)"""
+        found = []
+        seen = set()
+        while self._heap and len(found) < k:
+            signed, _, key = heapq.heappop(self._heap)
+            value = self._sign * signed
+            if key not in seen and current.get(key) == value:
+                seen.add(key)
+                found.append((value, key))
+        for value, key in found:
+            self.push(value, key)
+        return found
+
+    def compact(self, current):
+        """Reconstruye el montículo si las entradas obsoletas superan a las vigentes"""
+        if len(self._heap) > 2 * len(current) + 64:
+            self._heap = [self._entry(value, key) for key, value in current.items()]
+            heapq.heapify(self._heap)
+
+
+class _Window:
+    """Suma de eventos (noticias nuevas, puntos ganados) en los últimos `seconds` segundos"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.events = deque()
+        self.new_stories = 0
+        self.points = 0
+
+    def add(self, now, new_story, points):
+        self.events.append((now, new_story, points))
+        self.new_stories += new_story
+        self.points += points
+
+    def expire(self, now):
+        while self.events and self.events[0][0] <= now - self.seconds:
+            _, new_story, points = self.events.popleft()
+            self.new_stories -= new_story
+            self.points -= points
+
+
+class NewsAggregator:
+    """Resumen de noticias actualizado registro a registro (nuevos o modificados por item_id)"""
+
+    def __init__(self, top_k=10, windows=(300, 3600)):
+        self.top_k = top_k
+        self._items = {}
+        self._title_lengths = {}
+        self._scores = {}
+
+        self.title_length_total = 0
+        self.score_total = 0
+        self.external = 0
+        self.domains = Counter()
+
+        self._longest = _LazyHeap(largest=True)
+        self._shortest = _LazyHeap()
+        self._highest = _LazyHeap(largest=True)
+        self._lowest = _LazyHeap()
+        self._windows = [_Window(seconds) for seconds in windows]
+
+    def __len__(self):
+        return len(self._items)
+
+    def _key(self, item):
+        # Los registros sin item_id (estrategia alternativa) se identifican por su enlace
+        return item['item_id'] if item.get('item_id') is not None else item['link']
+
+    def _remove(self, key, item):
+        self.title_length_total -= self._title_lengths.pop(key)
+        score = self._scores.pop(key, None)
+        if score is not None:
+            self.score_total -= score
+        self.external -= INTERNAL_HOST not in item['link']
+        if item.get('domain'):
+            self.domains[item['domain']] -= 1
+            if not self.domains[item['domain']]:
+                del self.domains[item['domain']]
+
+    def update(self, item, now=None):
+        """Incorpora una noticia nueva o el nuevo estado de una ya vista"""
+        now = time.monotonic() if now is None else now
+        key = self._key(item)
+        previous = self._items.get(key)
+        if previous is not None:
+            self._remove(key, previous)
+        self._items[key] = item
+
+        length = len(item['title'])
+        self._title_lengths[key] = length
+        self.title_length_total += length
+        self._longest.push(length, key)
+        self._shortest.push(length, key)
+
+        score = item.get('score')
+        if score is not None:
+            self._scores[key] = score
+            self.score_total += score
+            self._highest.push(score, key)
+            self._lowest.push(score, key)
+
+        self.external += INTERNAL_HOST not in item['link']
+        if item.get('domain'):
+            self.domains[item['domain']] += 1
+
+        # Puntos ganados desde la última vez que se vio (0 si es nueva)
+        previous_score = previous.get('score') if previous is not None else None
+        gained = max(0, (score or 0) - (previous_score or 0)) if previous is not None else 0
+        for window in self._windows:
+            window.add(now, previous is None, gained)
+            window.expire(now)
+
+        for heap, current in ((self._longest, self._title_lengths), (self._shortest, self._title_lengths),
+                              (self._highest, self._scores), (self._lowest, self._scores)):
+            heap.compact(current)
+
+    def update_many(self, items, now=None):
+        for item in items:
+            self.update(item, now)
+
+    def top_stories(self, k=None):
+        """Las k noticias con más puntos (de mayor a menor)"""
+        return [self._items[key] for _, key in self._highest.top(self._scores, k or self.top_k)]
+
+    def rates(self, now=None):
+        """Noticias nuevas y puntos ganados en cada ventana deslizante"""
+        now = time.monotonic() if now is None else now
+        rates = {}
+        for window in self._windows:
+            window.expire(now)
+            rates[window.seconds] = {'new_stories': window.new_stories, 'points_gained': window.points}
+        return rates
+
+    def snapshot(self, now=None):
+        """Resumen actual: los mismos datos que imprime analyze_news_data, y algo más"""
+        total = len(self._items)
+        summary = {
+            'total': total,
+            'title_length_max': None,
+            'title_length_min': None,
+            'title_length_mean': None,
+            'external_links': self.external,
+            'internal_links': total - self.external,
+            'scored': len(self._scores),
+            'score_max': None,
+            'score_min': None,
+            'score_mean': None,
+            'top_stories': self.top_stories(),
+            'domains': self.domains.most_common(self.top_k),
+            'rates': self.rates(now),
+        }
+        if total:
+            summary['title_length_max'] = self._longest.top(self._title_lengths)[0][0]
+            summary['title_length_min'] = self._shortest.top(self._title_lengths)[0][0]
+            summary['title_length_mean'] = self.title_length_total / total
+        if self._scores:
+            summary['score_max'] = self._highest.top(self._scores)[0][0]
+            summary['score_min'] = self._lowest.top(self._scores)[0][0]
+            summary['score_mean'] = self.score_total / len(self._scores)
+        return summary
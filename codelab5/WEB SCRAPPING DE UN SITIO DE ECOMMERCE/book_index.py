@@ -0,0 +1,97 @@
+# Índice de búsqueda sobre un snapshot del catálogo (DataFrame de libros)
+# Se construye una vez y responde muchas búsquedas:
+# - Índice invertido de tokens del título -> posiciones de fila
+# - Precios ordenados para consultas por rango (búsqueda binaria)
+# - Un bitset por rating mínimo ("al menos N estrellas")
+# Cada consulta cuesta del orden del tamaño del resultado, no del catálogo.
+from collections import defaultdict
+
+import numpy as np
+
+RATING_ORDER = ['One', 'Two', 'Three', 'Four', 'Five']
+
+
+class BookIndex:
+    """Índice invertido de títulos, rango de precios y bitsets de rating"""
+
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+
+        # Tokens en minúsculas separados por espacios, como los keywords de búsqueda
+        postings = defaultdict(list)
+        for position, title in enumerate(df['title'].fillna('').str.lower()):
+            for token in set(title.split()):
+                postings[token].append(position)
+        self._postings = {token: np.array(positions, dtype=np.int64) for token, positions in postings.items()}
+        self._keyword_cache = {}
+
+        # Precios ordenados (los NaN quedan fuera, igual que en las comparaciones de pandas).
+        # Se conserva su tipo (float32 tras normalize_books): los límites de cada consulta
+        # se convierten a ese tipo, igual que en df['price_numeric'] <= max_price
+        prices = df['price_numeric'].to_numpy()
+        if prices.dtype.kind != 'f':
+            prices = prices.astype(float)
+        valid = np.flatnonzero(~np.isnan(prices))
+        order = np.argsort(prices[valid], kind='stable')
+        self._price_positions = valid[order]
+        self._sorted_prices = prices[self._price_positions]
+
+        # _at_least[i]: bitset (empaquetado) de las filas con al menos i+1 estrellas
+        if 'rating_numeric' in df:
+            stars = df['rating_numeric'].to_numpy()
+        else:
+            stars = df['rating'].map({rating: i + 1 for i, rating in enumerate(RATING_ORDER)}).fillna(0).to_numpy()
+        self._at_least = [
+            np.packbits(stars >= i + 1, bitorder='little') for i in range(len(RATING_ORDER))
+        ]
+
+    def keyword_positions(self, keyword):
+        """Filas cuyo título contiene `keyword` (sin espacios) dentro de algún token"""
+        if keyword not in self._keyword_cache:
+            # Un keyword sin espacios solo puede aparecer dentro de un token:
+            # se recorre el vocabulario (no el catálogo) y se cachea el resultado
+            matches = [positions for token, positions in self._postings.items() if keyword in token]
+            self._keyword_cache[keyword] = (
+                np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+            )
+        return self._keyword_cache[keyword]
+
+    def price_positions(self, min_price=None, max_price=None):
+        """Filas con min_price <= precio <= max_price (ordenadas)"""
+        as_price = self._sorted_prices.dtype.type
+        lo = 0 if min_price is None else np.searchsorted(self._sorted_prices, as_price(min_price), side='left')
+        hi = (len(self._sorted_prices) if max_price is None
+              else np.searchsorted(self._sorted_prices, as_price(max_price), side='right'))
+        return np.sort(self._price_positions[lo:hi])
+
+    def rating_bitset(self, min_rating):
+        return self._at_least[RATING_ORDER.index(min_rating)]
+
+    def search(self, criteria):
+        """Posiciones (ordenadas) de las filas que cumplen todos los criterios"""
+        positions = None
+
+        keywords = criteria.get('title_keywords', '').lower().split()
+        if keywords:
+            positions = np.unique(np.concatenate([self.keyword_positions(kw) for kw in keywords]))
+
+        if 'min_price' in criteria or 'max_price' in criteria:
+            in_range = self.price_positions(criteria.get('min_price'), criteria.get('max_price'))
+            positions = in_range if positions is None else np.intersect1d(positions, in_range, assume_unique=True)
+
+        if 'min_rating' in criteria:
+            bits = self.rating_bitset(criteria['min_rating'])
+            if positions is None:
+                positions = np.flatnonzero(np.unpackbits(bits, count=self.size, bitorder='little'))
+            else:
+                # Consultar el bit de cada candidata: coste proporcional al resultado
+                positions = positions[((bits[positions >> 3] >> (positions & 7)) & 1).astype(bool)]
+
+        if positions is None:
+            return np.arange(self.size)
+        return positions
+
+    def query(self, criteria):
+        """Filas del DataFrame que cumplen los criterios, en el orden original"""
+        return self.df.iloc[self.search(criteria)]
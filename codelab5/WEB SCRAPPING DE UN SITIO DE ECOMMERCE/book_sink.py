@@ -0,0 +1,127 @@
+# Exportación en streaming de los libros scrapeados
+# - Cada página se añade a CSV y JSONL en cuanto llega (sin DataFrame en memoria)
+# - Los ficheros se vuelcan a disco cada `batch_size` registros
+# - El resumen (conteo, precios, histograma de ratings) se calcula de forma incremental
+import csv
+import json
+import re
+from collections import Counter
+
+from detail_pipeline import DETAIL_FIELDS
+
+FIELDS = ['title', 'price', 'rating', 'availability', 'product_url', 'scraped_at', 'page', 'price_numeric']
+
+NON_PRICE_CHARS = re.compile(r'[^\d.]')
+
+
+def price_to_float(price_str):
+    """Convierte '£51.77' en 51.77 (0.0 si no hay precio válido)"""
+    if price_str == 'N/A':
+        return 0.0
+    try:
+        return float(NON_PRICE_CHARS.sub('', price_str))
+    except ValueError:
+        return 0.0
+
+
+class RunningSummary:
+    """Estadísticas de precio y rating actualizadas libro a libro"""
+
+    def __init__(self):
+        self.count = 0
+        self.priced = 0
+        self.price_total = 0.0
+        self.price_min = None
+        self.price_max = None
+        self.ratings = Counter()
+
+    def add(self, book):
+        self.count += 1
+        self.ratings[book['rating']] += 1
+
+        price = book['price_numeric']
+        if price > 0:
+            self.priced += 1
+            self.price_total += price
+            self.price_min = price if self.price_min is None else min(self.price_min, price)
+            self.price_max = price if self.price_max is None else max(self.price_max, price)
+
+    def write(self, f):
+        """Escribe el resumen con el mismo formato que save_books_data"""
+        f.write("=== RESUMEN DE DATOS ===\n")
+        f.write(f"Total de libros: {self.count}\n")
+
+        if self.priced:
+            f.write(f"Precio promedio: £{self.price_total / self.priced:.2f}\n")
+            f.write(f"Precio mínimo: £{self.price_min:.2f}\n")
+            f.write(f"Precio máximo: £{self.price_max:.2f}\n")
+
+        f.write("\nDistribución por rating:\n")
+        f.write("rating")
+        # Columnas como value_counts().to_string(): rating a la izquierda, conteo a la derecha
+        width = max((len(rating) for rating in self.ratings), default=0)
+        count_width = max((len(str(count)) for count in self.ratings.values()), default=0)
+        for rating, count in self.ratings.most_common():
+            f.write(f"\n{rating:<{width}}    {count:>{count_width}}")
+
+
+class BookSink:
+    """Destino de registros: CSV + JSONL en streaming y resumen al cerrar
+
+    Con details=True el CSV incluye también las columnas de la página de detalle
+    (DETAIL_FIELDS: upc, stock_count, description, category).
+    """
+
+    def __init__(self, base_filename='books_data', batch_size=500, details=False):
+        self.base_filename = base_filename
+        self.batch_size = batch_size
+        self.fields = FIELDS + list(DETAIL_FIELDS) if details else FIELDS
+        self.summary = RunningSummary()
+        self._pending = 0
+        self._csv_file = None
+        self._jsonl_file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        self._csv_file = open(f"{self.base_filename}.csv", 'w', newline='', encoding='utf-8')
+        self._jsonl_file = open(f"{self.base_filename}.jsonl", 'w', encoding='utf-8')
+        self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=self.fields, extrasaction='ignore')
+        self._csv_writer.writeheader()
+
+    def write_page(self, books):
+        """Añade los libros de una página a los ficheros y al resumen"""
+        for book in books:
+            record = dict(book, price_numeric=price_to_float(book['price']))
+            self._csv_writer.writerow(record)
+            self._jsonl_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.summary.add(record)
+
+        self._pending += len(books)
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self._csv_file.flush()
+        self._jsonl_file.flush()
+        self._pending = 0
+
+    def close(self):
+        """Cierra los ficheros y escribe el resumen final"""
+        if self._csv_file is None:
+            return
+        self._csv_file.close()
+        self._jsonl_file.close()
+        self._csv_file = self._jsonl_file = None
+
+        summary_filename = f"{self.base_filename}_summary.txt"
+        with open(summary_filename, 'w', encoding='utf-8') as f:
+            self.summary.write(f)
+
+        print(f"✅ {self.summary.count} libros guardados en {self.base_filename}.csv / .jsonl")
+        print(f"✅ Resumen guardado en: {summary_filename}")
@@ -0,0 +1,180 @@
+# Estado persistente del crawl en SQLite
+# - Checkpoint por página: un crawl interrumpido se reanuda donde se quedó; los
+#   libros de cada página completada se guardan por ejecución (run_products) para
+#   reconstruir esas páginas tal como se vieron en ella
+# - Productos indexados por product_url: solo se reescriben si cambian
+#   precio, rating o disponibilidad
+# - Registro de cambios (altas y modificaciones) por ejecución
+import sqlite3
+from datetime import datetime
+
+TRACKED_FIELDS = ('price', 'rating', 'availability')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    page INTEGER NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, page)
+);
+CREATE TABLE IF NOT EXISTS run_products (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    page INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    product_url TEXT NOT NULL,
+    scraped_at TEXT,
+    PRIMARY KEY (run_id, page, position)
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_url TEXT PRIMARY KEY,
+    title TEXT,
+    price TEXT,
+    rating TEXT,
+    availability TEXT,
+    page INTEGER,
+    scraped_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_products_page ON products(page);
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    product_url TEXT NOT NULL,
+    field TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_run ON changes(run_id);
+"""
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class CrawlState:
+    """Checkpoints de páginas y catálogo de productos con detección de cambios"""
+
+    def __init__(self, path='books_state.sqlite'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_run(self):
+        """Reanuda la última ejecución sin terminar o abre una nueva
+
+        Devuelve (run_id, páginas ya completadas en esa ejecución).
+        """
+        row = self.conn.execute(
+            "SELECT id FROM runs WHERE finished_at IS NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row:
+            run_id = row['id']
+        else:
+            with self.conn:
+                run_id = self.conn.execute("INSERT INTO runs (started_at) VALUES (?)", (_now(),)).lastrowid
+
+        done = {r['page'] for r in self.conn.execute("SELECT page FROM pages WHERE run_id = ?", (run_id,))}
+        return run_id, done
+
+    def finish_run(self, run_id):
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (_now(), run_id))
+            # La composición de las páginas solo hace falta para reanudar una ejecución abierta
+            self.conn.execute("DELETE FROM run_products WHERE run_id = ?", (run_id,))
+
+    def record_page(self, run_id, page, books):
+        """Guarda los libros de una página y la marca como completada
+
+        Solo reescribe los productos nuevos o con cambios en TRACKED_FIELDS, pero
+        siempre guarda qué libros (y en qué orden) tenía la página en esta ejecución.
+        Devuelve la lista de cambios registrados.
+        """
+        urls = [book['product_url'] for book in books]
+        placeholders = ','.join('?' * len(urls))
+        stored = {
+            row['product_url']: row
+            for row in self.conn.execute(f"SELECT * FROM products WHERE product_url IN ({placeholders})", urls)
+        }
+
+        changes = []
+        upserts = []
+        for book in books:
+            previous = stored.get(book['product_url'])
+            if previous is None:
+                changes.append((book['product_url'], 'new', None, book['title']))
+            else:
+                changed = [(f, previous[f], book[f]) for f in TRACKED_FIELDS if previous[f] != book[f]]
+                if not changed:
+                    continue
+                changes.extend((book['product_url'], f, old, new) for f, old, new in changed)
+            upserts.append(book)
+
+        now = _now()
+        # Una transacción por página: o queda todo (productos + checkpoint) o nada
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO products (product_url, title, price, rating, availability, page, scraped_at)
+                   VALUES (:product_url, :title, :price, :rating, :availability, :page, :scraped_at)
+                   ON CONFLICT(product_url) DO UPDATE SET
+                       title = excluded.title, price = excluded.price, rating = excluded.rating,
+                       availability = excluded.availability, page = excluded.page,
+                       scraped_at = excluded.scraped_at""",
+                upserts,
+            )
+            self.conn.executemany(
+                """INSERT INTO changes (run_id, product_url, field, old_value, new_value, changed_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(run_id, url, field, old, new, now) for url, field, old, new in changes],
+            )
+            self.conn.execute("DELETE FROM run_products WHERE run_id = ? AND page = ?", (run_id, page))
+            self.conn.executemany(
+                """INSERT INTO run_products (run_id, page, position, product_url, scraped_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(run_id, page, position, book['product_url'], book['scraped_at'])
+                 for position, book in enumerate(books)],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (run_id, page, completed_at) VALUES (?, ?, ?)",
+                (run_id, page, now),
+            )
+
+        return [dict(zip(('product_url', 'field', 'old_value', 'new_value'), change)) for change in changes]
+
+    def page_books(self, run_id, page):
+        """Libros de una página completada en la ejecución `run_id`, en su orden original
+
+        Se reconstruyen desde run_products (qué libros tenía la página en esta
+        ejecución), no desde products.page, que puede venir de ejecuciones anteriores.
+        """
+        rows = self.conn.execute(
+            """SELECT p.title, p.price, p.rating, p.availability, r.product_url, r.scraped_at, r.page
+               FROM run_products r JOIN products p ON p.product_url = r.product_url
+               WHERE r.run_id = ? AND r.page = ? ORDER BY r.position""",
+            (run_id, page),
+        )
+        return [dict(row) for row in rows]
+
+    def run_changes(self, run_id):
+        """Registro de cambios de una ejecución"""
+        rows = self.conn.execute(
+            """SELECT product_url, field, old_value, new_value, changed_at
+               FROM changes WHERE run_id = ? ORDER BY id""",
+            (run_id,),
+        )
+        return [dict(row) for row in rows]
@@ -0,0 +1,155 @@
+# Enriquecimiento de libros con su página de detalle, en tres etapas solapadas
+#
+#   descarga (asyncio, N conexiones) -> cola acotada -> parseo (pool de procesos)
+#   -> cola acotada -> escritura (fusiona el detalle en el diccionario del libro)
+#
+# La red y la CPU trabajan a la vez, y las colas acotadas frenan la descarga si
+# el parseo se queda atrás, así que la memoria no crece con el número de libros.
+# DetailEnricher reutiliza la sesión y el pool de procesos para enriquecer el
+# catálogo página a página mientras se recorre (scrape_all_books(details=True)).
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from comun.crawl_async import AsyncFetcher, response_text
+
+STOCK_COUNT = re.compile(r'\((\d+) available\)')
+
+DETAIL_FIELDS = ('upc', 'stock_count', 'description', 'category')
+
+
+def parse_product_detail(html):
+    """Extrae UPC, stock exacto, descripción y categoría de una página de producto
+
+    Es una función de módulo para poder ejecutarse en el pool de procesos.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    table = {}
+    for row in soup.select('table.table-striped tr'):
+        header, value = row.find('th'), row.find('td')
+        if header and value:
+            table[header.text.strip()] = value.text.strip()
+
+    stock = STOCK_COUNT.search(table.get('Availability', ''))
+
+    description = None
+    description_header = soup.find(id='product_description')
+    if description_header:
+        paragraph = description_header.find_next_sibling('p')
+        description = paragraph.text.strip() if paragraph else None
+
+    # Migas de pan: Home / Books / <Categoría> / <Título>
+    crumbs = soup.select('ul.breadcrumb li a')
+    category = crumbs[2].text.strip() if len(crumbs) > 2 else None
+
+    return {
+        'upc': table.get('UPC'),
+        'stock_count': int(stock.group(1)) if stock else 0,
+        'description': description,
+        'category': category,
+    }
+
+
+async def enrich_books_async(books, session, concurrency=8, requests_per_second=None,
+                             parse_workers=None, queue_size=32, pacer=None, pool=None):
+    """Añade los campos de DETAIL_FIELDS a cada libro (modifica los dicts en sitio)
+
+    - concurrency: descargas simultáneas de páginas de detalle
+    - parse_workers: procesos de parseo (por defecto, uno por núcleo)
+    - queue_size: capacidad de cada cola entre etapas (backpressure)
+    - pacer: AdaptivePacer opcional para adaptar el ritmo y reintentar errores transitorios
+    - pool: ProcessPoolExecutor ya creado (se reutiliza entre llamadas); si no, se crea uno
+    Devuelve cuántos libros se enriquecieron correctamente.
+    """
+    parse_workers = parse_workers or os.cpu_count() or 1
+    pages = asyncio.Queue(maxsize=queue_size)
+    details = asyncio.Queue(maxsize=queue_size)
+    pending = iter(enumerate(books))
+    enriched = 0
+
+    async def fetch_stage(fetcher):
+        # Cada descargador toma el siguiente libro libre del iterador compartido
+        for index, book in pending:
+            html = await fetcher.fetch(book['product_url'], parse=response_text)
+            await pages.put((index, html))
+
+    async def parse_stage(pool):
+        loop = asyncio.get_running_loop()
+        while (item := await pages.get()) is not None:
+            index, html = item
+            detail = None
+            if html is not None:
+                try:
+                    detail = await loop.run_in_executor(pool, parse_product_detail, html)
+                except Exception as e:
+                    print(f"Error al parsear el detalle de {books[index]['product_url']}: {e}")
+            await details.put((index, detail))
+
+    async def write_stage():
+        nonlocal enriched
+        while (item := await details.get()) is not None:
+            index, detail = item
+            book = books[index]
+            book.update(detail or dict.fromkeys(DETAIL_FIELDS))
+            enriched += detail is not None
+
+    async def run(pool):
+        async with AsyncFetcher(session, concurrency, requests_per_second, pacer=pacer) as fetcher:
+            writer = asyncio.create_task(write_stage())
+            parsers = [asyncio.create_task(parse_stage(pool)) for _ in range(parse_workers)]
+
+            await asyncio.gather(*(fetch_stage(fetcher) for _ in range(concurrency)))
+            for _ in parsers:
+                await pages.put(None)
+            await asyncio.gather(*parsers)
+            await details.put(None)
+            await writer
+
+    if pool is not None:
+        await run(pool)
+    else:
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+            await run(pool)
+    return enriched
+
+
+class DetailEnricher:
+    """Enriquece lotes de libros (p. ej. cada página del catálogo) con la misma sesión y pool
+
+    Crear el pool de procesos cuesta más que parsear una página de 20 libros: se
+    crea una vez al entrar y se cierra al salir.
+    """
+
+    def __init__(self, session, concurrency=8, requests_per_second=None, parse_workers=None, pacer=None):
+        self.session = session
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        self.pacer = pacer
+        self.pool = None
+        self.enriched = 0
+        self.total = 0
+
+    def __enter__(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pool.shutdown(wait=True)
+        self.pool = None
+
+    async def enrich_async(self, books):
+        """Añade DETAIL_FIELDS a `books` (en sitio); devuelve cuántos se enriquecieron"""
+        enriched = await enrich_books_async(books, self.session, self.concurrency, self.requests_per_second,
+                                            self.parse_workers, pacer=self.pacer, pool=self.pool)
+        self.enriched += enriched
+        self.total += len(books)
+        return enriched
+
+    def enrich(self, books):
+        """Versión bloqueante de enrich_async (para el modo secuencial)"""
+        return asyncio.run(self.enrich_async(books))
@@ -0,0 +1,58 @@
+# Backends de parseo rápidos para las páginas del catálogo
+# - 'strained': html.parser, pero solo construye los productos y el paginador
+# - 'lxml': parser en C + XPath; solo se crean objetos Python para los campos extraídos
+# Ambos devuelven exactamente los mismos diccionarios que extract_product_info.
+from datetime import datetime
+from urllib.parse import urljoin
+
+from comun.xpath import etree, has_class, lxml_html  # sin lxml solo queda el backend 'strained'
+
+PARSER_BACKENDS = ('html.parser', 'strained', 'lxml')
+
+def strained_soup(html):
+    """Parsea con html.parser materializando solo la rejilla de productos y el paginador"""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # Solo los <article class="product_pod"> y el <li class="next"> del paginador
+    listing = SoupStrainer(['article', 'li'], class_=['product_pod', 'next'])
+    return BeautifulSoup(html, 'html.parser', parse_only=listing)
+
+
+if lxml_html is not None:
+    _PRODUCTS = etree.XPath(f"//article[{has_class('product_pod')}]")
+    _TITLE_LINK = etree.XPath("((.//h3)[1]//a)[1]")
+    _PRICE = etree.XPath(f"(.//p[{has_class('price_color')}])[1]")
+    _RATING = etree.XPath(f"(.//p[{has_class('star-rating')}])[1]/@class")
+    _AVAILABILITY = etree.XPath("(.//p[normalize-space(@class)='instock availability'])[1]")
+
+
+def extract_listing_lxml(html, page_url):
+    """Extrae los libros de una página con lxml (None si no hay productos)"""
+    if lxml_html is None:
+        raise ImportError("El backend 'lxml' requiere instalar lxml")
+
+    products = _PRODUCTS(lxml_html.fromstring(html))
+    if not products:
+        return None
+
+    scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    books = []
+    for product in products:
+        try:
+            title_element = _TITLE_LINK(product)[0]
+            price_element = _PRICE(product)
+            rating_class = _RATING(product)
+            availability_element = _AVAILABILITY(product)
+
+            books.append({
+                'title': title_element.get('title', '').strip(),
+                'price': price_element[0].text_content().strip() if price_element else 'N/A',
+                'rating': rating_class[0].split()[1] if rating_class else 'No rating',
+                'availability': availability_element[0].text_content().strip() if availability_element else 'N/A',
+                'product_url': urljoin(page_url, title_element.get('href', '')),
+                'scraped_at': scraped_at
+            })
+        except Exception as e:
+            print(f"Error al extraer información del producto: {e}")
+    return books
+
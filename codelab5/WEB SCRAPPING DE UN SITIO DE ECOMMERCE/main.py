@@ -1,13 +1,25 @@
 # Importar librerías necesarias
+# pandas, numpy y bs4 se importan solo en las funciones que los usan: importar este
+# módulo desde un worker (p. ej. get_page_content) no carga el stack de análisis
+import argparse
+import contextlib
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
-import re
+import asyncio
+import sys
+from pathlib import Path
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 
-print("✅ Librerías importadas correctamente")
+# Los módulos compartidos entre codelabs viven en comun/ (raíz del repositorio)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from comun.crawl_async import AsyncFetcher, create_session, response_text
+from comun.http_cache import HTTPCache
+from comun.pacing import AdaptivePacer
+from book_sink import BookSink
+from crawl_state import CrawlState
+from detail_pipeline import DetailEnricher
+from fast_parse import PARSER_BACKENDS, extract_listing_lxml, strained_soup
 
 # Configuración del scraper
 base_url = "http://books.toscrape.com"
@@ -15,70 +27,42 @@ headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
-def get_page_content(url):
-    """Obtiene el contenido de una página"""
+# Caché en disco: las páginas sin cambios se revalidan con un 304 en lugar de descargarse
+http_cache = HTTPCache('.http_cache', ttl=7 * 24 * 3600, max_bytes=100 * 1024 * 1024)
+session = create_session(headers, cache=http_cache)
+
+# Ritmo adaptativo: acelera mientras el servidor responde bien y frena ante 429/503,
+# Retry-After o latencia alta (sustituye a la pausa fija de 1 segundo entre páginas)
+pacer = AdaptivePacer(initial_rate=2.0, max_rate=20.0)
+
+def fetch_page_html(url, missing_ok=False):
+    """Descarga una página y devuelve su HTML (None si falla)
+
+    Con missing_ok=True un 404 devuelve '' en lugar de contar como fallo: pasado el
+    final del catálogo las páginas no existen, y eso no es un error de red.
+    """
     try:
-        response = requests.get(url, headers=headers)
+        response = pacer.request(session, url, timeout=30)
+        if missing_ok and response.status_code == 404:
+            return ''
         response.raise_for_status()
-        return BeautifulSoup(response.text, 'html.parser')
+        return response_text(response)
     except requests.RequestException as e:
         print(f"Error al acceder a {url}: {e}")
         return None
 
-# Probar la conexión
-print("🔄 Probando conexión...")
-soup = get_page_content(base_url)
-if soup:
-    print("✅ Conexión exitosa")
-    print(f"Título de la página: {soup.title.text}")
-else:
-    print("❌ Error en la conexión")
-
-# Analizar la primera página
-if soup:
-    # Buscar productos
-    products = soup.find_all('article', class_='product_pod')
-    print(f"📚 Encontrados {len(products)} productos en la primera página")
-
-    # Analizar el primer producto
-    if products:
-        first_product = products[0]
-        print(f"\n🔍 Análisis del primer producto:")
-        print(f"HTML del producto: {str(first_product)[:200]}...")
-
-        # Buscar elementos específicos
-        title_elem = first_product.find('h3')
-        if title_elem:
-            title_link = title_elem.find('a')
-            if title_link:
-                print(f"Título: {title_link.get('title', 'N/A')}")
-                print(f"Enlace: {title_link.get('href', 'N/A')}")
-
-        price_elem = first_product.find('p', class_='price_color')
-        if price_elem:
-            print(f"Precio: {price_elem.text}")
-
-        rating_elem = first_product.find('p', class_='star-rating')
-        if rating_elem:
-            print(f"Rating: {rating_elem.get('class', 'N/A')}")
-
-        availability_elem = first_product.find('p', class_='instock availability')
-        if availability_elem:
-            print(f"Disponibilidad: {availability_elem.text.strip()}")
-
-    # Buscar enlace a la siguiente página
-    next_link = soup.find('li', class_='next')
-    if next_link:
-        next_url = next_link.find('a')
-        if next_url:
-            print(f"\n➡️ Siguiente página: {next_url.get('href')}")
-    else:
-        print("\n❌ No se encontró enlace a la siguiente página")
-else:
-    print("❌ No se pudo analizar la página")
+def get_page_content(url):
+    """Obtiene el contenido de una página"""
+    from bs4 import BeautifulSoup
+
+    html = fetch_page_html(url)
+    return BeautifulSoup(html, 'html.parser') if html is not None else None
 
-def extract_product_info(product_element):
-    """Extrae información de un elemento de producto"""
+def extract_product_info(product_element, page_url=base_url):
+    """Extrae información de un elemento de producto
+
+    page_url es la página donde aparece el producto: los enlaces son relativos a ella.
+    """
     try:
         # Título del libro
         title_element = product_element.find('h3').find('a')
@@ -86,7 +70,7 @@ def extract_product_info(product_element):
 
         # URL del producto
         product_url = title_element.get('href', '')
-        product_url = urljoin(base_url, product_url)
+        product_url = urljoin(page_url, product_url)
 
         # Precio
         price_element = product_element.find('p', class_='price_color')
@@ -112,66 +96,301 @@ def extract_product_info(product_element):
         print(f"Error al extraer información del producto: {e}")
         return None
 
-# Probar con el primer producto
-if soup and products:
-    print("🧪 Probando extracción del primer producto...")
-    first_product_info = extract_product_info(products[0])
-    if first_product_info:
-        print("✅ Información extraída exitosamente:")
-        for key, value in first_product_info.items():
-            print(f"  {key}: {value}")
-    else:
-        print("❌ Error al extraer información")
-else:
-    print("❌ No hay productos para probar")
+def get_page_url(page_number):
+    """Devuelve la URL de una página del catálogo"""
+    if page_number == 1:
+        return base_url
+    return f"{base_url}/catalogue/page-{page_number}.html"
 
-def scrape_all_books(max_pages=3):
-    """Scraper completo que maneja múltiples páginas"""
-    all_books = []
-    current_page = 1
+def extract_page_books(soup, page_number):
+    """Extrae los libros de una página ya parseada (None si no hay productos)"""
+    products = soup.find_all('article', class_='product_pod')
+    if not products:
+        return None
 
-    print(f"🚀 Iniciando scraping de {max_pages} páginas...")
+    page_url = get_page_url(page_number)
+    page_books = []
+    for product in products:
+        book_info = extract_product_info(product, page_url)
+        if book_info:
+            book_info['page'] = page_number
+            page_books.append(book_info)
+    return page_books
+
+def parse_page_books(html, page_number, parser='html.parser'):
+    """Parsea el HTML de una página con el backend elegido y extrae sus libros
+
+    - 'html.parser': árbol completo con BeautifulSoup (comportamiento original)
+    - 'strained': BeautifulSoup solo sobre la rejilla de productos y el paginador
+    - 'lxml': extracción dirigida con XPath (el más rápido; requiere lxml)
+    """
+    if parser == 'lxml':
+        page_books = extract_listing_lxml(html, get_page_url(page_number))
+        for book_info in page_books or []:
+            book_info['page'] = page_number
+        return page_books
+
+    if parser == 'strained':
+        soup = strained_soup(html)
+    elif parser == 'html.parser':
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+    else:
+        raise ValueError(f"Parser desconocido: {parser} (opciones: {', '.join(PARSER_BACKENDS)})")
+    return extract_page_books(soup, page_number)
+
+def start_crawl_run(state):
+    """Abre (o reanuda) una ejecución en el estado del crawl"""
+    if state is None:
+        return None, set()
+
+    run_id, done_pages = state.start_run()
+    if done_pages:
+        print(f"⏯️ Reanudando crawl #{run_id}: {len(done_pages)} páginas ya completadas")
+    return run_id, done_pages
+
+def checkpoint_page(state, run_id, page_number, page_books):
+    """Guarda una página en el estado del crawl e informa de los cambios"""
+    if state is None:
+        return
+    changes = state.record_page(run_id, page_number, page_books)
+    if changes:
+        print(f"  🔁 {len(changes)} cambios en la página {page_number}")
 
-    while current_page <= max_pages:
-        if current_page == 1:
-            url = base_url
-        else:
-            url = f"{base_url}/catalogue/page-{current_page}.html"
+def close_crawl_run(state, run_id, failed):
+    """Cierra la ejecución y muestra el registro de cambios (o deja el checkpoint)"""
+    if state is None:
+        return
+    if failed:
+        print(f"💾 Progreso guardado: la próxima ejecución reanudará el crawl #{run_id}")
+        return
 
-        print(f"📄 Procesando página {current_page}...")
+    state.finish_run(run_id)
+    changes = state.run_changes(run_id)
+    print(f"📝 Cambios en el crawl #{run_id}: {len(changes)}")
+    for change in changes[:10]:
+        print(f"  - {change['product_url']} · {change['field']}: {change['old_value']} → {change['new_value']}")
+
+def emit_page_books(all_books, page_books, sink=None, keep_books=True):
+    """Entrega los libros de una página al sink (streaming) y/o a la lista en memoria"""
+    if sink is not None:
+        sink.write_page(page_books)
+    if keep_books:
+        all_books.extend(page_books)
+    return len(page_books)
+
+def scrape_all_books(max_pages=3, mode='sync', concurrency=8, requests_per_second=5, parser='html.parser',
+                     state=None, sink=None, keep_books=True, details=False, parse_workers=None):
+    """Scraper completo que maneja múltiples páginas
+
+    mode='async' descarga las páginas en paralelo (ver scrape_all_books_async);
+    concurrency y requests_per_second aplican a ese modo y a las páginas de detalle.
+    parser elige el backend de parseo (ver parse_page_books).
+    state (CrawlState) guarda un checkpoint por página: si el crawl falla, la
+    siguiente llamada reanuda desde la página pendiente y solo se escriben los
+    productos nuevos o con cambios. Una página 404 o sin productos es el final
+    del catálogo (max_pages puede superar el número real de páginas): la
+    ejecución se cierra con normalidad; solo los errores de red o del servidor
+    dejan el checkpoint para reanudar.
+    sink (BookSink) recibe cada página en cuanto se extrae; con keep_books=False
+    los libros no se acumulan en memoria y se devuelve una lista vacía.
+    details=True completa cada página con las páginas de detalle de sus libros
+    (UPC, stock exacto, descripción, categoría) antes de entregarla al sink
+    (usa BookSink(details=True) para exportar esas columnas).
+    El ritmo de peticiones lo marca el AdaptivePacer del módulo (`pacer`), en ambos modos.
+    """
+    if mode == 'async':
+        return asyncio.run(scrape_all_books_async(max_pages, concurrency, requests_per_second, parser, state,
+                                                  sink, keep_books, details, parse_workers))
 
-        soup = get_page_content(url)
-        if not soup:
-            print(f"❌ Error en página {current_page}")
-            break
+    all_books = []
+    total_books = 0
+    current_page = 1
+    failed = False
+    run_id, done_pages = start_crawl_run(state)
 
-        # Verificar si hay productos en la página
-        products = soup.find_all('article', class_='product_pod')
-        if not products:
-            print(f"❌ No se encontraron productos en página {current_page}")
-            break
-
-        # Extraer información de cada producto
-        page_books = []
-        for product in products:
-            book_info = extract_product_info(product)
-            if book_info:
-                book_info['page'] = current_page
-                page_books.append(book_info)
+    print(f"🚀 Iniciando scraping de {max_pages} páginas...")
 
-        all_books.extend(page_books)
-        print(f"  ✅ Extraídos {len(page_books)} libros de la página {current_page}")
+    with open_detail_enricher(details, concurrency, requests_per_second, parse_workers) as enricher:
+        while current_page <= max_pages:
+            if current_page in done_pages:
+                page_books = state.page_books(run_id, current_page)
+                enrich_page(enricher, page_books)
+                total_books += emit_page_books(all_books, page_books, sink, keep_books)
+                print(f"  ⏭️ Página {current_page} recuperada del checkpoint ({len(page_books)} libros)")
+                current_page += 1
+                continue
+
+            url = get_page_url(current_page)
+
+            print(f"📄 Procesando página {current_page}...")
+
+            html = fetch_page_html(url, missing_ok=True)
+            if html is None:
+                print(f"❌ Error en página {current_page}")
+                failed = True
+                break
+
+            # Extraer información de cada producto ('' = 404: fin del catálogo)
+            page_books = parse_page_books(html, current_page, parser) if html else None
+            if page_books is None:
+                print(f"🏁 Fin del catálogo: la página {current_page} no existe o no tiene productos")
+                break
+
+            enrich_page(enricher, page_books)
+            total_books += emit_page_books(all_books, page_books, sink, keep_books)
+            print(f"  ✅ Extraídos {len(page_books)} libros de la página {current_page}")
+            checkpoint_page(state, run_id, current_page, page_books)
+            current_page += 1
+
+    close_crawl_run(state, run_id, failed)
+    print(f"\n🎉 Scraping completado!")
+    print(f"📊 Total de libros extraídos: {total_books}")
+    print_detail_stats(enricher)
+    print_pacing_stats()
+    return all_books
 
-        # Pausa entre peticiones para ser respetuosos
-        time.sleep(1)
-        current_page += 1
+async def scrape_all_books_async(max_pages=3, concurrency=8, requests_per_second=5, parser='html.parser',
+                                 state=None, sink=None, keep_books=True, details=False, parse_workers=None):
+    """Scraper concurrente: descarga las páginas en paralelo con conexiones keep-alive
 
+    Devuelve la misma lista de libros que el modo secuencial: si una página falla
+    o no tiene productos (o es un 404, fin del catálogo), se descartan esa página
+    y las siguientes.
+    """
+    all_books = []
+    total_books = 0
+    failed = False
+    run_id, done_pages = start_crawl_run(state)
+    pending = [page for page in range(1, max_pages + 1) if page not in done_pages]
+
+    print(f"🚀 Iniciando scraping asíncrono de {max_pages} páginas "
+          f"(concurrencia={concurrency}, {requests_per_second} req/s por host)...")
+
+    # Cada página se parsea en el hilo que la descargó: (página, libros o None);
+    # un 404 es el final del catálogo, no un error
+    def parser_for(page_number):
+        def parse(response):
+            if response.status_code == 404:
+                return page_number, None
+            return page_number, parse_page_books(response_text(response), page_number, parser)
+        return parse
+
+    with create_session(headers, pool_size=concurrency, cache=http_cache) as async_session:
+        async with AsyncFetcher(async_session, concurrency, requests_per_second, pacer=pacer) as fetcher:
+            fetched = await asyncio.gather(*(
+                fetcher.fetch(get_page_url(page_number), parse=parser_for(page_number), missing_ok=True)
+                for page_number in pending
+            ))
+    results = dict(zip(pending, fetched))
+
+    with open_detail_enricher(details, concurrency, requests_per_second, parse_workers) as enricher:
+        for page_number in range(1, max_pages + 1):
+            if page_number in done_pages:
+                page_books = state.page_books(run_id, page_number)
+                await enrich_page_async(enricher, page_books)
+                total_books += emit_page_books(all_books, page_books, sink, keep_books)
+                print(f"  ⏭️ Página {page_number} recuperada del checkpoint ({len(page_books)} libros)")
+                continue
+
+            result = results[page_number]
+            if result is None:
+                print(f"❌ Error en página {page_number}")
+                failed = True
+                break
+
+            _, page_books = result
+            if page_books is None:
+                print(f"🏁 Fin del catálogo: la página {page_number} no existe o no tiene productos")
+                break
+
+            await enrich_page_async(enricher, page_books)
+            total_books += emit_page_books(all_books, page_books, sink, keep_books)
+            print(f"  ✅ Extraídos {len(page_books)} libros de la página {page_number}")
+            checkpoint_page(state, run_id, page_number, page_books)
+
+    close_crawl_run(state, run_id, failed)
     print(f"\n🎉 Scraping completado!")
-    print(f"📊 Total de libros extraídos: {len(all_books)}")
+    print(f"📊 Total de libros extraídos: {total_books}")
+    print_detail_stats(enricher)
+    print_pacing_stats()
     return all_books
 
-# Ejecutar el scraper (limitado a 3 páginas para el ejemplo)
-books = scrape_all_books(max_pages=3)
+def print_pacing_stats():
+    """Muestra el ritmo alcanzado y los contadores de errores del pacer"""
+    stats = pacer.stats()
+    print(f"⚙️ Ritmo actual: {stats['rate']} req/s · peticiones: {stats['requests']} · "
+          f"reintentos: {stats['retries']} · 429/503: {stats['throttled']} · "
+          f"5xx: {stats['server_errors']} · errores de red: {stats['network_errors']}")
+
+@contextlib.contextmanager
+def open_detail_enricher(details=True, concurrency=8, requests_per_second=5, parse_workers=None):
+    """DetailEnricher con su propia sesión y el pacer del módulo (None si details=False)"""
+    if not details:
+        yield None
+        return
+    with create_session(headers, pool_size=concurrency, cache=http_cache) as detail_session, \
+            DetailEnricher(detail_session, concurrency, requests_per_second, parse_workers, pacer=pacer) as enricher:
+        yield enricher
+
+def enrich_page(enricher, page_books):
+    """Completa los libros de una página con su detalle (si el crawl lo pide)"""
+    if enricher is not None:
+        enricher.enrich(page_books)
+
+async def enrich_page_async(enricher, page_books):
+    if enricher is not None:
+        await enricher.enrich_async(page_books)
+
+def print_detail_stats(enricher):
+    if enricher is not None:
+        print(f"🔎 Páginas de detalle: {enricher.enriched}/{enricher.total} libros enriquecidos")
+
+def enrich_books(books, concurrency=8, requests_per_second=5, parse_workers=None):
+    """Completa cada libro con su página de detalle (UPC, stock exacto, descripción, categoría)
+
+    Descarga y parseo van en etapas solapadas: ver detail_pipeline.enrich_books_async.
+    Para catálogos grandes, mejor scrape_all_books(details=True): enriquece página a
+    página sin acumular la lista completa.
+    """
+    print(f"🔎 Enriqueciendo {len(books)} libros con su página de detalle...")
+    with open_detail_enricher(True, concurrency, requests_per_second, parse_workers) as enricher:
+        enriched = enricher.enrich(books)
+    print(f"  ✅ {enriched}/{len(books)} libros enriquecidos")
+    return books
+
+def normalize_books(df):
+    """Convierte las columnas de texto a tipos compactos en pasadas vectorizadas
+
+    - price_numeric: float32 (0.0 si no hay precio válido)
+    - rating: categórico ordenado; rating_numeric: int8 con las estrellas (0-5)
+    - in_stock: booleano; availability pasa a categórico
+    - page: entero pequeño; scraped_at: datetime64
+    """
+    import numpy as np
+    import pandas as pd
+    from book_index import RATING_ORDER
+
+    # 'No rating' es el nivel 0: rating_numeric coincide con el número de estrellas
+    rating_levels = ['No rating'] + RATING_ORDER
+
+    # Los precios se repiten mucho: se parsea cada valor distinto una sola vez
+    codes, unique_prices = pd.factorize(df['price'])
+    price_digits = pd.Series(unique_prices, dtype=object).astype(str).str.replace(r'[^\d.]', '', regex=True)
+    parsed = pd.to_numeric(price_digits, errors='coerce').fillna(0).to_numpy(dtype='float32')
+    # El código -1 (precio ausente) cae en el 0.0 añadido al final
+    df['price_numeric'] = np.append(parsed, np.float32(0))[codes]
+
+    df['rating'] = pd.Categorical(df['rating'], categories=rating_levels, ordered=True)
+    df['rating_numeric'] = df['rating'].cat.codes.astype('int8')
+
+    df['in_stock'] = df['availability'].str.startswith('In stock', na=False)
+    df['availability'] = df['availability'].astype('category')
+
+    df['page'] = pd.to_numeric(df['page'], downcast='integer')
+    df['scraped_at'] = pd.to_datetime(df['scraped_at'], format='%Y-%m-%d %H:%M:%S')
+    return df
 
 def clean_and_analyze_books(books_data):
     """Limpia y analiza los datos de libros"""
@@ -179,24 +398,16 @@ def clean_and_analyze_books(books_data):
         print("❌ No hay datos para analizar")
         return None
 
+    import pandas as pd
+
     df = pd.DataFrame(books_data)
 
     print("=== INFORMACIÓN BÁSICA ===")
     print(f"Total de libros: {len(df)}")
     print(f"Columnas: {list(df.columns)}")
 
-    # Limpiar precios
-    def clean_price(price_str):
-        if price_str == 'N/A':
-            return 0.0
-        # Extraer solo números del precio
-        price_clean = re.sub(r'[^\d.]', '', price_str)
-        try:
-            return float(price_clean)
-        except:
-            return 0.0
-
-    df['price_numeric'] = df['price'].apply(clean_price)
+    # Normalizar tipos (precio numérico, rating ordinal, stock booleano)
+    df = normalize_books(df)
 
     # Análisis de precios
     print("\n=== ANÁLISIS DE PRECIOS ===")
@@ -209,7 +420,7 @@ def clean_and_analyze_books(books_data):
     # Análisis por rating
     print("\n=== ANÁLISIS POR RATING ===")
     rating_counts = df['rating'].value_counts()
-    print(rating_counts)
+    print(rating_counts[rating_counts > 0])
 
     # Libros más caros
     if len(valid_prices) > 0:
@@ -220,114 +431,185 @@ def clean_and_analyze_books(books_data):
 
     return df
 
-# Analizar los datos
-if books:
-    df_books = clean_and_analyze_books(books)
-else:
-    print("❌ No hay datos para analizar")
+def search_books_by_criteria(df, criteria, index=None):
+    """Busca libros por criterios específicos
 
-def search_books_by_criteria(df, criteria):
-    """Busca libros por criterios específicos"""
+    Las consultas se responden desde un BookIndex; para muchas búsquedas sobre el
+    mismo snapshot, constrúyelo una vez y pásalo en `index`.
+    """
     if df is None or df.empty:
         print("❌ No hay datos para buscar")
         return df
 
-    results = df.copy()
-
-    # Filtrar por título
-    if 'title_keywords' in criteria:
-        keywords = criteria['title_keywords'].lower().split()
-        mask = results['title'].str.lower().str.contains('|'.join(keywords), na=False)
-        results = results[mask]
-
-    # Filtrar por precio
-    if 'max_price' in criteria:
-        results = results[results['price_numeric'] <= criteria['max_price']]
-
-    if 'min_price' in criteria:
-        results = results[results['price_numeric'] >= criteria['min_price']]
-
-    # Filtrar por rating
-    if 'min_rating' in criteria:
-        rating_order = ['One', 'Two', 'Three', 'Four', 'Five']
-        min_rating_idx = rating_order.index(criteria['min_rating'])
-        valid_ratings = rating_order[min_rating_idx:]
-        results = results[results['rating'].isin(valid_ratings)]
-
-    return results
-
-# Ejemplos de búsqueda
-if 'df_books' in locals() and df_books is not None:
-    print("=== BÚSQUEDAS ESPECÍFICAS ===")
-
-    # Buscar libros sobre "python"
-    python_books = search_books_by_criteria(df_books, {'title_keywords': 'python'})
-    print(f"Libros sobre Python: {len(python_books)}")
-
-    # Buscar libros baratos (menos de £10)
-    cheap_books = search_books_by_criteria(df_books, {'max_price': 10})
-    print(f"Libros baratos (<£10): {len(cheap_books)}")
-
-    # Buscar libros con rating alto
-    high_rated = search_books_by_criteria(df_books, {'min_rating': 'Four'})
-    print(f"Libros con rating alto (4+ estrellas): {len(high_rated)}")
-
-    # Mostrar algunos resultados
-    if len(python_books) > 0:
-        print(f"\n🐍 Libros sobre Python encontrados:")
-        for idx, row in python_books.head(3).iterrows():
-            print(f"- {row['title']} - {row['price']}")
-
-    if len(cheap_books) > 0:
-        print(f"\n💰 Libros baratos encontrados:")
-        for idx, row in cheap_books.head(3).iterrows():
-            print(f"- {row['title']} - {row['price']}")
-else:
-    print("❌ No hay datos para buscar")
-
-def save_books_data(df, base_filename='books_data'):
-    """Guarda los datos en diferentes formatos"""
-    if df is None or df.empty:
+    if index is None:
+        from book_index import BookIndex
+
+        index = BookIndex(df)
+
+    # title_keywords (cualquiera de las palabras), min_price/max_price y min_rating
+    return index.query(criteria)
+
+def save_books_data(books, base_filename='books_data'):
+    """Guarda una lista de libros ya en memoria: CSV + JSONL y resumen (ver BookSink)
+
+    El crawl escribe estos mismos ficheros página a página (scrape_all_books(sink=...));
+    esta función es para libros que ya se tienen en una lista.
+    """
+    if not books:
         print("❌ No hay datos para guardar")
         return
 
-    # CSV
-    csv_filename = f"{base_filename}.csv"
-    df.to_csv(csv_filename, index=False, encoding='utf-8')
-    print(f"✅ Datos guardados en CSV: {csv_filename}")
+    with BookSink(base_filename) as sink:
+        sink.write_page(books)
 
-    # Excel (si está disponible)
-    try:
-        excel_filename = f"{base_filename}.xlsx"
-        df.to_excel(excel_filename, index=False)
-        print(f"✅ Datos guardados en Excel: {excel_filename}")
-    except ImportError:
-        print("⚠️ Excel no disponible (instalar openpyxl para soporte)")
-
-    # JSON
-    json_filename = f"{base_filename}.json"
-    df.to_json(json_filename, orient='records', indent=2)
-    print(f"✅ Datos guardados en JSON: {json_filename}")
-
-    # Resumen estadístico
-    summary_filename = f"{base_filename}_summary.txt"
-    with open(summary_filename, 'w', encoding='utf-8') as f:
-        f.write("=== RESUMEN DE DATOS ===\n")
-        f.write(f"Total de libros: {len(df)}\n")
-
-        valid_prices = df[df['price_numeric'] > 0]
-        if len(valid_prices) > 0:
-            f.write(f"Precio promedio: £{valid_prices['price_numeric'].mean():.2f}\n")
-            f.write(f"Precio mínimo: £{valid_prices['price_numeric'].min():.2f}\n")
-            f.write(f"Precio máximo: £{valid_prices['price_numeric'].max():.2f}\n")
-
-        f.write(f"\nDistribución por rating:\n")
-        f.write(df['rating'].value_counts().to_string())
-
-    print(f"✅ Resumen guardado en: {summary_filename}")
-
-# Guardar todos los datos
-if 'df_books' in locals() and df_books is not None:
-    save_books_data(df_books)
-else:
-    print("❌ No hay datos para guardar")
\ No newline at end of file
+def run_demo():
+    """Demo completa: explorar, scrapear, analizar, buscar y guardar"""
+    from book_index import BookIndex
+
+    print("✅ Librerías importadas correctamente")
+
+    # Probar la conexión
+    print("🔄 Probando conexión...")
+    soup = get_page_content(base_url)
+    if soup:
+        print("✅ Conexión exitosa")
+        print(f"Título de la página: {soup.title.text}")
+    else:
+        print("❌ Error en la conexión")
+
+    # Analizar la primera página
+    if soup:
+        # Buscar productos
+        products = soup.find_all('article', class_='product_pod')
+        print(f"📚 Encontrados {len(products)} productos en la primera página")
+
+        # Analizar el primer producto
+        if products:
+            first_product = products[0]
+            print(f"\n🔍 Análisis del primer producto:")
+            print(f"HTML del producto: {str(first_product)[:200]}...")
+
+            # Buscar elementos específicos
+            title_elem = first_product.find('h3')
+            if title_elem:
+                title_link = title_elem.find('a')
+                if title_link:
+                    print(f"Título: {title_link.get('title', 'N/A')}")
+                    print(f"Enlace: {title_link.get('href', 'N/A')}")
+
+            price_elem = first_product.find('p', class_='price_color')
+            if price_elem:
+                print(f"Precio: {price_elem.text}")
+
+            rating_elem = first_product.find('p', class_='star-rating')
+            if rating_elem:
+                print(f"Rating: {rating_elem.get('class', 'N/A')}")
+
+            availability_elem = first_product.find('p', class_='instock availability')
+            if availability_elem:
+                print(f"Disponibilidad: {availability_elem.text.strip()}")
+
+        # Buscar enlace a la siguiente página
+        next_link = soup.find('li', class_='next')
+        if next_link:
+            next_url = next_link.find('a')
+            if next_url:
+                print(f"\n➡️ Siguiente página: {next_url.get('href')}")
+        else:
+            print("\n❌ No se encontró enlace a la siguiente página")
+    else:
+        print("❌ No se pudo analizar la página")
+
+    # Probar con el primer producto
+    if soup and products:
+        print("🧪 Probando extracción del primer producto...")
+        first_product_info = extract_product_info(products[0])
+        if first_product_info:
+            print("✅ Información extraída exitosamente:")
+            for key, value in first_product_info.items():
+                print(f"  {key}: {value}")
+        else:
+            print("❌ Error al extraer información")
+    else:
+        print("❌ No hay productos para probar")
+
+    # Ejecutar el scraper (limitado a 3 páginas para el ejemplo)
+    # El estado en SQLite permite reanudar un crawl interrumpido y registrar solo los cambios
+    # El sink exporta CSV/JSONL y el resumen página a página mientras se scrapea
+    with CrawlState('books_state.sqlite') as state, BookSink('books_data') as sink:
+        books = scrape_all_books(max_pages=3, state=state, sink=sink)
+
+    # Analizar los datos
+    if books:
+        df_books = clean_and_analyze_books(books)
+    else:
+        print("❌ No hay datos para analizar")
+
+    # Ejemplos de búsqueda
+    if 'df_books' in locals() and df_books is not None:
+        print("=== BÚSQUEDAS ESPECÍFICAS ===")
+
+        # Índice construido una sola vez para todas las búsquedas
+        books_index = BookIndex(df_books)
+
+        # Buscar libros sobre "python"
+        python_books = search_books_by_criteria(df_books, {'title_keywords': 'python'}, books_index)
+        print(f"Libros sobre Python: {len(python_books)}")
+
+        # Buscar libros baratos (menos de £10)
+        cheap_books = search_books_by_criteria(df_books, {'max_price': 10}, books_index)
+        print(f"Libros baratos (<£10): {len(cheap_books)}")
+
+        # Buscar libros con rating alto
+        high_rated = search_books_by_criteria(df_books, {'min_rating': 'Four'}, books_index)
+        print(f"Libros con rating alto (4+ estrellas): {len(high_rated)}")
+
+        # Mostrar algunos resultados
+        if len(python_books) > 0:
+            print(f"\n🐍 Libros sobre Python encontrados:")
+            for idx, row in python_books.head(3).iterrows():
+                print(f"- {row['title']} - {row['price']}")
+
+        if len(cheap_books) > 0:
+            print(f"\n💰 Libros baratos encontrados:")
+            for idx, row in cheap_books.head(3).iterrows():
+                print(f"- {row['title']} - {row['price']}")
+    else:
+        print("❌ No hay datos para buscar")
+
+    # Guardar todos los datos: CSV, JSONL y resumen ya se escribieron en streaming
+    # durante el crawl (BookSink); save_books_data hace lo mismo con una lista en memoria
+
+def parse_args(argv=None):
+    """Argumentos de la línea de comandos (sin subcomando: la demo completa)"""
+    parser = argparse.ArgumentParser(description='Scraper de books.toscrape.com')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('demo', help='explorar, scrapear, analizar y buscar (por defecto)')
+
+    crawl = subparsers.add_parser('crawl', help='recorrer el catálogo y exportarlo (CSV, JSONL y resumen)')
+    crawl.add_argument('--pages', type=int, default=3)
+    crawl.add_argument('--mode', choices=['sync', 'async'], default='sync')
+    crawl.add_argument('--parser', choices=PARSER_BACKENDS, default='html.parser')
+    crawl.add_argument('--concurrency', type=int, default=8, help='modo async y --details')
+    crawl.add_argument('--rps', type=float, default=5, help='peticiones por segundo (modo async y --details)')
+    crawl.add_argument('--state', default='books_state.sqlite', help='checkpoint para reanudar el crawl')
+    crawl.add_argument('--output', default='books_data', help='prefijo de los archivos exportados')
+    crawl.add_argument('--details', action='store_true',
+                       help='completar cada libro con su página de detalle (UPC, stock, descripción, categoría)')
+    crawl.add_argument('--analyze', action='store_true', help='analizar los libros al terminar (pandas)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'crawl':
+        with CrawlState(args.state) as state, BookSink(args.output, details=args.details) as sink:
+            books = scrape_all_books(max_pages=args.pages, mode=args.mode, concurrency=args.concurrency,
+                                     requests_per_second=args.rps, parser=args.parser, state=state, sink=sink,
+                                     keep_books=args.analyze, details=args.details)
+        if args.analyze:
+            clean_and_analyze_books(books)
+    else:
+        run_demo()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# Artefacto plano para los pipelines de texto (triage y spam)
+# Alternativa al .joblib para cargar rápido y compartir memoria entre procesos:
+# - Un único archivo: cabecera JSON (parámetros del vectorizador y del clasificador,
+#   clases) seguida de arrays planos alineados a 64 bytes
+# - Vocabulario como tabla ordenada de términos UTF-8 de ancho fijo: la columna de cada
+#   término es su posición en la tabla (no hay dict que reconstruir al cargar)
+# - idf en float64 (mismas características TF-IDF) y coeficientes en float32
+# - Al cargar, los arrays se leen con memoria mapeada (np.memmap): no se copian al
+#   proceso, y todos los procesos de la máquina comparten las mismas páginas físicas
+# - cargar_artefacto devuelve un Pipeline de sklearn normal (predict, predict_proba...);
+#   comun.puntuador.PuntuadorLineal puntúa el mismo archivo solo con NumPy, y
+#   exportar_puntuador guarda el artefacto y comprueba que ambos dan las mismas etiquetas
+# - Un ClasificadorUmbral (comun/calibracion.py) guarda además su umbral y los histogramas
+#   del calibrador: cargar_artefacto lo devuelve envuelto igual y PuntuadorLineal aplica el umbral
+#
+# Pipelines admitidos: [NormalizadorTexto] + TfidfVectorizer + clasificador lineal
+# (LinearSVC, LogisticRegression, SGDClassifier...)
+import importlib
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.utils.validation import check_is_fitted
+
+from comun.calibracion import CalibradorUmbral, ClasificadorUmbral
+from comun.normalizacion import NormalizadorTexto
+from comun.puntuador import MAGICO, PuntuadorLineal, contar_ngramas, leer_artefacto
+
+ALINEACION = 64
+
+
+class VocabularioPlano(Mapping):
+    """Vocabulario término -> columna sobre una tabla ordenada de términos (bytes UTF-8)
+
+    Se comporta como el dict vocabulary_ de sklearn, pero la columna de cada término es
+    su posición en `terminos` y la búsqueda es binaria sobre el array (que puede estar
+    mapeado desde disco).
+    """
+
+    def __init__(self, terminos):
+        self.terminos = terminos
+
+    def __getitem__(self, termino):
+        if not isinstance(termino, str):
+            raise KeyError(termino)
+        clave = termino.encode("utf-8")
+        posicion = int(self.terminos.searchsorted(clave))
+        if posicion < len(self.terminos) and self.terminos[posicion] == clave:
+            return posicion
+        raise KeyError(termino)
+
+    def __iter__(self):
+        return (termino.decode("utf-8") for termino in self.terminos)
+
+    def __len__(self):
+        return len(self.terminos)
+
+
+class TfidfPlano(TfidfVectorizer):
+    """TfidfVectorizer que busca todos los n-gramas de un lote en la tabla de una vez
+
+    Con un VocabularioPlano, buscar término a término desde Python sería más lento que
+    el dict; en su lugar se analizan todos los textos, se buscan todos los n-gramas con
+    un único searchsorted y se construye la matriz de conteos directamente.
+    """
+
+    def transform(self, raw_documents):
+        if not isinstance(getattr(self, "vocabulary_", None), VocabularioPlano):
+            return super().transform(raw_documents)
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+        check_is_fitted(self, msg="The TF-IDF vectorizer is not fitted")
+        return self._tfidf.transform(self._contar(raw_documents), copy=False)
+
+    def _contar(self, documentos):
+        """Matriz de conteos (documentos x términos), igual que CountVectorizer.transform"""
+        terminos = self.vocabulary_.terminos
+        # Misma búsqueda por lotes que PuntuadorLineal (comun/puntuador.py)
+        n_documentos, filas, columnas, conteos = contar_ngramas(documentos, self.build_analyzer(), terminos)
+
+        # Conteo por (fila, columna) ya ordenado: la CSR se arma sin sum_duplicates
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(filas, minlength=n_documentos))])
+        datos = np.ones(len(conteos), dtype=self.dtype) if self.binary else conteos.astype(self.dtype)
+        return sp.csr_matrix((datos, columnas, indptr), shape=(n_documentos, len(terminos)))
+
+
+def _partes(pipe):
+    """(normalizar, vectorizador, modelo) de un pipeline admitido, o ValueError"""
+    pasos = [paso for _, paso in pipe.steps]
+    normalizar = isinstance(pasos[0], NormalizadorTexto)
+    if normalizar:
+        pasos = pasos[1:]
+    if len(pasos) != 2 or not isinstance(pasos[0], TfidfVectorizer) or not hasattr(pasos[1], "coef_"):
+        raise ValueError("Solo se admiten pipelines [NormalizadorTexto] + TfidfVectorizer + clasificador lineal")
+    vectorizador, modelo = pasos
+    if vectorizador.input != "content" or any(callable(getattr(vectorizador, nombre))
+                                              for nombre in ("analyzer", "preprocessor", "tokenizer")):
+        raise ValueError("El vectorizador debe usar input='content' y el analizador de sklearn (sin funciones propias)")
+    return normalizar, vectorizador, modelo
+
+
+def _probabilidades(modelo):
+    """Cómo calcula predict_proba el clasificador: 'ovr' (sigmoide), 'softmax' o None"""
+    if isinstance(modelo, LogisticRegression):
+        ovr = modelo.multi_class in ["ovr", "warn"] or (
+            modelo.multi_class in ["auto", "deprecated"] and (modelo.classes_.size <= 2 or modelo.solver == "liblinear"))
+        return "ovr" if ovr else "softmax"
+    if isinstance(modelo, SGDClassifier) and modelo.loss == "log_loss":
+        return "ovr"
+    return None
+
+
+def guardar_artefacto(pipe, ruta):
+    """Guarda el pipeline entrenado (o un ClasificadorUmbral) como artefacto plano en `ruta`"""
+    calibrador = None
+    if isinstance(pipe, ClasificadorUmbral):
+        pipe, calibrador = pipe.pipeline, pipe.calibrador
+    normalizar, vectorizador, modelo = _partes(pipe)
+    if calibrador is not None and (_probabilidades(modelo) is None or len(modelo.classes_) != 2):
+        raise ValueError("El umbral calibrado requiere un clasificador binario con probabilidades")
+
+    # Términos ordenados por sus bytes UTF-8; las columnas se reordenan igual
+    vocabulario = vectorizador.vocabulary_
+    terminos = np.array([termino.encode("utf-8") for termino in vocabulario], dtype=bytes)
+    columnas = np.fromiter(vocabulario.values(), dtype=np.int64, count=len(vocabulario))
+    orden = np.argsort(terminos, kind="stable")
+    terminos, columnas = terminos[orden], columnas[orden]
+
+    arrays = {
+        "terminos": terminos,
+        "coef": np.ascontiguousarray(modelo.coef_[:, columnas], dtype=np.float32),
+        "intercept": np.ascontiguousarray(np.atleast_1d(modelo.intercept_), dtype=np.float64),
+    }
+    if vectorizador.use_idf:
+        arrays["idf"] = np.ascontiguousarray(vectorizador.idf_[columnas], dtype=np.float64)
+    if calibrador is not None:
+        arrays["positivos"] = calibrador.positivos
+        arrays["negativos"] = calibrador.negativos
+
+    parametros = vectorizador.get_params()
+    parametros.pop("vocabulary")
+    parametros["dtype"] = np.dtype(parametros["dtype"]).name
+    clase = type(modelo)
+    cabecera = {
+        "normalizar": normalizar,
+        "vectorizador": parametros,
+        "clasificador": {"clase": f"{clase.__module__}.{clase.__qualname__}", "parametros": modelo.get_params()},
+        "clases": modelo.classes_.tolist(),
+        "dtype_clases": modelo.classes_.dtype.str,
+        "probabilidades": _probabilidades(modelo),
+        "secciones": {},
+    }
+    if calibrador is not None:
+        cabecera["calibrador"] = {**calibrador.parametros(), "umbral": calibrador.umbral_}
+
+    # Posiciones de cada array: se calculan con la cabecera ya serializada
+    # (los offsets no cambian de longitud al fijarse, se reserva sitio con un valor grande)
+    for nombre, array in arrays.items():
+        cabecera["secciones"][nombre] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 2**40}
+    inicio = len(MAGICO) + 8 + len(json.dumps(cabecera).encode("utf-8"))
+    posicion = -(-inicio // ALINEACION) * ALINEACION
+    for nombre, array in arrays.items():
+        cabecera["secciones"][nombre]["offset"] = posicion
+        posicion += -(-array.nbytes // ALINEACION) * ALINEACION
+    datos_cabecera = json.dumps(cabecera).encode("utf-8").ljust(inicio - len(MAGICO) - 8)
+
+    with open(ruta, "wb") as f:
+        f.write(MAGICO + len(datos_cabecera).to_bytes(8, "little") + datos_cabecera)
+        for nombre, array in arrays.items():
+            f.write(b"\0" * (cabecera["secciones"][nombre]["offset"] - f.tell()))
+            f.write(array.tobytes())
+    return ruta
+
+
+def cargar_artefacto(ruta):
+    """Reconstruye el Pipeline de sklearn desde el artefacto plano (sin copiar los arrays)
+
+    Si el artefacto tiene umbral calibrado, devuelve un ClasificadorUmbral; sus histogramas
+    sí se copian a memoria para poder recalibrar con actualizar.
+    """
+    cabecera, arrays = leer_artefacto(ruta)
+    n_terminos = len(arrays["terminos"])
+
+    parametros = dict(cabecera["vectorizador"], dtype=np.dtype(cabecera["vectorizador"]["dtype"]).type)
+    parametros["ngram_range"] = tuple(parametros["ngram_range"])
+    vectorizador = TfidfPlano(**parametros)
+    vectorizador.vocabulary_ = VocabularioPlano(arrays["terminos"])
+    vectorizador.fixed_vocabulary_ = False
+    vectorizador._tfidf = TfidfTransformer(norm=vectorizador.norm, use_idf=vectorizador.use_idf,
+                                           smooth_idf=vectorizador.smooth_idf, sublinear_tf=vectorizador.sublinear_tf)
+    if "idf" in arrays:
+        vectorizador._tfidf.idf_ = arrays["idf"]
+    vectorizador._tfidf.n_features_in_ = n_terminos
+
+    modulo, nombre = cabecera["clasificador"]["clase"].rsplit(".", 1)
+    modelo = getattr(importlib.import_module(modulo), nombre)(**cabecera["clasificador"]["parametros"])
+    modelo.coef_ = arrays["coef"]
+    modelo.intercept_ = arrays["intercept"]
+    modelo.classes_ = np.array(cabecera["clases"], dtype=cabecera["dtype_clases"])
+    modelo.n_features_in_ = n_terminos
+
+    pasos = [NormalizadorTexto()] if cabecera["normalizar"] else []
+    pipe = make_pipeline(*pasos, vectorizador, modelo)
+    if not cabecera.get("calibrador"):
+        return pipe
+    parametros = dict(cabecera["calibrador"])
+    umbral = parametros.pop("umbral")
+    calibrador = CalibradorUmbral(**parametros)
+    calibrador.positivos[:] = arrays["positivos"]
+    calibrador.negativos[:] = arrays["negativos"]
+    calibrador.umbral_ = umbral
+    return ClasificadorUmbral(pipe, calibrador)
+
+
+def exportar_puntuador(pipe, ruta, textos_validacion):
+    """Guarda el artefacto plano y valida PuntuadorLineal contra `pipe` (ValueError si alguna etiqueta difiere)"""
+    guardar_artefacto(pipe, ruta)
+    puntuador = PuntuadorLineal(ruta)
+    textos = list(textos_validacion)
+    esperadas, obtenidas = pipe.predict(textos), puntuador.predict(textos)
+    distintas = np.flatnonzero(esperadas != obtenidas)
+    if len(distintas):
+        raise ValueError(f"El puntuador difiere del pipeline en {len(distintas)} de {len(textos)} textos "
+                         f"(p. ej. {textos[distintas[0]]!r}: {obtenidas[distintas[0]]} en vez de {esperadas[distintas[0]]})")
+    return puntuador
+
+
+def cargar_modelo(ruta):
+    """Modelo para predecir: Pipeline si es .joblib, PuntuadorLineal (solo NumPy) si es artefacto plano
+
+    Para servir basta con predict; el puntuador solo toca las columnas de los términos de
+    cada mensaje, mientras que el clasificador de sklearn convierte a float64 todos los
+    coeficientes float32 en cada llamada.
+    """
+    if Path(ruta).suffix == ".joblib":
+        import joblib
+        return joblib.load(ruta)
+    return PuntuadorLineal(ruta)
@@ -0,0 +1,129 @@
+# Calibración del umbral de decisión para clasificadores binarios con probabilidades (spam)
+# - CalibradorUmbral guarda dos histogramas de probabilidades (positivos y negativos) con
+#   `bins` cubetas: es una ordenación por conteo, así que una suma acumulada desde la
+#   cubeta más alta da TP/FP para todos los umbrales candidatos en una sola pasada
+# - Elige el umbral para una precisión objetivo (el de mayor recall que la cumple) o para
+#   un coste de falsos positivos / falsos negativos (el de menor coste); si varios empatan,
+#   el centro del tramo
+# - actualizar suma nuevas etiquetas (feedback de revisión) a los histogramas y recalcula
+#   el umbral en O(lote + bins): sin precision_recall_curve sobre todo el histórico ni reentrenar
+# - ClasificadorUmbral envuelve el pipeline: predict aplica el umbral calibrado y el umbral
+#   viaja dentro del .joblib (y del artefacto plano, ver comun/artefactos.py)
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.model_selection import cross_val_predict
+
+
+class CalibradorUmbral:
+    """Umbral sobre probabilidades elegido a partir de histogramas acumulables"""
+
+    def __init__(self, objetivo="precision", precision_objetivo=0.95, coste_fp=1.0, coste_fn=1.0, bins=1000):
+        if objetivo not in ("precision", "coste"):
+            raise ValueError("objetivo debe ser 'precision' o 'coste'")
+        self.objetivo = objetivo
+        self.precision_objetivo = precision_objetivo
+        self.coste_fp = coste_fp
+        self.coste_fn = coste_fn
+        self.bins = bins
+        # Umbrales candidatos: los bordes de las cubetas (prob >= bordes[i] <=> cubeta >= i);
+        # el último queda justo por encima de 1.0 para que sea "no marcar nada"
+        self.bordes = np.linspace(0.0, 1.0, bins + 1)
+        self.bordes[-1] = np.nextafter(1.0, 2.0)
+        self.positivos = np.zeros(bins, dtype=np.int64)
+        self.negativos = np.zeros(bins, dtype=np.int64)
+        self.umbral_ = 0.5
+
+    def parametros(self):
+        return {"objetivo": self.objetivo, "precision_objetivo": self.precision_objetivo,
+                "coste_fp": self.coste_fp, "coste_fn": self.coste_fn, "bins": self.bins}
+
+    def _cubetas(self, probs):
+        return np.clip(np.searchsorted(self.bordes, probs, side="right") - 1, 0, self.bins - 1)
+
+    def ajustar(self, probs, y):
+        """Calibra desde cero con probabilidades de la clase positiva y etiquetas 0/1"""
+        self.positivos[:] = 0
+        self.negativos[:] = 0
+        return self.actualizar(probs, y)
+
+    def actualizar(self, probs, y):
+        """Suma nuevas observaciones etiquetadas y recalcula el umbral"""
+        cubetas = self._cubetas(np.asarray(probs, dtype=np.float64))
+        positivo = np.asarray(y).astype(bool)
+        self.positivos += np.bincount(cubetas[positivo], minlength=self.bins)
+        self.negativos += np.bincount(cubetas[~positivo], minlength=self.bins)
+        self.umbral_ = float(self.bordes[self._elegir()])
+        return self
+
+    def _acumulados(self):
+        """TP y FP para cada umbral candidato bordes[i] (i = 0..bins; bins = no marcar nada)"""
+        tp = np.concatenate([np.cumsum(self.positivos[::-1])[::-1], [0]])
+        fp = np.concatenate([np.cumsum(self.negativos[::-1])[::-1], [0]])
+        return tp, fp
+
+    def _elegir(self):
+        tp, fp = self._acumulados()
+        if self.objetivo == "coste":
+            coste = self.coste_fp * fp + self.coste_fn * (tp[0] - tp)
+            return self._centro(coste == coste.min())
+        with np.errstate(invalid="ignore", divide="ignore"):
+            precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        cumplen = np.flatnonzero((precision >= self.precision_objetivo) & (tp > 0))
+        if len(cumplen):
+            # El umbral más bajo que cumple la precisión tiene el mayor recall; con ese
+            # recall, los de menos falsos positivos
+            mejor = (tp == tp[cumplen[0]])
+            return self._centro(mejor & (fp == fp[mejor].min()))
+        return self._centro(precision == precision.max())  # ninguno la alcanza: la mayor precisión
+
+    @staticmethod
+    def _centro(optimos):
+        """Centro del primer tramo de umbrales óptimos: entre cubetas vacías todos dan el mismo
+        resultado en los datos vistos, y el centro deja margen a ambos lados"""
+        indices = np.flatnonzero(optimos)
+        fin = np.flatnonzero(np.diff(indices) > 1)
+        indices = indices[:fin[0] + 1] if len(fin) else indices
+        return int(indices[len(indices) // 2])
+
+    def resumen(self):
+        """Precisión, recall y falsos positivos estimados con el umbral actual"""
+        tp, fp = self._acumulados()
+        i = int(np.searchsorted(self.bordes, self.umbral_))
+        return {"umbral": self.umbral_, "precision": float(tp[i] / max(tp[i] + fp[i], 1)),
+                "recall": float(tp[i] / max(tp[0], 1)), "falsos_positivos": int(fp[i]),
+                "observaciones": int(tp[0] + fp[0])}
+
+
+class ClasificadorUmbral(ClassifierMixin, BaseEstimator):
+    """Pipeline binario con predict_proba + CalibradorUmbral: predict usa el umbral calibrado"""
+
+    def __init__(self, pipeline, calibrador, cv=5):
+        self.pipeline = pipeline
+        self.calibrador = calibrador
+        self.cv = cv
+
+    def fit(self, X, y):
+        """Entrena el pipeline y calibra con probabilidades fuera de pliegue (cross_val_predict)"""
+        probs = cross_val_predict(clone(self.pipeline), X, y, cv=self.cv, method="predict_proba")[:, 1]
+        self.pipeline.fit(X, y)
+        self.calibrador.ajustar(probs, np.asarray(y) == self.classes_[1])
+        return self
+
+    @property
+    def classes_(self):
+        return self.pipeline.classes_
+
+    @property
+    def umbral(self):
+        return self.calibrador.umbral_
+
+    def predict_proba(self, X):
+        return self.pipeline.predict_proba(X)
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] >= self.umbral).astype(int)]
+
+    def actualizar(self, X, y):
+        """Recalibra con mensajes revisados (feedback), sin reentrenar el pipeline"""
+        self.calibrador.actualizar(self.predict_proba(X)[:, 1], np.asarray(y) == self.classes_[1])
+        return self
@@ -0,0 +1,123 @@
+# Motor de crawling asíncrono compartido por los scrapers (libros y Hacker News)
+# - Conexiones keep-alive reutilizadas a través de una única sesión con pool
+# - Límite de peticiones simultáneas (concurrencia)
+# - Tope de peticiones por segundo para cada host
+# - Opcionalmente, ritmo adaptativo y reintentos con comun.pacing.AdaptivePacer
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from comun.http_cache import CachedSession
+
+
+def create_session(headers=None, pool_size=10, cache=None):
+    """Crea una sesión HTTP con un pool de conexiones keep-alive
+
+    Si se pasa una HTTPCache, la sesión revalida cada GET contra ella.
+    """
+    session = CachedSession(cache) if cache is not None else requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def response_text(response):
+    """Texto de la respuesta decodificado correctamente
+
+    Si la cabecera Content-Type no declara charset, requests asume ISO-8859-1 y
+    el '£' (UTF-8) llega como 'Â£'; en ese caso se decodifica como UTF-8.
+    """
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        response.encoding = 'utf-8'
+    return response.text
+
+
+class HostRateLimiter:
+    """Reparte turnos para no superar N peticiones por segundo en cada host"""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+
+    async def wait(self, url):
+        """Espera hasta que el host de la URL tenga un turno libre"""
+        if not self.interval:
+            return
+
+        # El cálculo del turno no tiene ningún await, así que es atómico en el event loop
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class _ParseError(Exception):
+    """Fallo del callback parse (y no de la descarga) para una URL"""
+
+
+class AsyncFetcher:
+    """Descarga URLs en paralelo sobre una sesión compartida"""
+
+    def __init__(self, session, concurrency=8, requests_per_second=None, timeout=30, pacer=None):
+        self.session = session
+        self.timeout = timeout
+        self.pacer = pacer
+        self.limiter = HostRateLimiter(requests_per_second)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Un hilo por petición en vuelo: requests es bloqueante
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._executor.shutdown(wait=True)
+
+    def _get(self, url, parse, missing_ok=False):
+        if self.pacer is not None:
+            response = self.pacer.request(self.session, url, timeout=self.timeout)
+        else:
+            response = self.session.get(url, timeout=self.timeout)
+        if not (missing_ok and response.status_code == 404):
+            response.raise_for_status()
+        if not parse:
+            return response
+        # Parsear en el mismo hilo solapa el parseo con las descargas pendientes
+        try:
+            return parse(response)
+        except Exception as e:  # un HTML truncado o inesperado no debe tumbar el crawl entero
+            raise _ParseError(e) from e
+
+    async def fetch(self, url, parse=None, missing_ok=False):
+        """Descarga una URL (y opcionalmente la parsea); devuelve None si falla
+
+        Como en el bucle secuencial, un fallo de red o de parseo solo pierde esa URL.
+
+        Con missing_ok=True un 404 no cuenta como fallo: la respuesta llega a parse
+        (p. ej. para detectar el final de un listado paginado).
+        """
+        async with self._semaphore:
+            await self.limiter.wait(url)
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._executor, self._get, url, parse, missing_ok)
+            except requests.RequestException as e:
+                print(f"Error al acceder a {url}: {e}")
+                return None
+            except _ParseError as e:
+                print(f"Error al procesar {url}: {e.__cause__!r}")
+                return None
+
+    async def fetch_all(self, urls, parse=None):
+        """Descarga todas las URLs y devuelve los resultados en el mismo orden"""
+        return await asyncio.gather(*(self.fetch(url, parse) for url in urls))
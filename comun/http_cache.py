@@ -0,0 +1,181 @@
+# Caché HTTP persistente en disco con GET condicional
+# - Guarda el cuerpo y las cabeceras ETag / Last-Modified de cada respuesta
+# - En las siguientes peticiones envía If-None-Match / If-Modified-Since
+# - Un 304 se responde con el cuerpo guardado en disco (solo viajan las cabeceras)
+# - Las entradas caducan tras `ttl` segundos y el directorio se mantiene por
+#   debajo de `max_bytes` expulsando primero las entradas menos usadas (LRU)
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Cabeceras que merece la pena conservar para reconstruir la respuesta
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HTTPCache:
+    """Almacén de respuestas en disco con caducidad y tamaño máximo"""
+
+    def __init__(self, directory='.http_cache', ttl=7 * 24 * 3600, max_bytes=100 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Tamaño del directorio: se mide en el primer store(), no al construir la caché
+        # (los scrapers la crean al importarse y recorrer el directorio crece con él)
+        self._total_bytes = None
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.body'
+
+    def _entries(self):
+        """Recorre las entradas guardadas: (ruta_meta, tamaño, último_uso)"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                body_stat = os.stat(body_path)
+                size = body_stat.st_size + os.path.getsize(meta_path)
+            except OSError:
+                continue
+            yield meta_path, size, body_stat.st_mtime
+
+    def _remove(self, meta_path):
+        body_path = meta_path[:-len('.json')] + '.body'
+        freed = 0
+        for path in (meta_path, body_path):
+            try:
+                freed += os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                pass
+        return freed
+
+    def lookup(self, url):
+        """Devuelve (metadatos, cuerpo) de una URL o None si no está o caducó"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - meta['stored_at'] > self.ttl:
+            with self._lock:
+                freed = self._remove(meta_path)
+                if self._total_bytes is not None:
+                    self._total_bytes -= freed
+            return None
+        return meta, body
+
+    def store(self, url, response):
+        """Guarda una respuesta 200 que traiga validadores (ETag o Last-Modified)"""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = json.dumps({'url': url, 'headers': headers, 'stored_at': time.time()})
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            previous = sum(os.path.getsize(p) for p in (meta_path, body_path) if os.path.exists(p))
+            # Escritura atómica: nunca queda un cuerpo a medias si el proceso muere
+            for path, data, mode in ((body_path, response.content, 'wb'), (meta_path, meta, 'w')):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            self._total_bytes += os.path.getsize(meta_path) + os.path.getsize(body_path) - previous
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url, meta):
+        """Marca una entrada como revalidada (tras un 304) y usada recientemente"""
+        meta_path, body_path = self._paths(url)
+        meta['stored_at'] = time.time()
+        try:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Borra entradas caducadas y luego las menos usadas hasta bajar del 90% del límite"""
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        target = self.max_bytes * 0.9
+
+        for meta_path, size, last_used in entries:
+            expired = now - last_used > self.ttl
+            if not expired and self._total_bytes <= target:
+                continue
+            self._total_bytes -= self._remove(meta_path)
+
+
+class CachedSession(requests.Session):
+    """Sesión de requests que revalida los GET contra la caché en disco"""
+
+    def __init__(self, cache=None):
+        super().__init__()
+        self.cache = cache if cache is not None else HTTPCache()
+        self.bytes_downloaded = 0
+        self.cache_hits = 0
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET' or kwargs.get('stream'):
+            return super().request(method, url, *args, **kwargs)
+
+        key = requests.Request('GET', url, params=kwargs.get('params')).prepare().url
+        cached = self.cache.lookup(key)
+
+        if cached:
+            meta, _ = cached
+            conditional = dict(kwargs.get('headers') or {})
+            if 'ETag' in meta['headers']:
+                conditional['If-None-Match'] = meta['headers']['ETag']
+            if 'Last-Modified' in meta['headers']:
+                conditional['If-Modified-Since'] = meta['headers']['Last-Modified']
+            kwargs['headers'] = conditional
+
+        response = super().request(method, url, *args, **kwargs)
+
+        if response.status_code == 304 and cached:
+            meta, body = cached
+            self.cache.refresh(key, meta)
+            self.cache_hits += 1
+            return self._from_cache(response, meta, body)
+
+        self.bytes_downloaded += len(response.content)
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    @staticmethod
+    def _from_cache(response, meta, body):
+        """Convierte el 304 recibido en un 200 con el cuerpo guardado"""
+        headers = CaseInsensitiveDict(response.headers)
+        headers.update(meta['headers'])
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = headers
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(headers)
+        response.from_cache = True
+        return response
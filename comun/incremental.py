@@ -0,0 +1,40 @@
+# Piezas comunes para entrenar clasificadores de texto lote a lote (partial_fit)
+# - HashingVectorizer: espacio de características fijo, sin vocabulario que reajustar,
+#   así que cada lote se transforma sin ver los anteriores
+# - Pesos por clase que equilibran las clases vistas hasta el momento
+#   (class_weight="balanced" no admite partial_fit)
+# Lo usan codelab2/.../entrenamiento_streaming.py y codelab3/.../aprendizaje_online.py.
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+def vectorizador_hashing(n_features=2**20, ngram_range=(1, 2)):
+    """HashingVectorizer de unigramas y bigramas para el texto ya normalizado"""
+    # alternate_sign=False: todas las cuentas positivas, como el TF-IDF de los main.py
+    return HashingVectorizer(n_features=n_features, ngram_range=ngram_range, alternate_sign=False)
+
+
+def codigos_clase(y, clases):
+    """Posición de cada etiqueta de `y` en `clases`; ValueError si alguna no está"""
+    y = np.asarray(y)
+    codigos = np.full(len(y), -1, dtype=np.int64)
+    for i, clase in enumerate(clases):
+        codigos[y == clase] = i
+    if (codigos < 0).any():
+        desconocidas = ", ".join(sorted({str(etiqueta) for etiqueta in y[codigos < 0]}))
+        raise ValueError(f"Etiquetas desconocidas: {desconocidas} (se esperaba una de: "
+                         f"{', '.join(str(clase) for clase in clases)})")
+    return codigos
+
+
+def pesos_balanceados(y, conteos, clases, actualizar=True):
+    """Peso de cada fila: total / (k * conteo de su clase), con los conteos vistos hasta ahora
+
+    `conteos` (un entero por clase) se actualiza en sitio con `y` si actualizar=True;
+    con False se usan tal cual (p. ej. en pasadas posteriores sobre el mismo corpus).
+    """
+    codigos = codigos_clase(y, clases)
+    if actualizar:
+        conteos += np.bincount(codigos, minlength=len(clases))
+    pesos = conteos.sum() / (len(clases) * np.maximum(conteos, 1))
+    return pesos[codigos]
@@ -0,0 +1,36 @@
+# Normalización de texto compartida por los clasificadores (triage y spam)
+# Mismo resultado que la limpieza original de los codelabs:
+#   minúsculas -> todo lo que no sea [a-záéíóúñü0-9\s] pasa a espacio -> espacios compactados
+# pero sin expresiones regulares por mensaje:
+# - Todo lo que se conserva cabe en Latin-1, así que el texto se codifica a Latin-1
+#   (lo que no cabe queda como '?', que igualmente pasa a espacio) y una tabla de
+#   256 bytes hace la sustitución en una sola pasada de bytes.translate
+# - Los espacios se compactan con split/join (mismo criterio que \s)
+# - TABLA y limpiar viven en comun.puntuador (solo NumPy), que limpia igual al puntuar
+#   los artefactos planos: una sola definición para el pipeline y el puntuador
+# - limpiar_lote procesa listas, Series y arrays de golpe
+# - NormalizadorTexto es un paso de Pipeline: el .joblib incluye la limpieza
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from comun.puntuador import limpiar
+
+
+def limpiar_lote(textos):
+    """limpiar sobre muchos textos: lista -> lista, Series -> Series (mismo índice), array -> array"""
+    limpios = list(map(limpiar, textos))
+    if hasattr(textos, "index") and hasattr(textos, "to_numpy"):  # pandas.Series
+        return type(textos)(limpios, index=textos.index, name=textos.name)
+    if isinstance(textos, np.ndarray):
+        return np.array(limpios, dtype=object)
+    return limpios
+
+
+class NormalizadorTexto(TransformerMixin, BaseEstimator):
+    """Paso de Pipeline que aplica limpiar_lote (sin parámetros que aprender)"""
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return limpiar_lote(X)
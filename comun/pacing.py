@@ -0,0 +1,147 @@
+# Control adaptativo del ritmo de peticiones (AIMD)
+# - Sube el ritmo de forma aditiva mientras el servidor responde rápido y sin errores
+# - Lo reduce de forma multiplicativa ante 429/503, errores de red o latencia alta
+# - Respeta la cabecera Retry-After: todas las peticiones esperan hasta ese momento
+# - Reintenta los errores transitorios con backoff exponencial con jitter
+# Es seguro entre hilos: lo comparten el modo secuencial y los hilos del modo asíncrono.
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+# 429 y 503 son la forma explícita de pedir que bajemos el ritmo
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = THROTTLE_STATUSES | {500, 502, 504}
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+def parse_retry_after(value):
+    """Segundos indicados por Retry-After (número o fecha HTTP); None si no es válido"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptivePacer:
+    """Ritmo de peticiones por segundo ajustado con aumento aditivo / disminución multiplicativa"""
+
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=50.0, increase=0.5, decrease=0.5,
+                 target_latency=2.0, max_retries=4, backoff_base=0.5, backoff_cap=30.0):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self.requests = 0
+        self.successes = 0
+        self.retries = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.network_errors = 0
+
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+
+    def wait(self):
+        """Bloquea hasta el siguiente turno libre según el ritmo actual"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._paused_until)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _slow_down(self, now):
+        # Las respuestas de peticiones que ya estaban en vuelo no vuelven a
+        # dividir el ritmo: como mucho una reducción por intervalo actual
+        if now - self._last_decrease >= 1.0 / self.rate:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._last_decrease = now
+
+    def record(self, status=None, latency=0.0, retry_after=None):
+        """Ajusta el ritmo con el resultado de una petición (status=None: error de red)"""
+        with self._lock:
+            now = time.monotonic()
+            self.requests += 1
+            if status is None:
+                self.network_errors += 1
+                self._slow_down(now)
+            elif status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._slow_down(now)
+            elif status in RETRY_STATUSES:
+                self.server_errors += 1
+                self._slow_down(now)
+            elif latency > self.target_latency:
+                self.successes += 1
+                self._slow_down(now)
+            else:
+                self.successes += 1
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def _count_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def backoff(self, attempt, retry_after=None):
+        """Espera antes de un reintento: jitter completo sobre un tope exponencial"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        time.sleep(max(delay, retry_after or 0.0))
+
+    def request(self, session, url, **kwargs):
+        """GET con control de ritmo y reintentos de los errores transitorios
+
+        Devuelve la última respuesta (aunque sea un error tras agotar los reintentos)
+        o relanza el último error de red.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.wait()
+            start = time.monotonic()
+            try:
+                response = session.get(url, **kwargs)
+            except RETRY_EXCEPTIONS:
+                self.record(None)
+                if attempt == self.max_retries:
+                    raise
+                self._count_retry()
+                self.backoff(attempt)
+                continue
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.record(response.status_code, time.monotonic() - start, retry_after)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            self._count_retry()
+            self.backoff(attempt, retry_after)
+        return response
+
+    def stats(self):
+        """Ritmo actual y contadores de peticiones"""
+        return {
+            'rate': round(self.rate, 2),
+            'requests': self.requests,
+            'successes': self.successes,
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'server_errors': self.server_errors,
+            'network_errors': self.network_errors,
+        }
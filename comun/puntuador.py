@@ -0,0 +1,209 @@
+# Puntuador ligero (solo NumPy) para los artefactos planos de comun/artefactos.py
+# Para servir un modelo lineal fijo no hace falta importar scikit-learn:
+# - Limpieza (la de comun.normalizacion) + tokenización y n-gramas como el analizador
+#   'word' de TfidfVectorizer
+# - Búsqueda de los n-gramas en la tabla ordenada de términos (un searchsorted por lote)
+# - TF-IDF + normalización por fila y producto por los coeficientes, sumando en el mismo
+#   orden que sklearn (columnas crecientes por fila): las puntuaciones coinciden bit a bit
+#   con el Pipeline que devuelve cargar_artefacto
+# - argmax / signo para la etiqueta; sigmoide o softmax para las probabilidades
+# - Si el artefacto trae umbral calibrado (comun/calibracion.py), predict marca la clase
+#   positiva cuando su probabilidad llega al umbral, igual que ClasificadorUmbral
+# Importa solo numpy y la biblioteca estándar; comun.artefactos.exportar_puntuador lo
+# valida contra el pipeline entrenado.
+#
+# Uso: python -m comun.puntuador pipeline_triage.plano "mensaje 1" "mensaje 2" ...
+#      (sin mensajes, lee uno por línea de la entrada estándar)
+import json
+import math
+import re
+import sys
+import unicodedata
+
+import numpy as np
+
+MAGICO = b"CLPLANO1"
+
+# Limpieza de texto de los clasificadores (definición única: comun.normalizacion la
+# importa de aquí para NormalizadorTexto, así el pipeline y el puntuador no divergen).
+# Caracteres que se conservan tal cual; los espacios de Latin-1 se unifican en ' '
+CONSERVADOS = re.compile(r"[a-záéíóúñü0-9]")
+TABLA = bytes(codigo if CONSERVADOS.match(chr(codigo)) else ord(" ") for codigo in range(256))
+
+
+def limpiar(s: str) -> str:
+    """Minúsculas, signos raros a espacio y espacios compactados"""
+    return " ".join(s.lower().encode("latin-1", "replace").translate(TABLA).decode("latin-1").split())
+
+
+def leer_artefacto(ruta):
+    """(cabecera, arrays) del artefacto; los arrays son vistas de solo lectura del archivo mapeado"""
+    with open(ruta, "rb") as f:
+        if f.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"{ruta} no es un artefacto plano")
+        cabecera = json.loads(f.read(int.from_bytes(f.read(8), "little")))
+    datos = np.memmap(ruta, dtype=np.uint8, mode="r")
+    arrays = {}
+    for nombre, seccion in cabecera["secciones"].items():
+        dtype = np.dtype(seccion["dtype"])
+        tamano = dtype.itemsize * int(np.prod(seccion["shape"]))
+        arrays[nombre] = datos[seccion["offset"]:seccion["offset"] + tamano].view(dtype).reshape(seccion["shape"])
+    return cabecera, arrays
+
+
+def contar_ngramas(textos, analizar, terminos):
+    """(n_textos, filas, columnas, conteos) de los n-gramas de `textos` que están en `terminos`
+
+    Se analizan todos los textos y se buscan todos los n-gramas en la tabla ordenada
+    (bytes UTF-8) con un único searchsorted. El resultado sale ordenado por fila y
+    columna, sin duplicados: sirve tal cual para una CSR canónica.
+    """
+    ngramas, limites = [], [0]
+    for texto in textos:
+        ngramas.extend(analizar(texto))
+        limites.append(len(ngramas))
+    n_textos = len(limites) - 1
+
+    consulta = np.array([ngrama.encode("utf-8") for ngrama in ngramas], dtype=bytes)
+    posiciones = np.minimum(terminos.searchsorted(consulta), len(terminos) - 1)
+    encontrados = terminos[posiciones] == consulta
+    filas = np.repeat(np.arange(n_textos), np.diff(limites))[encontrados]
+    claves, conteos = np.unique(filas * len(terminos) + posiciones[encontrados], return_counts=True)
+    filas, columnas = np.divmod(claves, len(terminos))
+    return n_textos, filas, columnas, conteos
+
+
+def _exp(x):
+    """math.exp que desborda a infinito como la exp de C (y expit) en vez de lanzar OverflowError"""
+    try:
+        return math.exp(x)
+    except OverflowError:  # x > ~709.78: la sigmoide da exactamente 0, igual que expit
+        return math.inf
+
+
+def _sin_acentos_unicode(s):
+    try:
+        s.encode("ASCII", errors="strict")
+        return s
+    except UnicodeEncodeError:
+        return "".join([c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c)])
+
+
+def _sin_acentos_ascii(s):
+    return unicodedata.normalize("NFKD", s).encode("ASCII", "ignore").decode("ASCII")
+
+
+class PuntuadorLineal:
+    """predict / decision_function / predict_proba de un artefacto plano, sin sklearn"""
+
+    def __init__(self, ruta):
+        cabecera, arrays = leer_artefacto(ruta)
+        parametros = cabecera["vectorizador"]
+        if parametros["analyzer"] != "word" or isinstance(parametros["stop_words"], str):
+            raise ValueError("El puntuador solo admite analyzer='word' y stop_words None o lista")
+        self.normalizar = cabecera["normalizar"]
+        self.minusculas = parametros["lowercase"]
+        self.sin_acentos = {None: None, "unicode": _sin_acentos_unicode,
+                            "ascii": _sin_acentos_ascii}[parametros["strip_accents"]]
+        self.patron = re.compile(parametros["token_pattern"])
+        self.stop_words = frozenset(parametros["stop_words"]) if parametros["stop_words"] else None
+        self.min_n, self.max_n = parametros["ngram_range"]
+        self.binario = parametros["binary"]
+        self.sublineal = parametros["sublinear_tf"]
+        self.norma = parametros["norm"]
+        self.dtype = np.dtype(parametros["dtype"])
+
+        self.terminos = arrays["terminos"]
+        self.idf = arrays.get("idf")
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.classes_ = np.array(cabecera["clases"], dtype=cabecera["dtype_clases"])
+        self.probabilidades = cabecera.get("probabilidades")
+        self.umbral = (cabecera.get("calibrador") or {}).get("umbral")
+
+    def analizar(self, texto):
+        """n-gramas del texto, como build_analyzer() del pipeline (incluida la limpieza)"""
+        if self.normalizar:
+            texto = limpiar(texto)
+        if self.minusculas:
+            texto = texto.lower()
+        if self.sin_acentos is not None:
+            texto = self.sin_acentos(texto)
+        tokens = self.patron.findall(texto)
+        if self.stop_words is not None:
+            tokens = [t for t in tokens if t not in self.stop_words]
+        if self.max_n == 1:
+            return tokens
+        originales, n_originales = tokens, len(tokens)
+        tokens = list(originales) if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), min(self.max_n + 1, n_originales + 1)):
+            for i in range(n_originales - n + 1):
+                tokens.append(" ".join(originales[i:i + n]))
+        return tokens
+
+    def _caracteristicas(self, textos):
+        """(filas, columnas, valores) de la matriz TF-IDF, ordenadas por fila y columna"""
+        n_textos, filas, columnas, conteos = contar_ngramas(textos, self.analizar, self.terminos)
+        valores = np.ones(len(conteos), dtype=self.dtype) if self.binario else conteos.astype(self.dtype)
+        if self.sublineal:
+            np.log(valores, valores)
+            valores += 1.0
+        if self.idf is not None:
+            valores *= self.idf[columnas]
+        if self.norma == "l2":
+            valores /= np.sqrt(np.bincount(filas, valores * valores, minlength=n_textos))[filas]
+        elif self.norma == "l1":
+            valores /= np.bincount(filas, np.abs(valores), minlength=n_textos)[filas]
+        return n_textos, filas, columnas, valores
+
+    def decision_function(self, textos):
+        if isinstance(textos, str):
+            raise ValueError("Se esperaba una lista de textos, no un único str")
+        n_textos, filas, columnas, valores = self._caracteristicas(textos)
+        puntos = np.empty((n_textos, len(self.coef)))
+        for clase, coef in enumerate(self.coef):
+            puntos[:, clase] = np.bincount(filas, valores * coef[columnas], minlength=n_textos)
+        puntos += self.intercept
+        return puntos.ravel() if puntos.shape[1] == 1 else puntos
+
+    def predict(self, textos):
+        if self.umbral is not None:
+            return self.classes_[(self.predict_proba(textos)[:, 1] >= self.umbral).astype(int)]
+        puntos = self.decision_function(textos)
+        indices = (puntos > 0).astype(int) if puntos.ndim == 1 else puntos.argmax(axis=1)
+        return self.classes_[indices]
+
+    def predict_proba(self, textos):
+        if self.probabilidades is None:
+            raise AttributeError("El clasificador exportado no da probabilidades")
+        puntos = self.decision_function(textos)
+        if self.probabilidades == "softmax":
+            if puntos.ndim == 1:
+                puntos = np.c_[-puntos, puntos]
+            puntos -= puntos.max(axis=1, keepdims=True)
+            np.exp(puntos, puntos)
+            puntos /= puntos.sum(axis=1, keepdims=True)
+            return puntos
+        # Uno contra el resto (LogisticRegression liblinear/binaria): sigmoide y normalización.
+        # math.exp (libm, como scipy.special.expit) en vez de np.exp: mismas probabilidades
+        # bit a bit, que importan al comparar con un umbral
+        prob = 1 / (1 + np.array([_exp(-x) for x in puntos.ravel().tolist()]).reshape(puntos.shape))
+        if prob.ndim == 1:
+            return np.vstack([1 - prob, prob]).T
+        return prob / prob.sum(axis=1, keepdims=True)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Uso: python -m comun.puntuador modelo.plano [mensaje ...]", file=sys.stderr)
+        return 2
+    puntuador = PuntuadorLineal(argv[0])
+    textos = argv[1:] or [linea.rstrip("\n") for linea in sys.stdin]
+    for texto, etiqueta in zip(textos, puntuador.predict(textos)):
+        print(f"{etiqueta}\t{texto}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
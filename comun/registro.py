@@ -0,0 +1,85 @@
+# Registro de versiones de un modelo para cambiarlo en caliente mientras se sirve
+# - La versión publicada es una única tupla (versión, modelo): publicar la reemplaza con
+#   una asignación, así que quien llama a actual() recibe siempre una versión completa
+#   (la anterior o la nueva, nunca una a medias) sin tomar ningún lock
+# - Cada petición toma actual() una vez y usa ese modelo de principio a fin: las
+#   peticiones en curso terminan con su versión y no se pierde ninguna durante el cambio
+# - Quien publica entrega un modelo que ya no va a modificar (p. ej. una copia)
+# - Con `ruta`, publicar también escribe el modelo en disco de forma atómica (archivo
+#   temporal + fsync + os.replace); otros procesos lo recogen con sincronizar()/vigilar(),
+#   que solo hacen un stat mientras el archivo no cambie (no se recarga por petición)
+import os
+import threading
+from pathlib import Path
+
+import joblib
+
+
+class RegistroModelos:
+    """Versión publicada de un modelo: lecturas sin bloqueo y cambio atómico de versión"""
+
+    def __init__(self, modelo=None, ruta=None):
+        self.ruta = Path(ruta) if ruta else None
+        self._lock = threading.Lock()  # solo entre quienes publican o sincronizan
+        self._firma = None
+        self._publicado = (0 if modelo is None else 1, modelo)
+        if modelo is None and self.ruta is not None:
+            self.sincronizar()
+
+    def actual(self):
+        """(versión, modelo) publicados; el modelo es None si aún no hay ninguno"""
+        return self._publicado
+
+    @property
+    def version(self):
+        return self._publicado[0]
+
+    def publicar(self, modelo):
+        """Publica `modelo` como nueva versión (y en disco si hay ruta); devuelve la versión"""
+        with self._lock:
+            version = self._publicado[0] + 1
+            if self.ruta is not None:
+                temporal = self.ruta.with_name(f".{self.ruta.name}.{os.getpid()}.tmp")
+                with open(temporal, "wb") as f:
+                    joblib.dump({"version": version, "modelo": modelo}, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporal, self.ruta)  # los lectores ven el archivo viejo o el nuevo, entero
+                self._firma = self._firma_archivo()
+            self._publicado = (version, modelo)
+        return version
+
+    def _firma_archivo(self):
+        try:
+            estado = os.stat(self.ruta)
+        except FileNotFoundError:
+            return None
+        # os.replace cambia el inodo aunque el tamaño y la fecha coincidan
+        return estado.st_ino, estado.st_mtime_ns, estado.st_size
+
+    def sincronizar(self):
+        """Carga la versión del archivo si cambió desde la última vez; True si cambió de modelo"""
+        firma = self._firma_archivo()
+        if firma is None or firma == self._firma:
+            return False
+        datos = joblib.load(self.ruta)  # fuera del lock: las lecturas siguen con la versión actual
+        with self._lock:
+            self._firma = firma
+            if datos["version"] <= self._publicado[0]:
+                return False
+            self._publicado = (datos["version"], datos["modelo"])
+        return True
+
+    def vigilar(self, intervalo=1.0):
+        """Hilo que sincroniza cada `intervalo` segundos; devuelve el Event que lo detiene"""
+        parar = threading.Event()
+
+        def bucle():
+            while not parar.wait(intervalo):
+                try:
+                    self.sincronizar()
+                except Exception as error:  # un archivo ilegible no debe tumbar el servicio
+                    print(f"⚠️ No se pudo recargar {self.ruta}: {error}")
+
+        threading.Thread(target=bucle, name="registro-modelos", daemon=True).start()
+        return parar
@@ -0,0 +1,68 @@
+# Selección de hiperparámetros para los pipelines de texto (triage y spam)
+# - HalvingGridSearchCV (successive halving): todas las configuraciones empiezan con una
+#   muestra pequeña y solo la mejor fracción (1/factor) pasa a la ronda siguiente, con
+#   factor veces más datos; las configuraciones malas se descartan pronto
+# - Pipeline(memory=...): los pasos de transformación ya ajustados (limpieza, TF-IDF) se
+#   guardan en disco y se reutilizan entre candidatos que solo cambian el clasificador
+#   (mismo pliegue y mismos parámetros del vectorizador = no se vuelve a vectorizar)
+# - n_jobs=-1: pliegues y candidatos en paralelo en todos los núcleos (los procesos de
+#   joblib comparten la misma caché en disco)
+# - reportar_seleccion imprime cada candidato con su tiempo y las rondas del halving
+import tempfile
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+from joblib import Memory
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
+
+# Rejilla común del vectorizador; cada script añade la regularización de su clasificador
+REJILLA_TFIDF = {
+    "tfidfvectorizer__max_features": [10000, 30000],
+    "tfidfvectorizer__ngram_range": [(1, 1), (1, 2)],
+    "tfidfvectorizer__min_df": [1, 2],
+}
+
+
+def seleccionar_modelo(pipe, rejilla, X, y, scoring="f1_macro", cv=5, factor=3, n_jobs=-1,
+                       cache=None, random_state=42):
+    """Busca la mejor configuración de `pipe` en `rejilla`; devuelve el HalvingGridSearchCV ajustado
+
+    `cache` es el directorio para los transformadores ajustados (por defecto, uno temporal
+    que se borra al terminar). best_estimator_ queda reentrenado con todo X y sin caché.
+    """
+    with nullcontext(cache) if cache else tempfile.TemporaryDirectory() as directorio:
+        busqueda = HalvingGridSearchCV(
+            clone(pipe).set_params(memory=Memory(directorio, verbose=0)), rejilla,
+            scoring=scoring, cv=cv, factor=factor, n_jobs=n_jobs, random_state=random_state,
+        )
+        inicio = time.perf_counter()
+        busqueda.fit(X, y)
+        busqueda.segundos_ = time.perf_counter() - inicio
+    busqueda.best_estimator_.set_params(memory=None)  # el .joblib no depende del directorio de caché
+    return busqueda
+
+
+def reportar_seleccion(busqueda, mejores=10):
+    """Rondas del halving, los mejores candidatos con su tiempo y la configuración elegida"""
+    resultados = pd.DataFrame(busqueda.cv_results_)
+    # Tiempo de cada candidato: ajuste + evaluación sumados sobre sus pliegues
+    resultados["segundos"] = (resultados["mean_fit_time"] + resultados["mean_score_time"]) * busqueda.n_splits_
+    resultados["parametros"] = resultados["params"].map(
+        lambda p: ", ".join(f"{k.split('__')[-1]}={v}" for k, v in p.items()))
+
+    print(f"\n🔎 Selección de modelo: {busqueda.n_candidates_[0]} candidatos, {busqueda.n_iterations_} rondas, "
+          f"{busqueda.n_splits_} pliegues, {busqueda.segundos_:.1f} s en total")
+    for ronda, (candidatos, muestras) in enumerate(zip(busqueda.n_candidates_, busqueda.n_resources_)):
+        segundos = resultados.loc[resultados["iter"] == ronda, "segundos"].sum()
+        print(f"  Ronda {ronda}: {candidatos} candidatos con {muestras} muestras ({segundos:.1f} s de cómputo)")
+
+    ultima = resultados[resultados["iter"] == resultados["iter"].max()]
+    tabla = ultima.sort_values("rank_test_score").head(mejores)
+    print(f"\nMejores candidatos de la última ronda ({busqueda.scoring}):")
+    for _, fila in tabla.iterrows():
+        print(f"  {fila['mean_test_score']:.3f} ±{fila['std_test_score']:.3f} | {fila['segundos']:.2f} s | {fila['parametros']}")
+    print(f"\n✅ Mejor configuración: {busqueda.best_params_} ({busqueda.best_score_:.3f})")
+    return resultados
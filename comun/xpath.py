@@ -0,0 +1,13 @@
+# Soporte XPath (lxml) compartido por los extractores de los scrapers (codelab4 y codelab5)
+# lxml es opcional: si no está instalado, lxml_html es None y cada extractor recurre a
+# BeautifulSoup. Cada módulo compila sus expresiones una sola vez al importarse
+# (etree.XPath) y las reutiliza en todas las páginas.
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml es opcional
+    etree = lxml_html = None
+
+
+def has_class(name):
+    """Predicado XPath: `name` es una de las clases del elemento (como .name en CSS)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
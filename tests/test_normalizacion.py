@@ -0,0 +1,34 @@
+# La limpieza del pipeline de sklearn (NormalizadorTexto) y la del puntuador plano
+# (PuntuadorLineal.analizar) deben dar exactamente el mismo texto: si divergen, las
+# puntuaciones del .plano dejan de coincidir con las del .joblib sin ningún error.
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.linear_model import LogisticRegression  # noqa: E402
+from sklearn.pipeline import make_pipeline  # noqa: E402
+
+from comun.artefactos import guardar_artefacto  # noqa: E402
+from comun.normalizacion import NormalizadorTexto  # noqa: E402
+from comun.puntuador import PuntuadorLineal  # noqa: E402
+
+CORPUS = [
+    "¿Tienen DESCUENTOS por volumen?", "Ñandú, pingüino y ÁRBOL: ¡qué tal!", "No puedo iniciar sesión… error 403",
+    "Crypto inversión 10% diario 💰💰", "  espacios\tcon\ntabuladores  ", "São Paulo, Zürich, naïve, façade",
+    "precio: $1.299,50 (IVA incl.)", "Ⅻ ½ ª º ß œ ÿ Ÿ", "mañana—¿mañana?—MAÑANA", "",
+    "".join(chr(codigo) for codigo in range(256)),
+]
+
+
+def test_pipeline_y_puntuador_limpian_igual(tmp_path):
+    pipe = make_pipeline(NormalizadorTexto(), TfidfVectorizer(ngram_range=(1, 2)), LogisticRegression())
+    pipe.fit(CORPUS, [i % 2 for i in range(len(CORPUS))])
+    ruta = tmp_path / "modelo.plano"
+    guardar_artefacto(pipe, ruta)
+
+    analizar_sklearn = pipe[1].build_analyzer()
+    puntuador = PuntuadorLineal(ruta)
+    for texto, limpio in zip(CORPUS, pipe[0].transform(CORPUS)):
+        assert puntuador.analizar(texto) == analizar_sklearn(limpio), texto